@@ -7,24 +7,7 @@ import psycopg2
 import os
 import sys
 
-# 데이터베이스 설정
-DB_CONFIG = {
-    "host": "aws-1-ap-northeast-2.pooler.supabase.com",
-    "database": "postgres",
-    "user": "postgres.dvwwcmhzlllaukscjuya",
-    "password": "!Qdhdbrclf56",
-    "port": "6543"
-}
-
-def connect_to_db():
-    """데이터베이스 연결"""
-    try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        print("✅ 데이터베이스 연결 성공")
-        return conn
-    except Exception as e:
-        print(f"❌ 데이터베이스 연결 실패: {e}")
-        return None
+from database import connect_to_db, release_connection
 
 def add_best_odds_columns():
     """matches 테이블에 best odds 컬럼들 추가"""
@@ -69,7 +52,7 @@ def add_best_odds_columns():
         
     finally:
         cursor.close()
-        conn.close()
+        release_connection(conn)
         print("🔌 데이터베이스 연결 종료")
 
 def main():
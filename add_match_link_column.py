@@ -7,24 +7,7 @@ import psycopg2
 import os
 import sys
 
-# 데이터베이스 설정
-DB_CONFIG = {
-    "host": "aws-1-ap-northeast-2.pooler.supabase.com",
-    "database": "postgres",
-    "user": "postgres.dvwwcmhzlllaukscjuya",
-    "password": "!Qdhdbrclf56",
-    "port": "6543"
-}
-
-def connect_to_db():
-    """데이터베이스 연결"""
-    try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        print("✅ 데이터베이스 연결 성공")
-        return conn
-    except Exception as e:
-        print(f"❌ 데이터베이스 연결 실패: {e}")
-        return None
+from database import connect_to_db, release_connection
 
 def add_match_link_column():
     """matches 테이블에 match_link 컬럼 추가"""
@@ -62,7 +45,7 @@ def add_match_link_column():
         
     finally:
         cursor.close()
-        conn.close()
+        release_connection(conn)
         print("🔌 데이터베이스 연결 종료")
 
 def main():
@@ -5,29 +5,11 @@ best_benchmark와 실제 총점수를 비교하여 5가지 결과 분석
 """
 
 import json
-import psycopg2
 from psycopg2.extras import RealDictCursor
 import os
 import sys
 
-# 데이터베이스 설정
-DB_CONFIG = {
-    "host": "aws-1-ap-northeast-2.pooler.supabase.com",
-    "database": "postgres",
-    "user": "postgres.dvwwcmhzlllaukscjuya",
-    "password": "!Qdhdbrclf56",
-    "port": "6543"
-}
-
-def connect_to_db():
-    """데이터베이스 연결"""
-    try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        print("✅ 데이터베이스 연결 성공")
-        return conn
-    except Exception as e:
-        print(f"❌ 데이터베이스 연결 실패: {e}")
-        return None
+from database import connect_to_db, release_connection
 
 def analyze_over_under_results():
     """오버/언더 결과 분석"""
@@ -127,7 +109,7 @@ def analyze_over_under_results():
         print(f"❌ 분석 중 오류: {e}")
     finally:
         cursor.close()
-        conn.close()
+        release_connection(conn)
         print("\n🔌 데이터베이스 연결 종료")
 
 def classify_result(total_score, benchmark):
@@ -312,7 +294,7 @@ def analyze_team_scoring_patterns():
         print(f"❌ 분석 중 오류: {e}")
     finally:
         cursor.close()
-        conn.close()
+        release_connection(conn)
         print("\n🔌 데이터베이스 연결 종료")
 
 def main():
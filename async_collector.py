@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+asyncio 기반 누락 데이터 수집 엔진 (렌더링된 HTML 전용)
+
+aiohttp로 수백 개의 경기 페이지 요청을 동시에 진행하면서 호스트별 동시 요청 수를 제한한다.
+수집 결과는 비동기 제너레이터로 완료 순서대로 내보내고, DB 기록은 MatchUpdateWriter가 모아서 처리한다.
+동기 수집기와 같은 페이지 캐시(page_cache)를 먼저 확인하고, 파싱에 성공한 페이지만 캐시에 저장한다.
+페이지 주소·헤더·파싱은 http_fetcher/html_parsers와 같으므로
+FLASHSCORE_BASE_URL로 fixture_server.py의 로컬 서버를 지정하면 오프라인으로 실행할 수 있다.
+
+브라우저 없이 페이지 HTML만 파싱하고 Flashscore의 데이터 피드는 읽지 않으므로,
+렌더링된 HTML을 주는 서버에서만 결과가 나온다 (http_fetcher 참고). 실제 사이트의 누락 데이터는
+collect_missing_data.py(Selenium)로 수집한다. 그래서 명령줄 실행은 FLASHSCORE_HTTP_FIRST=1이거나
+FLASHSCORE_BASE_URL로 렌더링된 HTML을 주는 서버를 지정했을 때만 진행한다.
+"""
+
+import asyncio
+import sys
+import time
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from collect_missing_data import MatchUpdateWriter, get_matches_missing_data
+from html_parsers import is_finished_status, parse_over_under_page, parse_status_html
+from http_fetcher import BASE_URL, HTTP_FIRST, HTTP_RETRIES, REQUEST_HEADERS, build_over_under_url, request_url
+from page_cache import open_page_cache
+
+# 동시에 진행할 최대 경기 수
+MAX_IN_FLIGHT = 200
+# 호스트별 최대 동시 요청 수
+PER_HOST_LIMIT = 32
+# 요청 하나의 전체 타임아웃 (초)
+REQUEST_TIMEOUT = 30
+# 재시도 대기 기본 시간 (초, 시도마다 두 배)
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# DB에서 한 번에 가져올 경기 수
+DEFAULT_MATCH_LIMIT = 1000
+
+
+class HostLimiter:
+    """호스트별 동시 요청 수 제한 (호스트마다 세마포어 하나)"""
+
+    def __init__(self, per_host=PER_HOST_LIMIT):
+        self.per_host = per_host
+        self._semaphores = {}
+
+    def __call__(self, url):
+        host = urlsplit(url).netloc
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(self.per_host)
+        return semaphore
+
+
+async def fetch_html_async(session, limiter, url, retries=HTTP_RETRIES):
+    """
+    페이지 HTML 비동기 요청
+
+    연결 오류·타임아웃과 429/5xx 응답은 지수 백오프로 재시도한다.
+    재시도를 기다리는 동안에는 호스트 슬롯을 잡고 있지 않는다.
+    """
+    url = request_url(url)
+
+    for attempt in range(retries + 1):
+        async with limiter(url):
+            try:
+                async with session.get(url) as response:
+                    if response.status not in RETRY_STATUSES or attempt == retries:
+                        response.raise_for_status()
+                        return await response.text(encoding=response.charset or 'utf-8')
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == retries:
+                    raise
+
+        await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+
+async def collect_match(session, limiter, kind, match_id, match_link, cache=None, finished=False):
+    """
+    경기 하나의 status 또는 odds 수집
+
+    요청·파싱 중 어떤 예외가 나도 이 경기만 실패로 기록하고 다른 경기는 계속 진행한다.
+
+    Args:
+        cache: PageCache (있으면 캐시에서 먼저 찾고, 파싱에 성공한 페이지만 저장)
+        finished: 경기가 종료되었으면 True (캐시된 odds 페이지가 만료되지 않음)
+
+    Returns:
+        dict: {'match_id', 'kind', 'success', ...} - odds는 'odds'(over-under 라인), status는 'status' 포함
+    """
+    result = {'match_id': match_id, 'kind': kind, 'success': False}
+    url = request_url(match_link if kind == 'status' else build_over_under_url(match_link))
+
+    try:
+        # 캐시 조회·저장은 파일 I/O라 이벤트 루프를 막지 않도록 스레드에서 실행
+        html = await asyncio.to_thread(cache.get, url) if cache is not None else None
+        cached = html is not None
+        if not cached:
+            html = await fetch_html_async(session, limiter, url)
+
+        if kind == 'status':
+            status = parse_status_html(html, strict=True)
+            if status:
+                result.update(status=status, success=True)
+                if cache is not None and not cached:
+                    await asyncio.to_thread(cache.put, url, html, is_finished_status(status))
+            return result
+
+        # 기준점은 MatchUpdateWriter가 기록할 때 배치로 고름
+        over_under = parse_over_under_page(html)
+        if over_under:
+            result.update(odds={"over-under": over_under}, success=True)
+            if cache is not None and not cached:
+                await asyncio.to_thread(cache.put, url, html, finished)
+        return result
+
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        result['error'] = str(e) or type(e).__name__
+        return result
+
+
+async def collect_async(matches, kind='odds', max_in_flight=MAX_IN_FLIGHT, per_host=PER_HOST_LIMIT, cache=None):
+    """
+    경기들을 동시에 수집하면서 끝나는 순서대로 결과를 내보내는 비동기 제너레이터
+
+    진행 중인 경기가 max_in_flight개를 넘지 않도록 하나가 끝날 때마다 다음 경기를 시작한다.
+
+    Args:
+        matches: (match_id, match_link) 또는 (match_id, match_link, 종료 여부)의 iterable
+        kind: 'status' 또는 'odds'
+        cache: PageCache (collect_match 참고)
+
+    Yields:
+        dict: collect_match 결과
+    """
+    limiter = HostLimiter(per_host)
+    connector = aiohttp.TCPConnector(limit=max_in_flight, limit_per_host=per_host, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+
+    async with aiohttp.ClientSession(connector=connector, headers=REQUEST_HEADERS, timeout=timeout) as session:
+        match_iter = iter(matches)
+        pending = set()
+        try:
+            while True:
+                for match_id, match_link, *rest in match_iter:
+                    finished = bool(rest and rest[0])
+                    pending.add(asyncio.ensure_future(
+                        collect_match(session, limiter, kind, match_id, match_link, cache, finished)
+                    ))
+                    if len(pending) >= max_in_flight:
+                        break
+
+                if not pending:
+                    return
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            # 소비자가 중간에 멈추면 남은 요청 취소
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def write_results(results, writer):
+    """
+    수집 결과를 MatchUpdateWriter로 전달
+
+    writer의 큐가 가득 차면 기다려야 하므로 이벤트 루프를 막지 않도록 스레드에서 넣는다.
+
+    Returns:
+        dict: {'success', 'failed'}
+    """
+    counts = {'success': 0, 'failed': 0}
+
+    async for result in results:
+        if not result['success']:
+            if result.get('error'):
+                print(f"⚠️ {result['kind']} 수집 실패 ({result['match_id']}): {result['error']}")
+            counts['failed'] += 1
+            continue
+
+        if result['kind'] == 'status':
+            await asyncio.to_thread(writer.update_status, result['match_id'], result['status'])
+        else:
+            await asyncio.to_thread(writer.update_over_under, result['match_id'], result['odds']['over-under'])
+        counts['success'] += 1
+
+    return counts
+
+
+async def collect_missing_data_async(limit=DEFAULT_MATCH_LIMIT, max_in_flight=MAX_IN_FLIGHT, per_host=PER_HOST_LIMIT):
+    """DB에서 누락된 status/odds 경기를 조회해 비동기로 수집하고 일괄 기록"""
+    missing_status_matches, missing_odds_matches = get_matches_missing_data(limit)
+
+    print(f"📊 누락된 status 경기: {len(missing_status_matches)}개")
+    print(f"📊 누락된 odds 경기: {len(missing_odds_matches)}개")
+
+    writer = MatchUpdateWriter()
+    # 이미 받은 페이지는 캐시에서 읽음 (동기 수집기와 같은 캐시)
+    cache = open_page_cache()
+    summary = {}
+    try:
+        for kind, matches in (('status', missing_status_matches), ('odds', missing_odds_matches)):
+            start_time = time.perf_counter()
+            results = collect_async(
+                ((match['id'], match['match_link'], is_finished_status(match.get('status'))) for match in matches),
+                kind, max_in_flight, per_host, cache
+            )
+            counts = await write_results(results, writer)
+            elapsed = time.perf_counter() - start_time
+
+            summary[kind] = counts
+            rate = len(matches) / elapsed if elapsed > 0 else 0.0
+            print(f"  {kind} - 성공: {counts['success']}개, 실패: {counts['failed']}개 "
+                  f"({elapsed:.1f}초, {rate:.1f}경기/초)")
+    finally:
+        # 중단되더라도 이미 수집한 결과는 기록
+        await asyncio.to_thread(writer.close)
+        stats = writer.stats
+        print(f"💾 DB 기록 - 성공: {stats['written']}개, 실패: {stats['failed']}개 ({stats['batches']}번 일괄 기록), "
+              f"기준점 없음: {stats['no_best']}개")
+        if cache is not None:
+            print(f"📦 페이지 캐시 - {cache.format_stats()}")
+            cache.close()
+
+    return summary
+
+
+def main():
+    """메인 함수"""
+
+    if len(sys.argv) > 1 and sys.argv[1] in ('-h', '--help'):
+        print("사용법: python async_collector.py [경기 수] [동시 요청 수] [호스트당 동시 요청 수]")
+        print("예시: python async_collector.py 1000 200 32")
+        print("")
+        print("FLASHSCORE_BASE_URL=http://127.0.0.1:8765 로 fixture 서버에 요청할 수 있습니다")
+        print("렌더링된 HTML만 파싱하므로 FLASHSCORE_BASE_URL 또는 FLASHSCORE_HTTP_FIRST=1 로 실행해야 합니다")
+        return
+
+    if not (HTTP_FIRST or BASE_URL):
+        print("⚠️ 이 수집기는 렌더링된 HTML을 주는 서버에서만 동작합니다 (실제 사이트는 collect_missing_data.py 사용)")
+        print("   FLASHSCORE_BASE_URL로 서버를 지정하거나 FLASHSCORE_HTTP_FIRST=1 로 실행하세요")
+        return
+
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MATCH_LIMIT
+    max_in_flight = int(sys.argv[2]) if len(sys.argv) > 2 else MAX_IN_FLIGHT
+    per_host = int(sys.argv[3]) if len(sys.argv) > 3 else PER_HOST_LIMIT
+
+    print(f"🚀 비동기 수집 시작 (동시 {max_in_flight}개, 호스트당 {per_host}개)")
+
+    try:
+        asyncio.run(collect_missing_data_async(limit, max_in_flight, per_host))
+    except KeyboardInterrupt:
+        print("\n⏹️ 수집 중단")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""
+수집·적재 경로 성능 측정 도구
+
+저장소 최상위에서 모듈로 실행한다.
+    python -m benchmarks.run_benchmarks
+"""
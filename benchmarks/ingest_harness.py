@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+로컬 PostgreSQL 적재 성능 측정 하네스
+
+임시 디렉터리에 PostgreSQL 인스턴스를 띄우고 create_tables.sql, improved_odds_schema.sql,
+create_match_events_table.sql을 적용한 뒤, 크기별 합성 시즌을 teams → matches → odds 순서로 적재한다.
+단계마다 소요 시간, 기록한 행 수와 초당 행 수, 클라이언트 왕복 횟수, WAL 생성량을 출력한다.
+크기마다 새 데이터베이스에서 시작하므로 변경 전후를 같은 조건에서 비교할 수 있다.
+
+PostgreSQL 실행 파일(initdb, pg_ctl)은 PATH나 PG_BIN 환경 변수의 디렉터리에서 찾는다.
+
+    python -m benchmarks.ingest_harness [경기 수 목록] [기준점 수] [북메이커 수] [결과 JSON] [--bulk] [--pipeline]
+"""
+
+import contextlib
+import glob
+import io
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import psycopg2
+import psycopg2.extensions
+
+from benchmarks.synthetic import DEFAULT_BOOKMAKERS, DEFAULT_HANDICAPS, write_synthetic_season
+from ingest_pipeline import ingest_season_file
+from insert_matches import insert_matches_bulk, insert_matches_from_json
+from insert_odds import insert_odds_from_json
+from insert_teams import extract_teams_from_json
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEMA_FILES = ["create_tables.sql", "improved_odds_schema.sql", "create_match_events_table.sql"]
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DATABASE_NAME = "flashscore_bench"
+# 단계별로 기록 행 수를 세는 테이블
+COUNTED_TABLES = [
+    'teams', 'matches', 'match_statistics', 'match_events',
+    'odds_metadata', 'handicap_odds', 'bookmaker_odds'
+]
+
+
+class CountingCursor(psycopg2.extensions.cursor):
+    """서버로 보내는 문장 수를 연결의 round_trips에 누적하는 커서"""
+
+    def _count(self, statements=1):
+        conn = self.connection
+        # autocommit이 아니면 트랜잭션 밖의 첫 문장 앞에 psycopg2가 BEGIN을 따로 보냄
+        if not conn.autocommit and conn.status == psycopg2.extensions.STATUS_READY:
+            conn.round_trips += 1
+        conn.round_trips += statements
+
+    def execute(self, query, vars=None):
+        self._count()
+        return super().execute(query, vars)
+
+    def executemany(self, query, vars_list):
+        vars_list = list(vars_list)
+        self._count(len(vars_list))
+        return super().executemany(query, vars_list)
+
+    def copy_expert(self, sql, file, size=8192):
+        self._count()
+        return super().copy_expert(sql, file, size)
+
+    def copy_from(self, file, table, *args, **kwargs):
+        self._count()
+        return super().copy_from(file, table, *args, **kwargs)
+
+
+class CountingConnection(psycopg2.extensions.connection):
+    """CountingCursor를 기본 커서로 쓰고 commit/rollback도 왕복으로 세는 연결"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.round_trips = 0
+
+    def cursor(self, *args, **kwargs):
+        kwargs.setdefault('cursor_factory', CountingCursor)
+        return super().cursor(*args, **kwargs)
+
+    def commit(self):
+        if self.status != psycopg2.extensions.STATUS_READY:
+            self.round_trips += 1
+        super().commit()
+
+    def rollback(self):
+        if self.status != psycopg2.extensions.STATUS_READY:
+            self.round_trips += 1
+        super().rollback()
+
+
+def find_pg_bin():
+    """initdb/pg_ctl이 있는 디렉터리 (PG_BIN → PATH → 배포판 기본 경로 순)"""
+    candidates = [os.environ.get("PG_BIN")]
+    pg_ctl = shutil.which("pg_ctl")
+    if pg_ctl:
+        candidates.append(os.path.dirname(pg_ctl))
+    candidates += sorted(glob.glob("/usr/lib/postgresql/*/bin"), reverse=True)
+    candidates.append("/usr/local/pgsql/bin")
+
+    for directory in candidates:
+        if directory and os.path.exists(os.path.join(directory, "initdb")):
+            return directory
+    return None
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class LocalPostgres:
+    """
+    임시 디렉터리에 만드는 일회용 PostgreSQL 인스턴스
+
+    with 블록을 벗어나면 서버를 멈추고 데이터 디렉터리를 지운다.
+    """
+
+    def __init__(self, pg_bin, port=None):
+        self.pg_bin = pg_bin
+        self.port = port or _free_port()
+        self.base_dir = None
+
+    def _run(self, program, *args):
+        subprocess.run(
+            [os.path.join(self.pg_bin, program), *args],
+            check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+        )
+
+    @property
+    def data_dir(self):
+        return os.path.join(self.base_dir, "data")
+
+    def start(self):
+        self.base_dir = tempfile.mkdtemp(prefix="flashscore_pg_")
+        self._run("initdb", "-D", self.data_dir, "-U", "postgres", "--auth=trust", "-E", "UTF8", "--no-locale")
+        self._run(
+            "pg_ctl", "-D", self.data_dir, "-l", os.path.join(self.base_dir, "server.log"), "-w",
+            "-o", f"-p {self.port} -k {self.base_dir} -c listen_addresses=''",
+            "start"
+        )
+
+    def stop(self):
+        if self.base_dir is None:
+            return
+        try:
+            self._run("pg_ctl", "-D", self.data_dir, "-m", "fast", "-w", "stop")
+        finally:
+            shutil.rmtree(self.base_dir, ignore_errors=True)
+            self.base_dir = None
+
+    def connect(self, database="postgres", counting=False):
+        conn = psycopg2.connect(
+            host=self.base_dir, port=self.port, user="postgres", dbname=database,
+            connection_factory=CountingConnection if counting else None
+        )
+        return conn
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def load_schema_sql():
+    """
+    스키마 파일 세 개를 운영 DB와 같은 구조가 되도록 보정해서 이어 붙인 SQL
+
+    - create_tables.sql의 handicap_odds/bookmaker_odds는 improved_odds_schema.sql이 다시 만들므로 제외
+    - match_odds_summary 뷰가 참조하는 teams.league 컬럼 추가
+    - 적재 스크립트의 ON CONFLICT (match_id)에 필요한 odds_metadata 유니크 제약조건 추가
+    """
+    with open(os.path.join(REPO_DIR, SCHEMA_FILES[0]), 'r', encoding='utf-8') as f:
+        base_sql = f.read()
+
+    kept_lines = []
+    skipping = False
+    for line in base_sql.splitlines():
+        if line.startswith('-- 4. handicap_odds') or line.startswith('-- 5. bookmaker_odds'):
+            skipping = True
+        if not skipping and 'idx_handicap_odds_match_id' not in line and 'idx_bookmaker_odds_handicap_id' not in line:
+            kept_lines.append(line)
+        if skipping and line.startswith(');'):
+            skipping = False
+
+    parts = ["\n".join(kept_lines), "ALTER TABLE teams ADD COLUMN league TEXT;"]
+    for schema_file in SCHEMA_FILES[1:]:
+        with open(os.path.join(REPO_DIR, schema_file), 'r', encoding='utf-8') as f:
+            parts.append(f.read())
+        if schema_file == "improved_odds_schema.sql":
+            parts.append("ALTER TABLE odds_metadata ADD CONSTRAINT odds_metadata_match_id_key UNIQUE (match_id);")
+    return "\n".join(parts)
+
+
+def create_database(server, schema_sql):
+    """벤치마크 데이터베이스를 새로 만들고 스키마 적용"""
+    admin = server.connect()
+    admin.autocommit = True
+    with admin.cursor() as cursor:
+        cursor.execute(f"DROP DATABASE IF EXISTS {DATABASE_NAME}")
+        cursor.execute(f"CREATE DATABASE {DATABASE_NAME}")
+    admin.close()
+
+    conn = server.connect(DATABASE_NAME)
+    with conn.cursor() as cursor:
+        cursor.execute(schema_sql)
+    conn.commit()
+    conn.close()
+
+
+def snapshot(monitor):
+    """(WAL 위치, 테이블별 행 수)"""
+    with monitor.cursor() as cursor:
+        cursor.execute("SELECT pg_current_wal_lsn()")
+        lsn = cursor.fetchone()[0]
+        counts = {}
+        for table in COUNTED_TABLES:
+            cursor.execute(f"SELECT count(*) FROM {table}")
+            counts[table] = cursor.fetchone()[0]
+    return lsn, counts
+
+
+def wal_bytes(monitor, start_lsn, end_lsn):
+    with monitor.cursor() as cursor:
+        cursor.execute("SELECT pg_wal_lsn_diff(%s, %s)", (end_lsn, start_lsn))
+        return int(cursor.fetchone()[0])
+
+
+def build_stages(bulk=False, pipeline=False):
+    """(단계 이름, 함수(json 경로, conn)) 목록"""
+    if pipeline:
+        return [('pipeline', lambda path, conn: ingest_season_file(path, conn=conn, reject_file_path=os.devnull))]
+
+    if bulk:
+        matches_stage = ('matches(bulk)', lambda path, conn: insert_matches_bulk(path, os.devnull, conn=conn))
+    else:
+        matches_stage = ('matches', lambda path, conn: insert_matches_from_json(path, conn=conn))
+    return [
+        ('teams', lambda path, conn: extract_teams_from_json(path, conn=conn)),
+        matches_stage,
+        ('odds', lambda path, conn: insert_odds_from_json(path, conn=conn)),
+    ]
+
+
+def run_size(server, schema_sql, matches, handicaps, bookmakers, stages, work_dir):
+    """
+    한 크기의 합성 시즌을 새 데이터베이스에 적재하며 단계별 측정
+
+    Returns:
+        list: 단계별 결과 dict
+    """
+    json_file_path = os.path.join(work_dir, f"soccer_synthetic_bench-{matches}-2025-2026.json")
+    if not os.path.exists(json_file_path):
+        write_synthetic_season(json_file_path, matches, handicaps, bookmakers)
+
+    create_database(server, schema_sql)
+    monitor = server.connect(DATABASE_NAME)
+    monitor.autocommit = True
+    conn = server.connect(DATABASE_NAME, counting=True)
+
+    results = []
+    try:
+        for name, stage in stages:
+            start_lsn, start_counts = snapshot(monitor)
+            conn.round_trips = 0
+            start_time = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                outcome = stage(json_file_path, conn)
+            elapsed = time.perf_counter() - start_time
+            end_lsn, end_counts = snapshot(monitor)
+
+            rows = sum(end_counts[table] - start_counts[table] for table in COUNTED_TABLES)
+            results.append({
+                'matches': matches,
+                'stage': name,
+                'success': bool(outcome),
+                'seconds': elapsed,
+                'rows': rows,
+                'rows_per_sec': rows / elapsed if elapsed > 0 else 0.0,
+                'round_trips': conn.round_trips,
+                'wal_bytes': wal_bytes(monitor, start_lsn, end_lsn),
+                'tables': {
+                    table: end_counts[table] - start_counts[table]
+                    for table in COUNTED_TABLES if end_counts[table] != start_counts[table]
+                }
+            })
+    finally:
+        conn.close()
+        monitor.close()
+
+    return results
+
+
+def print_results(results):
+    """단계별 결과 표 출력"""
+    print(f"\n{'경기 수':>8} {'단계':<14} {'초':>9} {'행':>11} {'행/초':>10} {'왕복':>9} {'WAL(MB)':>9}")
+    print("-" * 76)
+    for result in results:
+        mark = "" if result['success'] else " ❌"
+        print(f"{result['matches']:>8} {result['stage']:<14} {result['seconds']:>9.2f} {result['rows']:>11} "
+              f"{result['rows_per_sec']:>10.0f} {result['round_trips']:>9} "
+              f"{result['wal_bytes'] / 1024 / 1024:>9.1f}{mark}")
+
+
+def main():
+    """메인 함수"""
+
+    if len(sys.argv) > 1 and sys.argv[1] in ('-h', '--help'):
+        print("사용법: python -m benchmarks.ingest_harness [경기 수 목록] [기준점 수] [북메이커 수] [결과 JSON] [--bulk] [--pipeline]")
+        print("예시: python -m benchmarks.ingest_harness 1000,10000,100000 8 12 ingest_results.json")
+        print("")
+        print("--bulk: matches 단계를 insert_matches_bulk(COPY)로 실행")
+        print("--pipeline: 세 단계 대신 ingest_pipeline.ingest_season_file 한 단계로 실행")
+        print("PG_BIN: initdb/pg_ctl이 있는 디렉터리 (PATH에 없을 때)")
+        return
+
+    # 옵션 분리
+    bulk = '--bulk' in sys.argv[1:]
+    pipeline = '--pipeline' in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+
+    sizes = [int(size) for size in args[0].split(',')] if len(args) > 0 else DEFAULT_SIZES
+    handicaps = int(args[1]) if len(args) > 1 else DEFAULT_HANDICAPS
+    bookmakers = int(args[2]) if len(args) > 2 else DEFAULT_BOOKMAKERS
+    output_path = args[3] if len(args) > 3 else None
+
+    pg_bin = find_pg_bin()
+    if not pg_bin:
+        print("❌ PostgreSQL 실행 파일(initdb, pg_ctl)을 찾을 수 없습니다 - PG_BIN을 지정하세요")
+        return
+    if hasattr(os, 'geteuid') and os.geteuid() == 0:
+        print("❌ initdb는 root로 실행할 수 없습니다 - 일반 사용자로 실행하세요")
+        return
+
+    stages = build_stages(bulk, pipeline)
+    schema_sql = load_schema_sql()
+    results = []
+
+    print(f"🚀 적재 하네스 시작: {', '.join(str(size) for size in sizes)}경기 "
+          f"(기준점 {handicaps}개 × 북메이커 {bookmakers}개), 단계: {' → '.join(name for name, _ in stages)}")
+
+    try:
+        with tempfile.TemporaryDirectory(prefix="flashscore_seasons_") as work_dir, LocalPostgres(pg_bin) as server:
+            print(f"🐘 로컬 PostgreSQL 시작 (포트 {server.port})")
+            for matches in sizes:
+                print(f"📦 {matches}개 경기 적재 중...")
+                size_results = run_size(server, schema_sql, matches, handicaps, bookmakers, stages, work_dir)
+                for result in size_results:
+                    print(f"  ⏱️ {result['stage']}: {result['seconds']:.2f}초, {result['rows']}행, 왕복 {result['round_trips']}회")
+                results.extend(size_results)
+    except subprocess.CalledProcessError as e:
+        print(f"❌ PostgreSQL 실행 실패 ({os.path.basename(e.cmd[0])}): {e.stderr.decode(errors='replace').strip()}")
+        return
+    except KeyboardInterrupt:
+        print("\n⏹️ 측정 중단")
+
+    print_results(results)
+
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
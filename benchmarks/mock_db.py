@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+적재 함수용 가짜 DB 연결
+
+insert_matches_from_json / insert_odds_from_json에 conn으로 넘기면 SQL을 실행하지 않고
+왕복 횟수와 보낸 바이트만 센다. 경기별 변환 루프의 파이썬 비용만 측정할 때 사용한다.
+"""
+
+import re
+
+# "WHERE id = ANY(%s)" 형태의 조회는 넘긴 ID가 모두 있는 것으로 응답
+_ANY_ID_QUERY = re.compile(r'^\s*SELECT\s+id\s+FROM\s+\w+\s+WHERE\s+id\s*=\s*ANY\(%s\)', re.IGNORECASE)
+
+
+class MockCursor:
+    """execute/copy_expert 호출을 세는 커서 (조회 결과는 ID 존재 확인만 흉내)"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.rowcount = -1
+        self._rows = []
+
+    def execute(self, query, params=None):
+        if isinstance(query, bytes):
+            query = query.decode('utf-8')
+        self.connection.stats['round_trips'] += 1
+        self.connection.stats['bytes_sent'] += len(query)
+
+        self._rows = []
+        self.rowcount = 0
+        if params and _ANY_ID_QUERY.match(query):
+            self._rows = [(value,) for value in params[0]]
+            self.rowcount = len(self._rows)
+
+    def mogrify(self, query, params):
+        # execute_values가 VALUES 목록을 만들 때 사용 (실제 이스케이프 대신 repr)
+        return repr(tuple(params)).encode('utf-8')
+
+    def copy_expert(self, sql, file):
+        data = file.read()
+        self.connection.stats['round_trips'] += 1
+        self.connection.stats['bytes_sent'] += len(sql) + len(data)
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def close(self):
+        pass
+
+
+class MockConnection:
+    """
+    MockCursor를 돌려주는 연결
+
+    stats: {'round_trips', 'bytes_sent'}
+    """
+
+    encoding = 'UTF8'
+    closed = 0
+
+    def __init__(self):
+        self.stats = {'round_trips': 0, 'bytes_sent': 0}
+
+    def cursor(self, cursor_factory=None):
+        return MockCursor(self)
+
+    def commit(self):
+        self.stats['round_trips'] += 1
+
+    def rollback(self):
+        self.stats['round_trips'] += 1
+
+    def close(self):
+        pass
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+핵심 함수 성능 측정
+
+합성 시즌으로 기준점 선택·대표 배당률·날짜/시즌 파싱·결과 분류 함수와
+insert_matches_from_json / insert_odds_from_json의 경기별 변환 루프(DB는 MockConnection)를 측정한다.
+결과를 기준값 JSON과 비교해서 임계값보다 느려진 항목을 표시하고, 하나라도 있으면 종료 코드 1로 끝난다.
+
+    python -m benchmarks.run_benchmarks [경기 수] [기준점 수] [북메이커 수] [임계값 %] [--save-baseline]
+"""
+
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from analyze_over_under import classify_result
+from benchmarks.mock_db import MockConnection
+from benchmarks.synthetic import (
+    DEFAULT_BOOKMAKERS, DEFAULT_HANDICAPS, DEFAULT_MATCHES, generate_season, write_synthetic_season
+)
+from best_odds import find_best_odds, find_best_odds_batch
+from insert_matches import extract_season_from_filename, insert_matches_from_json, parse_match_time
+from insert_odds import insert_odds_from_json, select_best_odds
+from odds_aggregation import aggregate_odds
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+# 기준값보다 이 비율 이상 느려지면 회귀로 표시
+REGRESSION_THRESHOLD = 0.20
+# 측정 반복 횟수 (가장 빠른 회차 사용)
+REPEAT = 5
+
+SELECT_METHODS = ('average', 'median', 'mode', 'best_over', 'best_under')
+
+
+def measure(func, repeat=REPEAT):
+    """func()를 repeat번 실행한 시간 중 최솟값 (초)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def build_inputs(matches, handicaps, bookmakers):
+    """측정 입력 (합성 시즌에서 함수별 인자 목록 생성)"""
+    season = list(generate_season(matches, handicaps, bookmakers))
+    over_under_lists = [match_data['odds']['over-under'] for _, match_data in season if match_data['odds']]
+    bookmaker_groups = [line['bookmakers'] for over_under in over_under_lists for line in over_under]
+
+    # parse_match_time이 처리하는 세 가지 형식을 골고루
+    dates = []
+    for index, (_, match_data) in enumerate(season):
+        if index % 3 == 0:
+            dates.append(match_data['date'])
+        elif index % 3 == 1:
+            dates.append(f"2025-{index % 12 + 1:02d}-{index % 28 + 1:02d}T15:30:00+00:00")
+        else:
+            dates.append(f"2025-{index % 12 + 1:02d}-{index % 28 + 1:02d} 15:30:00")
+
+    filenames = [
+        f"src/data/soccer_league{index % 50}_division-{2000 + index % 25}-{2001 + index % 25}.json"
+        for index in range(matches)
+    ]
+    results = [
+        (int(match_data['result']['home']) + int(match_data['result']['away']), 0.5 + 0.25 * (index % 16))
+        for index, (_, match_data) in enumerate(season)
+    ]
+
+    return {
+        'over_under_lists': over_under_lists,
+        'bookmaker_groups': bookmaker_groups,
+        'dates': dates,
+        'filenames': filenames,
+        'results': results
+    }
+
+
+def run_ingest_loop(ingest_func, json_file_path):
+    """가짜 DB로 적재 함수 실행 (진행 출력은 버림)"""
+    conn = MockConnection()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ingest_func(json_file_path, conn=conn)
+    return conn.stats
+
+
+def run_benchmarks(matches=DEFAULT_MATCHES, handicaps=DEFAULT_HANDICAPS, bookmakers=DEFAULT_BOOKMAKERS):
+    """
+    모든 항목 측정
+
+    Returns:
+        dict: {항목: {'ops', 'seconds', 'per_op_us'[, 'round_trips_per_op']}}
+    """
+    inputs = build_inputs(matches, handicaps, bookmakers)
+    over_under_lists = inputs['over_under_lists']
+    bookmaker_groups = inputs['bookmaker_groups']
+
+    cases = [
+        ('find_best_odds', len(over_under_lists),
+         lambda: [find_best_odds(over_under) for over_under in over_under_lists]),
+        ('find_best_odds_batch', len(over_under_lists),
+         lambda: find_best_odds_batch(over_under_lists)),
+    ]
+    for method in SELECT_METHODS:
+        cases.append((f'select_best_odds[{method}]', len(bookmaker_groups),
+                      lambda method=method: [select_best_odds(group, method) for group in bookmaker_groups]))
+        cases.append((f'aggregate_odds[{method}]', len(bookmaker_groups),
+                      lambda method=method: aggregate_odds(bookmaker_groups, method)))
+    cases += [
+        ('parse_match_time', len(inputs['dates']),
+         lambda: [parse_match_time(date_str) for date_str in inputs['dates']]),
+        ('extract_season_from_filename', len(inputs['filenames']),
+         lambda: [extract_season_from_filename(filename) for filename in inputs['filenames']]),
+        ('classify_result', len(inputs['results']),
+         lambda: [classify_result(total, benchmark) for total, benchmark in inputs['results']]),
+    ]
+
+    results = {}
+    for name, ops, func in cases:
+        seconds = measure(func)
+        results[name] = {'ops': ops, 'seconds': seconds, 'per_op_us': seconds / ops * 1e6}
+
+    # 경기별 변환 루프 (시즌 파일 읽기 포함, DB 왕복은 MockConnection이 셈)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        json_file_path = os.path.join(tmp_dir, "soccer_benchmark_league-2025-2026.json")
+        write_synthetic_season(json_file_path, matches, handicaps, bookmakers)
+
+        for name, ingest_func in (('insert_matches_from_json', insert_matches_from_json),
+                                  ('insert_odds_from_json', insert_odds_from_json)):
+            stats = run_ingest_loop(ingest_func, json_file_path)
+            seconds = measure(lambda: run_ingest_loop(ingest_func, json_file_path), repeat=max(1, REPEAT // 2))
+            results[name] = {
+                'ops': matches,
+                'seconds': seconds,
+                'per_op_us': seconds / matches * 1e6,
+                'round_trips_per_op': stats['round_trips'] / matches
+            }
+            print(f"  ⏱️ {name}: {results[name]['per_op_us']:.1f}µs/경기 "
+                  f"(왕복 {results[name]['round_trips_per_op']:.2f}회/경기)")
+
+    return results
+
+
+def compare_with_baseline(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """
+    기준값 대비 변화율 계산
+
+    Returns:
+        list: (항목, 현재 µs/op, 기준 µs/op, 변화율, 회귀 여부) - 기준값에 없는 항목은 기준 None
+    """
+    rows = []
+    for name, result in results.items():
+        base = baseline.get('results', {}).get(name)
+        if not base:
+            rows.append((name, result['per_op_us'], None, None, False))
+            continue
+        change = result['per_op_us'] / base['per_op_us'] - 1
+        rows.append((name, result['per_op_us'], base['per_op_us'], change, change > threshold))
+    return rows
+
+
+def print_report(rows, threshold):
+    """비교 결과 표 출력"""
+    print(f"\n{'항목':<34} {'µs/op':>12} {'기준':>12} {'변화':>9}")
+    print("-" * 70)
+    for name, current, base, change, regressed in rows:
+        if base is None:
+            print(f"{name:<34} {current:>12.3f} {'-':>12} {'-':>9}")
+            continue
+        mark = " 🐢" if regressed else (" 🚀" if change < -threshold else "")
+        print(f"{name:<34} {current:>12.3f} {base:>12.3f} {change * 100:>+8.1f}%{mark}")
+
+
+def main():
+    """메인 함수"""
+
+    if len(sys.argv) > 1 and sys.argv[1] in ('-h', '--help'):
+        print("사용법: python -m benchmarks.run_benchmarks [경기 수] [기준점 수] [북메이커 수] [임계값 %] [--save-baseline]")
+        print("예시: python -m benchmarks.run_benchmarks 1000 8 12 20 --save-baseline")
+        print("")
+        print(f"기준값 파일: {BASELINE_PATH}")
+        print("--save-baseline: 이번 결과를 기준값으로 저장")
+        return
+
+    # 옵션 분리
+    save_baseline = '--save-baseline' in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+
+    config = {
+        'matches': int(args[0]) if len(args) > 0 else DEFAULT_MATCHES,
+        'handicaps': int(args[1]) if len(args) > 1 else DEFAULT_HANDICAPS,
+        'bookmakers': int(args[2]) if len(args) > 2 else DEFAULT_BOOKMAKERS
+    }
+    threshold = float(args[3]) / 100 if len(args) > 3 else REGRESSION_THRESHOLD
+
+    print(f"🚀 벤치마크 시작: 경기 {config['matches']}개 × 기준점 {config['handicaps']}개 × 북메이커 {config['bookmakers']}개")
+    results = run_benchmarks(**config)
+
+    baseline = None
+    comparable = False
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        comparable = baseline.get('config') == config
+        if not comparable:
+            print(f"⚠️ 기준값의 데이터 크기가 다릅니다: {baseline.get('config')} - 비교 결과는 참고용입니다")
+
+    rows = compare_with_baseline(results, baseline or {}, threshold)
+    print_report(rows, threshold)
+
+    if save_baseline:
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump({
+                'config': config,
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'results': results
+            }, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 기준값 저장: {BASELINE_PATH}")
+        return
+
+    regressions = [row[0] for row in rows if row[4]]
+    if regressions:
+        print(f"\n🐢 {threshold * 100:g}% 넘게 느려진 항목 {len(regressions)}개: {', '.join(regressions)}")
+        # 데이터 크기가 다른 기준값과의 비교는 참고용이므로 실패로 처리하지 않음
+        if comparable:
+            sys.exit(1)
+        return
+    if baseline:
+        print(f"\n✅ 회귀 없음 (임계값 {threshold * 100:g}%)")
+    else:
+        print("\nℹ️ 기준값이 없습니다 - --save-baseline으로 저장하세요")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+브라우저 수집 성능 측정 (로컬 fixture 사이트)
+
+합성 시즌으로 Flashscore와 같은 구조의 경기 요약 페이지와 over-under odds 페이지를 만들고
+fixture_server로 응답 지연을 넣어 제공한 뒤, 워커 수별로 다음 세 가지를 실행한다.
+
+- odds_colab: collect_odds_colab.process_match_worker (DriverPool 공유)
+- missing_status: collect_missing_data.extract_status_from_page
+- missing_odds: collect_missing_data.extract_odds_from_page (Over/Under 탭 클릭 포함)
+
+분당 페이지 수, 페이지별 소요 시간 p50/p95, Chrome RSS(chromedriver + Chrome 프로세스 합계),
+시간 구성(드라이버 시작 / 이동 driver.get / 대기 wait_for_any / 나머지 추출)을 출력한다.
+페이지 본문은 실제 사이트처럼 스크립트가 렌더링하므로 HTTP 파서로는 읽을 수 없어 브라우저 경로만 측정한다.
+페이지 캐시는 쓰지 않고 (cache=None) collect_missing_data의 요청 간격(RequestThrottle)도 적용하지 않는다.
+
+    python -m benchmarks.scrape_benchmark [경기 수] [워커 수 목록] [응답 지연 ms] [렌더링 지연 ms] [결과 JSON]
+"""
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import collect_missing_data
+import collect_odds_colab
+from benchmarks.synthetic import DEFAULT_BOOKMAKERS, DEFAULT_HANDICAPS, write_fixture_site
+from collect_odds_colab import DriverPool, driver_memory_usage, process_match_worker
+from fixture_server import start_fixture_server
+
+DEFAULT_MATCHES = 30
+DEFAULT_WORKERS = [1, 2, 4]
+DEFAULT_LATENCY_MS = 100
+DEFAULT_RENDER_DELAY_MS = 300
+# 응답 지연에 더하는 무작위 편차 (응답 지연 대비 비율)
+LATENCY_JITTER = 0.5
+# Chrome RSS 측정 간격 (초)
+RSS_SAMPLE_INTERVAL = 0.5
+
+MODES = ['odds_colab', 'missing_status', 'missing_odds']
+PHASES = ['startup', 'navigation', 'wait', 'extraction']
+
+
+class PageTimer:
+    """
+    페이지별 소요 시간과 구성 기록
+
+    페이지를 처리하는 스레드가 page()로 기록을 시작하면 같은 스레드의 드라이버 생성·이동·대기 시간이
+    그 페이지에 더해진다. 전체에서 세 가지를 뺀 나머지가 추출(page_source, 파싱, 클릭) 시간이다.
+    """
+
+    def __init__(self):
+        self.pages = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def page(self):
+        record = {'startup': 0.0, 'navigation': 0.0, 'wait': 0.0, 'success': False}
+        self._local.record = record
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['total'] = time.perf_counter() - start
+            record['extraction'] = max(0.0, record['total'] - record['startup'] - record['navigation'] - record['wait'])
+            self._local.record = None
+            with self._lock:
+                self.pages.append(record)
+
+    def add(self, phase, seconds):
+        record = getattr(self._local, 'record', None)
+        if record is not None:
+            record[phase] += seconds
+
+
+class TimedDriver:
+    """driver.get 시간을 PageTimer에 이동 시간으로 기록하는 드라이버 래퍼 (나머지는 그대로 위임)"""
+
+    def __init__(self, driver, timer):
+        self._driver = driver
+        self._timer = timer
+
+    def get(self, url):
+        start = time.perf_counter()
+        try:
+            return self._driver.get(url)
+        finally:
+            self._timer.add('navigation', time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+
+class RssSampler:
+    """살아 있는 드라이버들의 메모리 합계를 주기적으로 측정하는 백그라운드 스레드"""
+
+    def __init__(self, interval=RSS_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.drivers = []
+        self.samples = []
+        self.peak_per_driver = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            # 종료된 드라이버는 프로세스가 없으므로 0
+            usages = [driver_memory_usage(driver) for driver in list(self.drivers)]
+            self.samples.append(sum(usages))
+            self.peak_per_driver = max([self.peak_per_driver] + usages)
+
+
+@contextlib.contextmanager
+def timed_waits(timer):
+    """블록 안에서 수집기 모듈의 wait_for_any 시간을 PageTimer에 대기 시간으로 기록"""
+    modules = [collect_odds_colab, collect_missing_data]
+    originals = [module.wait_for_any for module in modules]
+
+    def make_timed(wait_for_any):
+        def timed_wait_for_any(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return wait_for_any(*args, **kwargs)
+            finally:
+                timer.add('wait', time.perf_counter() - start)
+        return timed_wait_for_any
+
+    for module, original in zip(modules, originals):
+        module.wait_for_any = make_timed(original)
+    try:
+        yield
+    finally:
+        for module, original in zip(modules, originals):
+            module.wait_for_any = original
+
+
+def percentile(values, fraction):
+    """정렬한 값의 nearest-rank 백분위수 (값이 없으면 0)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def run_mode(mode, matches, workers):
+    """
+    한 가지 수집 경로를 workers개 스레드로 실행
+
+    Returns:
+        dict: 측정 결과 (드라이버를 하나도 만들지 못하면 None)
+    """
+    timer = PageTimer()
+    sampler = RssSampler()
+    setup = collect_odds_colab.setup_selenium_driver_colab if mode == 'odds_colab' else collect_missing_data.setup_selenium_driver
+
+    def driver_factory():
+        start = time.perf_counter()
+        driver = setup()
+        timer.add('startup', time.perf_counter() - start)
+        if driver is None:
+            return None
+        sampler.drivers.append(driver)
+        return TimedDriver(driver, timer)
+
+    # collect_missing_data는 드라이버 하나를 끝까지 쓰므로 교체 없이 스레드 수만큼만 생성
+    if mode == 'odds_colab':
+        driver_pool = DriverPool(workers, driver_factory=driver_factory)
+    else:
+        driver_pool = DriverPool(workers, max_pages=len(matches) + 1, max_rss_mb=float('inf'), driver_factory=driver_factory)
+
+    def work(index, match):
+        match_id, match_info = match
+        with timer.page() as record:
+            if mode == 'odds_colab':
+                result = process_match_worker(match, index % workers, driver_pool)
+                record['success'] = bool(result and result.get('success'))
+                return
+
+            driver = driver_pool.acquire()
+            if driver is None:
+                return
+            try:
+                if mode == 'missing_status':
+                    record['success'] = bool(collect_missing_data.extract_status_from_page(driver, match_info['match_link']))
+                else:
+                    record['success'] = bool(collect_missing_data.extract_odds_from_page(driver, match_info['match_link']))
+            finally:
+                driver_pool.release(driver)
+
+    sampler.start()
+    start = time.perf_counter()
+    try:
+        # 수집기의 진행 출력은 버림
+        with timed_waits(timer), contextlib.redirect_stdout(io.StringIO()):
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(work, range(len(matches)), matches))
+    finally:
+        elapsed = time.perf_counter() - start
+        sampler.stop()
+        with contextlib.redirect_stdout(io.StringIO()):
+            driver_pool.close()
+
+    if driver_pool.stats['created'] == 0:
+        return None
+
+    totals = [page['total'] for page in timer.pages]
+    phase_seconds = {phase: sum(page[phase] for page in timer.pages) for phase in PHASES}
+    busy_seconds = sum(totals) or 1.0
+    return {
+        'mode': mode,
+        'workers': workers,
+        'pages': len(timer.pages),
+        'success': sum(1 for page in timer.pages if page['success']),
+        'seconds': elapsed,
+        'pages_per_min': len(timer.pages) / elapsed * 60 if elapsed else 0.0,
+        'p50_ms': percentile(totals, 0.50) * 1000,
+        'p95_ms': percentile(totals, 0.95) * 1000,
+        'phase_seconds': phase_seconds,
+        'phase_share': {phase: seconds / busy_seconds for phase, seconds in phase_seconds.items()},
+        'drivers_created': driver_pool.stats['created'],
+        'rss_peak_mb': max(sampler.samples, default=0) / 1024 / 1024,
+        'rss_avg_mb': sum(sampler.samples) / len(sampler.samples) / 1024 / 1024 if sampler.samples else 0.0,
+        'rss_per_driver_peak_mb': sampler.peak_per_driver / 1024 / 1024
+    }
+
+
+def print_results(results):
+    """측정 결과 표 출력"""
+    print(f"\n{'모드':<15} {'워커':>4} {'페이지':>6} {'성공':>5} {'분당':>7} {'p50(ms)':>8} {'p95(ms)':>8} "
+          f"{'시작%':>6} {'이동%':>6} {'대기%':>6} {'추출%':>6} {'RSS최대(MB)':>11}")
+    print("-" * 108)
+    for result in results:
+        share = result['phase_share']
+        print(f"{result['mode']:<15} {result['workers']:>4} {result['pages']:>6} {result['success']:>5} "
+              f"{result['pages_per_min']:>7.1f} {result['p50_ms']:>8.0f} {result['p95_ms']:>8.0f} "
+              f"{share['startup'] * 100:>6.1f} {share['navigation'] * 100:>6.1f} "
+              f"{share['wait'] * 100:>6.1f} {share['extraction'] * 100:>6.1f} {result['rss_peak_mb']:>11.0f}")
+
+
+def main():
+    """메인 함수"""
+
+    if len(sys.argv) > 1 and sys.argv[1] in ('-h', '--help'):
+        print("사용법: python -m benchmarks.scrape_benchmark [경기 수] [워커 수 목록] [응답 지연 ms] [렌더링 지연 ms] [결과 JSON]")
+        print("예시: python -m benchmarks.scrape_benchmark 30 1,2,4 100 300 scrape_results.json")
+        print("")
+        print("Chrome과 chromedriver가 필요합니다 (수집기와 같은 설정으로 실행)")
+        return
+
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    match_count = int(args[0]) if len(args) > 0 else DEFAULT_MATCHES
+    worker_counts = [int(value) for value in args[1].split(',')] if len(args) > 1 else DEFAULT_WORKERS
+    latency = float(args[2]) / 1000 if len(args) > 2 else DEFAULT_LATENCY_MS / 1000
+    render_delay_ms = int(args[3]) if len(args) > 3 else DEFAULT_RENDER_DELAY_MS
+    output_path = args[4] if len(args) > 4 else None
+
+    print(f"🚀 브라우저 수집 측정 시작: 경기 {match_count}개, 워커 {', '.join(map(str, worker_counts))}개, "
+          f"응답 지연 {latency * 1000:.0f}ms, 렌더링 지연 {render_delay_ms}ms")
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="flashscore_site_") as site_dir:
+        server, base_url = start_fixture_server(site_dir, latency=latency, jitter=latency * LATENCY_JITTER)
+        try:
+            matches = write_fixture_site(
+                site_dir, base_url, match_count, DEFAULT_HANDICAPS, DEFAULT_BOOKMAKERS, render_delay_ms
+            )
+            print(f"🌐 fixture 사이트: {base_url} (경기 {len(matches)}개 × 페이지 2개)")
+
+            for mode in MODES:
+                for workers in worker_counts:
+                    print(f"⏱️ {mode} - 워커 {workers}개 측정 중...")
+                    result = run_mode(mode, matches, workers)
+                    if result is None:
+                        print("❌ Chrome 드라이버를 만들 수 없습니다 - Chrome과 chromedriver 설치를 확인하세요")
+                        return
+                    results.append(result)
+        except KeyboardInterrupt:
+            print("\n⏹️ 측정 중단")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    if not results:
+        return
+    print_results(results)
+
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+합성 시즌 데이터 생성기
+
+수집기가 만드는 시즌 JSON과 같은 구조의 경기를 (경기 수 × 기준점 수 × 북메이커 수) 크기로 만든다.
+같은 seed면 항상 같은 데이터가 나오므로 변경 전후를 같은 입력으로 비교할 수 있다.
+write_fixture_site는 같은 경기로 Flashscore와 같은 구조의 경기 요약 페이지와 over-under odds 페이지를
+fixture_server가 제공할 디렉터리에 만든다.
+
+    python -m benchmarks.synthetic <출력 JSON> [경기 수] [기준점 수] [북메이커 수] [seed]
+"""
+
+import math
+import random
+import sys
+from datetime import datetime, timedelta
+from html import escape
+
+from fixture_server import save_fixture
+from http_fetcher import build_over_under_url
+from json_stream import write_season_file
+
+DEFAULT_MATCHES = 1000
+DEFAULT_HANDICAPS = 8
+DEFAULT_BOOKMAKERS = 12
+DEFAULT_SEED = 42
+
+# 팀 수 (경기 수가 많아도 리그 규모로 유지)
+DEFAULT_TEAMS = 20
+# 경기당 이벤트·통계 항목 수
+EVENTS_PER_MATCH = 6
+STATISTICS_CATEGORIES = [
+    'Ball Possession', 'Goal Attempts', 'Shots on Goal', 'Shots off Goal', 'Blocked Shots',
+    'Free Kicks', 'Corner Kicks', 'Offsides', 'Goalkeeper Saves', 'Fouls'
+]
+
+SEASON_START = datetime(2025, 8, 1, 19, 0)
+
+# fixture 페이지 본문은 <template>에 넣어 두고 스크립트가 render_delay_ms 뒤에 붙임 (실제 사이트처럼 동적 렌더링)
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko">
+<head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+<div id="detail"></div>
+<template id="content">{content}</template>{extra}
+<script>
+function renderTemplate(templateId, targetId) {{
+    var template = document.getElementById(templateId);
+    if (!template) return;
+    document.getElementById(targetId).appendChild(template.content.cloneNode(true));
+    template.remove();
+}}
+setTimeout(function () {{ renderTemplate('content', 'detail'); }}, {render_delay_ms});
+</script>
+</body>
+</html>
+"""
+
+
+def generate_over_under(rng, handicaps=DEFAULT_HANDICAPS, bookmakers=DEFAULT_BOOKMAKERS):
+    """
+    경기 하나의 over-under 라인 목록
+
+    기준점은 0.5부터 0.25 간격이고, 오버 배당률은 기준점이 높을수록 커진다.
+    수집기와 같이 배당률은 문자열, 평균은 소수 둘째 자리 문자열로 만든다.
+    """
+    expected_goals = rng.uniform(2.0, 3.2)
+    over_under = []
+
+    for index in range(handicaps):
+        handicap = 0.5 + 0.25 * index
+        # 오버 확률을 로지스틱 곡선으로 잡고 북메이커 마진 5%를 더함
+        over_probability = 1 / (1 + math.exp(1.6 * (handicap - expected_goals)))
+        over_probability = min(max(over_probability, 0.04), 0.96)
+
+        bookmaker_odds = []
+        for bookmaker in range(bookmakers):
+            jitter = rng.uniform(-0.04, 0.04)
+            over = max(1.01, 1 / (over_probability * 1.05) + jitter)
+            under = max(1.01, 1 / ((1 - over_probability) * 1.05) - jitter)
+            bookmaker_odds.append({
+                "bookmaker": f"bookmaker_{bookmaker:02d}",
+                "over": str(round(over, 2)),
+                "under": str(round(under, 2))
+            })
+
+        avg_over = sum(float(b['over']) for b in bookmaker_odds) / len(bookmaker_odds)
+        avg_under = sum(float(b['under']) for b in bookmaker_odds) / len(bookmaker_odds)
+        over_under.append({
+            "handicap": str(handicap),
+            "average": {
+                "over": f"{avg_over:.2f}",
+                "under": f"{avg_under:.2f}"
+            },
+            "bookmakers": bookmaker_odds
+        })
+
+    return over_under
+
+
+def generate_events(rng, home_score, away_score):
+    """경기 이벤트 (골은 점수와 맞추고 나머지는 카드·교체)"""
+    events = []
+    for team, score in (('홈', home_score), ('어웨이', away_score)):
+        for _ in range(score):
+            minute = rng.randint(1, 90)
+            events.append({
+                "eventType": "골", "time": minute, "team": team,
+                "description": f"{minute}'", "player": f"Player {rng.randint(1, 300)}"
+            })
+
+    for _ in range(max(0, EVENTS_PER_MATCH - len(events))):
+        minute = rng.randint(1, 90)
+        team = rng.choice(('홈', '어웨이'))
+        if rng.random() < 0.5:
+            events.append({
+                "eventType": "카드", "time": minute, "team": team, "card_type": "Yellow Card",
+                "description": f"{minute}'", "player": f"Player {rng.randint(1, 300)}"
+            })
+        else:
+            events.append({
+                "eventType": "교체", "time": minute, "team": team, "description": f"{minute}'",
+                "player_out": f"Player {rng.randint(1, 300)}", "player_in": f"Player {rng.randint(1, 300)}"
+            })
+
+    events.sort(key=lambda event: event['time'])
+    return {
+        "firstHalfScore": f"{home_score // 2} - {away_score // 2}",
+        "secondHalfScore": f"{home_score - home_score // 2} - {away_score - away_score // 2}",
+        "events": events
+    }
+
+
+def generate_match(rng, index, teams, handicaps=DEFAULT_HANDICAPS, bookmakers=DEFAULT_BOOKMAKERS):
+    """
+    경기 하나의 (match_id, match_data)
+
+    handicaps가 0이면 odds는 None (odds를 아직 수집하지 않은 경기)
+    """
+    match_id = f"M{index:07d}"
+    home, away = rng.sample(teams, 2)
+    home_score, away_score = rng.randint(0, 4), rng.randint(0, 4)
+    match_time = SEASON_START + timedelta(hours=6 * index)
+
+    match_data = {
+        "stage": "SYNTHETIC: League",
+        "date": match_time.strftime('%d.%m.%Y %H:%M'),
+        "status": "Finished",
+        "home": {"name": home[1], "id": home[0]},
+        "away": {"name": away[1], "id": away[0]},
+        "result": {"home": str(home_score), "away": str(away_score)},
+        "match_link": f"https://www.flashscore.co.kr/match/soccer/{home[0]}/{away[0]}/?mid={match_id}#/match-summary/match-summary",
+        "statistics": [
+            {"category": category, "homeValue": str(rng.randint(0, 20)), "awayValue": str(rng.randint(0, 20))}
+            for category in STATISTICS_CATEGORIES
+        ],
+        "events": generate_events(rng, home_score, away_score),
+        "odds": {"over-under": generate_over_under(rng, handicaps, bookmakers)} if handicaps else None
+    }
+    return match_id, match_data
+
+
+def generate_season(matches=DEFAULT_MATCHES, handicaps=DEFAULT_HANDICAPS, bookmakers=DEFAULT_BOOKMAKERS,
+                    seed=DEFAULT_SEED, teams=DEFAULT_TEAMS):
+    """
+    합성 시즌의 (match_id, match_data) 쌍 생성 (한 경기씩 만들므로 경기 수와 무관하게 메모리 일정)
+    """
+    rng = random.Random(seed)
+    team_list = [(f"team{seed}_{index:03d}", f"Synthetic Team {index}") for index in range(teams)]
+    for index in range(matches):
+        yield generate_match(rng, index, team_list, handicaps, bookmakers)
+
+
+def render_summary_page(match_data, render_delay_ms=0):
+    """
+    경기 요약 페이지 HTML
+
+    상태는 .detailScore__status에 있고, Over/Under 탭을 누르면 기준점별 평균 배당률 표(.odds-table)가 나타난다.
+    """
+    home, away = escape(match_data['home']['name']), escape(match_data['away']['name'])
+    rows = "".join(
+        f"<tr><td>{line['handicap']}</td><td>{line['average']['over']}</td><td>{line['average']['under']}</td></tr>"
+        for line in (match_data['odds'] or {}).get('over-under', [])
+    )
+    content = (
+        '<div class="duelParticipant">'
+        f'<div class="duelParticipant__home"><div class="participant__participantName">{home}</div></div>'
+        f'<div class="detailScore__wrapper"><span>{match_data["result"]["home"]}</span><span>-</span>'
+        f'<span>{match_data["result"]["away"]}</span></div>'
+        f'<div class="detailScore__status">{escape(match_data["status"])}</div>'
+        f'<div class="duelParticipant__away"><div class="participant__participantName">{away}</div></div>'
+        '</div>'
+        '<div class="tabs__group"><a href="#/odds-comparison/over-under/full-time">'
+        '<span onclick="renderTemplate(\'over-under-table\', \'odds-comparison\')">Over/Under</span></a></div>'
+        '<div id="odds-comparison"></div>'
+    )
+    extra = (
+        f'\n<template id="over-under-table"><table class="odds-table"><tbody>{rows}</tbody></table></template>'
+    )
+    return PAGE_TEMPLATE.format(
+        title=f"{home} - {away} | 경기 요약", content=content, extra=extra, render_delay_ms=render_delay_ms
+    )
+
+
+def render_over_under_page(match_data, render_delay_ms=0):
+    """over-under full-time odds 페이지 HTML (북메이커별 .ui-table__row 행)"""
+    home, away = escape(match_data['home']['name']), escape(match_data['away']['name'])
+    rows = []
+    for line in (match_data['odds'] or {}).get('over-under', []):
+        for bookmaker in line['bookmakers']:
+            name = escape(bookmaker['bookmaker'])
+            rows.append(
+                '<div class="ui-table__row">'
+                f'<div class="oddsCell__bookmakerPart"><img class="prematchLogo" title="{name}" alt="{name}"></div>'
+                f'<span class="oddsCell__noOddsCell" data-testid="wcl-oddsValue">{line["handicap"]}</span>'
+                f'<a class="oddsCell__odd"><span>{bookmaker["over"]}</span></a>'
+                f'<a class="oddsCell__odd"><span>{bookmaker["under"]}</span></a>'
+                '</div>'
+            )
+    content = f'<div class="ui-table oddsTab__tableWrapper">{"".join(rows)}</div>'
+    return PAGE_TEMPLATE.format(
+        title=f"{home} - {away} | 오버/언더 배당률", content=content, extra="", render_delay_ms=render_delay_ms
+    )
+
+
+def write_fixture_site(fixture_dir, base_url, matches=DEFAULT_MATCHES, handicaps=DEFAULT_HANDICAPS,
+                       bookmakers=DEFAULT_BOOKMAKERS, render_delay_ms=0, seed=DEFAULT_SEED):
+    """
+    합성 경기마다 경기 요약 페이지와 over-under odds 페이지를 fixture 디렉터리에 저장
+
+    합성 팀 조합은 시즌 안에서 겹치므로 match_link는 base_url 아래의 경기별 고유 경로로 바꾼다.
+
+    Returns:
+        list: 수집 대상 (match_id, match_data) - match_link는 base_url 기준, odds는 None
+    """
+    site_matches = []
+    for match_id, match_data in generate_season(matches, max(1, handicaps), bookmakers, seed):
+        match_link = (
+            f"{base_url.rstrip('/')}/match/soccer/{match_data['home']['id']}-{match_id.lower()}/"
+            f"{match_data['away']['id']}/?mid={match_id}#/match-summary/match-summary"
+        )
+        save_fixture(fixture_dir, match_link, render_summary_page(match_data, render_delay_ms))
+        save_fixture(fixture_dir, build_over_under_url(match_link), render_over_under_page(match_data, render_delay_ms))
+
+        match_data['match_link'] = match_link
+        match_data['odds'] = None
+        site_matches.append((match_id, match_data))
+    return site_matches
+
+
+def write_synthetic_season(file_path, matches=DEFAULT_MATCHES, handicaps=DEFAULT_HANDICAPS,
+                           bookmakers=DEFAULT_BOOKMAKERS, seed=DEFAULT_SEED):
+    """
+    합성 시즌을 시즌 JSON 파일로 저장
+
+    Returns:
+        int: 기록한 경기 수
+    """
+    return write_season_file(
+        file_path, generate_season(matches, handicaps, bookmakers, seed), keep_backups=0
+    )
+
+
+def main():
+    """메인 함수"""
+
+    if len(sys.argv) < 2 or sys.argv[1] in ('-h', '--help'):
+        print("사용법: python -m benchmarks.synthetic <출력 JSON> [경기 수] [기준점 수] [북메이커 수] [seed]")
+        print("예시: python -m benchmarks.synthetic /tmp/soccer_synthetic_league-2025-2026.json 10000 8 12")
+        return
+
+    file_path = sys.argv[1]
+    matches = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_MATCHES
+    handicaps = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_HANDICAPS
+    bookmakers = int(sys.argv[4]) if len(sys.argv) > 4 else DEFAULT_BOOKMAKERS
+    seed = int(sys.argv[5]) if len(sys.argv) > 5 else DEFAULT_SEED
+
+    count = write_synthetic_season(file_path, matches, handicaps, bookmakers, seed)
+    print(f"💾 합성 시즌 {count}개 경기 저장: {file_path} (기준점 {handicaps}개 × 북메이커 {bookmakers}개)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+-- matches.best_benchmark / best_over_odds / best_under_odds 서버 측 재계산
+-- Supabase PostgreSQL용 (PostgreSQL 11 이상 - 트리거 전이 테이블, EXECUTE FUNCTION 사용)
+--
+-- 선택 규칙은 best_odds.py의 find_best_odds와 같다.
+--   1. |avg_over - avg_under|가 가장 작은 라인
+--   2. 차이가 같으면 avg_over가 더 높은 라인
+--   3. 그것도 같으면 먼저 들어온 라인 (handicap_odds.id 순)
+-- 차이는 파이썬과 같은 결과가 나오도록 float8로 계산한다 (NUMERIC으로 계산하면 동점 판정이 달라짐)
+
+-- 1. 지정한 경기들의 best 컬럼 갱신 (handicap_odds 라인이 없으면 NULL)
+CREATE OR REPLACE FUNCTION refresh_best_benchmark(p_match_ids TEXT[])
+RETURNS INTEGER AS $$
+DECLARE
+    updated_count INTEGER;
+BEGIN
+    WITH best AS (
+        SELECT DISTINCT ON (h.match_id)
+            h.match_id, h.handicap, h.avg_over, h.avg_under
+        FROM handicap_odds h
+        WHERE h.match_id = ANY(p_match_ids)
+          AND h.avg_over IS NOT NULL
+          AND h.avg_under IS NOT NULL
+        ORDER BY h.match_id, abs(h.avg_over::float8 - h.avg_under::float8), h.avg_over DESC, h.id
+    )
+    UPDATE matches m
+    SET best_benchmark = b.handicap,
+        best_over_odds = b.avg_over,
+        best_under_odds = b.avg_under
+    FROM unnest(p_match_ids) AS t(match_id)
+    LEFT JOIN best b ON b.match_id = t.match_id
+    WHERE m.id = t.match_id
+      AND (m.best_benchmark, m.best_over_odds, m.best_under_odds)
+          IS DISTINCT FROM (b.handicap, b.avg_over, b.avg_under);
+
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 2. 시즌 단위 재계산 (p_season이 NULL이면 전체) - 한 번의 set 기반 UPDATE
+--    refresh_best_benchmark와 같이 handicap_odds 라인이 없는 경기는 NULL로 비운다
+CREATE OR REPLACE FUNCTION recompute_best_benchmark(p_season TEXT DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    updated_count INTEGER;
+BEGIN
+    WITH best AS (
+        SELECT DISTINCT ON (h.match_id)
+            h.match_id, h.handicap, h.avg_over, h.avg_under
+        FROM handicap_odds h
+        JOIN matches m ON m.id = h.match_id
+        WHERE (p_season IS NULL OR m.season = p_season)
+          AND h.avg_over IS NOT NULL
+          AND h.avg_under IS NOT NULL
+        ORDER BY h.match_id, abs(h.avg_over::float8 - h.avg_under::float8), h.avg_over DESC, h.id
+    )
+    UPDATE matches m
+    SET best_benchmark = b.handicap,
+        best_over_odds = b.avg_over,
+        best_under_odds = b.avg_under
+    FROM matches t
+    LEFT JOIN best b ON b.match_id = t.id
+    WHERE m.id = t.id
+      AND (p_season IS NULL OR t.season = p_season)
+      AND (m.best_benchmark, m.best_over_odds, m.best_under_odds)
+          IS DISTINCT FROM (b.handicap, b.avg_over, b.avg_under);
+
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 3. handicap_odds 변경 시 자동 갱신 트리거 함수 (문장 단위, 변경된 경기만)
+CREATE OR REPLACE FUNCTION handicap_odds_refresh_best_benchmark()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM refresh_best_benchmark(ARRAY(SELECT DISTINCT match_id FROM new_rows));
+    ELSIF TG_OP = 'UPDATE' THEN
+        PERFORM refresh_best_benchmark(ARRAY(
+            SELECT match_id FROM new_rows UNION SELECT match_id FROM old_rows
+        ));
+    ELSE
+        PERFORM refresh_best_benchmark(ARRAY(SELECT DISTINCT match_id FROM old_rows));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 4. 트리거 적용 (전이 테이블을 쓰는 트리거는 이벤트 하나만 지정할 수 있어 세 개로 나눔)
+DROP TRIGGER IF EXISTS handicap_odds_best_benchmark_insert ON handicap_odds;
+CREATE TRIGGER handicap_odds_best_benchmark_insert
+    AFTER INSERT ON handicap_odds
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION handicap_odds_refresh_best_benchmark();
+
+DROP TRIGGER IF EXISTS handicap_odds_best_benchmark_update ON handicap_odds;
+CREATE TRIGGER handicap_odds_best_benchmark_update
+    AFTER UPDATE ON handicap_odds
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION handicap_odds_refresh_best_benchmark();
+
+DROP TRIGGER IF EXISTS handicap_odds_best_benchmark_delete ON handicap_odds;
+CREATE TRIGGER handicap_odds_best_benchmark_delete
+    AFTER DELETE ON handicap_odds
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION handicap_odds_refresh_best_benchmark();
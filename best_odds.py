@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+기준점(best_benchmark) 선택 규칙
+
+경기의 over-under 라인 중 오버/언더 평균 배당률 차이의 절댓값이 가장 작은 라인을 고른다.
+차이가 같으면 오버 배당률이 더 높은 라인, 그것도 같으면 먼저 나온 라인을 고른다.
+수집기(collect_*.py)와 적재 스크립트(insert_matches.py 등)가 모두 이 모듈을 사용하며,
+여러 경기를 모아 find_best_odds_batch로 배치(청크·flush) 단위로 한 번에 고른다.
+(src/services/database/index.js의 JS 구현도 같은 규칙을 따른다)
+"""
+
+import numpy as np
+
+
+def find_best_odds(over_under_odds_list):
+    """
+    최적의 배당률을 찾는 함수
+    1. 오버배당률과 언더배당률의 차이의 절댓값이 가장 작은 것
+    2. 차이가 같으면 오버 배당률이 더 높은 것
+    3. 그것도 같으면 먼저 나온 것
+    """
+    if not over_under_odds_list or len(over_under_odds_list) == 0:
+        return None
+
+    best_odds = None
+    min_difference = float('inf')
+    max_over_odds = -1
+
+    for odds_data in over_under_odds_list:
+        try:
+            over_odds = float(odds_data['average']['over'])
+            under_odds = float(odds_data['average']['under'])
+
+            # 오버배당률과 언더배당률의 차이 절댓값
+            difference = abs(over_odds - under_odds)
+
+            # 조건 1: 차이가 가장 작은 것
+            if difference < min_difference:
+                min_difference = difference
+                max_over_odds = over_odds
+                best_odds = odds_data
+            # 조건 2: 차이가 같으면 오버 배당률이 더 높은 것
+            elif difference == min_difference and over_odds > max_over_odds:
+                max_over_odds = over_odds
+                best_odds = odds_data
+
+        except (ValueError, KeyError, TypeError):
+            # 숫자 변환 실패 시 해당 데이터 건너뛰기
+            continue
+
+    return best_odds
+
+
+def select_best_lines(group_ids, over, under, n_groups=None):
+    """
+    그룹(경기)별 기준점 라인을 한 번에 선택
+
+    find_best_odds와 같은 규칙을 배열 전체에 적용한다.
+
+    Args:
+        group_ids: 라인별 그룹(경기) 인덱스 배열 (0부터, 정렬되어 있지 않아도 됨)
+        over: 라인별 오버 평균 배당률 배열 (변환 실패는 NaN)
+        under: 라인별 언더 평균 배당률 배열 (변환 실패는 NaN)
+        n_groups: 그룹 수 (없으면 group_ids 최댓값 + 1)
+
+    Returns:
+        numpy.ndarray: 그룹별로 선택된 라인 인덱스 (선택할 라인이 없으면 -1)
+    """
+    group_ids = np.asarray(group_ids, dtype=np.int64)
+    over = np.asarray(over, dtype=float)
+    under = np.asarray(under, dtype=float)
+    if n_groups is None:
+        n_groups = int(group_ids.max()) + 1 if len(group_ids) else 0
+
+    selected = np.full(n_groups, -1, dtype=np.int64)
+
+    with np.errstate(invalid='ignore'):
+        difference = np.abs(over - under)
+    # NaN은 어떤 비교에서도 선택되지 않음
+    # 차이가 무한대인 라인은 find_best_odds의 초기값(오버 -1)보다 오버가 커야 선택됨
+    valid = ~np.isnan(difference) & (np.isfinite(difference) | (over > -1))
+    lines = np.flatnonzero(valid)
+    if len(lines) == 0:
+        return selected
+
+    # 그룹 → 차이 오름차순 → 오버 내림차순 → 원래 순서로 정렬 (안정 정렬을 뒤에서부터 적용)
+    order = lines[np.argsort(-over[lines], kind='stable')]
+    order = order[np.argsort(difference[order], kind='stable')]
+    order = order[np.argsort(group_ids[order], kind='stable')]
+
+    # 각 그룹의 첫 번째 라인이 선택됨
+    sorted_groups = group_ids[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = sorted_groups[1:] != sorted_groups[:-1]
+    selected[sorted_groups[first]] = order[first]
+    return selected
+
+
+def _parse_average(odds_data, side):
+    try:
+        return float(odds_data['average'][side])
+    except (ValueError, KeyError, TypeError):
+        return np.nan
+
+
+def find_best_odds_batch(over_under_odds_lists):
+    """
+    여러 경기의 over-under 라인 목록에서 각 경기의 최적 배당률을 한 번에 선택
+
+    Args:
+        over_under_odds_lists: 경기별 over-under 라인 리스트의 리스트 (리스트가 아닌 항목은 라인 없음)
+
+    Returns:
+        list: 경기 순서대로 선택된 라인 (find_best_odds 결과와 같음, 없으면 None)
+    """
+    over_under_odds_lists = [
+        odds_list if isinstance(odds_list, (list, tuple)) else [] for odds_list in over_under_odds_lists
+    ]
+    lines = [odds_data for odds_list in over_under_odds_lists for odds_data in odds_list]
+    group_ids = np.repeat(
+        np.arange(len(over_under_odds_lists), dtype=np.int64),
+        [len(odds_list) for odds_list in over_under_odds_lists]
+    )
+    # 한쪽이라도 변환에 실패하면 차이가 NaN이 되어 선택되지 않음
+    over = np.array([_parse_average(odds_data, 'over') for odds_data in lines], dtype=float)
+    under = np.array([_parse_average(odds_data, 'under') for odds_data in lines], dtype=float)
+
+    selected = select_best_lines(group_ids, over, under, len(over_under_odds_lists))
+    return [lines[index] if index >= 0 else None for index in selected.tolist()]
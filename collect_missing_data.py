@@ -4,41 +4,52 @@
 """
 
 import json
-import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 import os
+import queue
 import sys
+import threading
 from datetime import datetime
 import requests
-from bs4 import BeautifulSoup
 import time
-import re
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-
-# 데이터베이스 설정
-DB_CONFIG = {
-    "host": "aws-1-ap-northeast-2.pooler.supabase.com",
-    "database": "postgres",
-    "user": "postgres.dvwwcmhzlllaukscjuya",
-    "password": "!Qdhdbrclf56",
-    "port": "6543"
-}
-
-def connect_to_db():
-    """데이터베이스 연결"""
-    try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        print("✅ 데이터베이스 연결 성공")
-        return conn
-    except Exception as e:
-        print(f"❌ 데이터베이스 연결 실패: {e}")
-        return None
+
+from best_odds import find_best_odds_batch
+from database import connect_to_db, release_connection
+from html_parsers import is_finished_status, parse_odds_tables_html, parse_over_under_page, parse_status_html
+from http_fetcher import (
+    HTTP_FIRST, build_over_under_url, create_session, fetch_over_under_http, fetch_status_http, request_url
+)
+from page_cache import open_page_cache
+from result_journal import ResultJournal
+from selenium_waits import RequestThrottle, wait_for_any
+
+# 경기 업데이트 write-behind 설정
+UPDATE_BATCH_SIZE = 50       # 이만큼 모이면 바로 기록
+UPDATE_FLUSH_INTERVAL = 5.0  # 첫 항목 이후 이 시간(초)이 지나면 기록
+UPDATE_QUEUE_SIZE = 1000     # 기록 대기 최대 개수 (가득 차면 수집 루프가 대기)
+UPDATE_CLOSE_TIMEOUT = 120.0  # close()가 남은 기록을 기다리는 최대 시간(초)
+# 기록에 실패한 업데이트를 남겨 두는 JSONL 파일 (다음 실행 때 다시 수집하거나 직접 반영)
+FAILED_UPDATES_PATH = "failed_match_updates.jsonl"
+
+# 페이지 요청 사이 최소 간격 (초)
+REQUEST_INTERVAL = 2.0
+
+# 대기 선택자 (By, 선택자, 타임아웃 초) - 하나라도 나타나면 바로 진행
+STATUS_LOCATORS = [
+    (By.CSS_SELECTOR, '.event__time', 10),
+    (By.CSS_SELECTOR, '.event__stage', 10),
+    (By.CSS_SELECTOR, '.detailScore__status', 10),
+    (By.CSS_SELECTOR, '.matchInfo__status', 10)
+]
+OVER_UNDER_TAB_XPATH = "//span[contains(text(), 'Over/Under') or contains(text(), '오버/언더')]"
+ODDS_TABLE_LOCATORS = [
+    (By.CSS_SELECTOR, '.odds-table', 10),
+    (By.CSS_SELECTOR, '.oddsTable', 10),
+    (By.TAG_NAME, 'table', 5)
+]
 
 def setup_selenium_driver():
     """Selenium 드라이버 설정"""
@@ -52,61 +63,54 @@ def setup_selenium_driver():
     
     try:
         driver = webdriver.Chrome(options=chrome_options)
-        driver.implicitly_wait(10)
+        # 대기는 selenium_waits로 명시적으로 처리 (implicit wait는 없는 요소를 찾을 때마다 지연됨)
+        driver.implicitly_wait(0)
         return driver
     except Exception as e:
         print(f"❌ Selenium 드라이버 설정 실패: {e}")
         return None
 
-def extract_status_from_page(driver, match_link):
-    """경기 페이지에서 status 정보 추출"""
+def extract_status_from_page(driver, match_link, cache=None):
+    """경기 페이지에서 status 정보 추출 (cache가 있으면 렌더링된 페이지를 저장)"""
     try:
         driver.get(match_link)
-        time.sleep(3)  # 페이지 로딩 대기
+        wait_for_any(driver, STATUS_LOCATORS)  # 상태 요소가 나타날 때까지 대기
         
-        # status를 찾기 위한 여러 선택자 시도
-        status_selectors = [
-            '.event__time',
-            '.event__stage',
-            '.detailScore__status',
-            '.matchInfo__status',
-            '[class*="status"]',
-            '[class*="time"]'
-        ]
-        
-        for selector in status_selectors:
-            try:
-                elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    text = element.text.strip()
-                    if text and text not in ['', 'VS', 'v', '-']:
-                        # 경기 상태 판별
-                        if any(keyword in text.lower() for keyword in ['종료', 'finished', 'ft', '완료']):
-                            return "종료"
-                        elif any(keyword in text.lower() for keyword in ['live', '진행', '중']):
-                            return "진행중"
-                        elif any(keyword in text.lower() for keyword in ['예정', 'scheduled', 'upcoming']):
-                            return "예정"
-                        elif ':' in text and len(text) <= 5:  # 시간 형태 (예: "90+5", "HT")
-                            continue
-                        else:
-                            return text
-            except:
-                continue
-        
-        return None
+        # 페이지 HTML을 한 번만 받아서 상태 판별
+        page_source = driver.page_source
+        status = parse_status_html(page_source)
+        if cache is not None and status:
+            cache.put(request_url(match_link), page_source, is_finished_status(status))
+        return status
         
     except Exception as e:
         print(f"⚠️ status 추출 실패 ({match_link}): {e}")
         return None
 
-def extract_odds_from_page(driver, match_link):
-    """경기 페이지에서 odds 정보 추출"""
+def extract_odds_from_page(driver, match_link, cache=None, finished=False):
+    """
+    경기 페이지에서 odds 정보 추출
+
+    cache가 있으면 over-under 페이지 주소를 키로 캐시를 먼저 확인하고,
+    브라우저로 렌더링한 페이지는 odds 행을 파싱했을 때만 저장한다.
+
+    Args:
+        finished: 경기가 종료되었으면 True (캐시된 odds 페이지가 만료되지 않음)
+    """
+    cache_url = request_url(build_over_under_url(match_link))
+    if cache is not None:
+        html = cache.get(cache_url)
+        if html is not None:
+            over_under = parse_over_under_page(html)
+            if over_under:
+                return {"over-under": over_under}
+
     try:
         # odds 페이지로 이동
         odds_link = match_link.replace('#/match-summary/match-summary', '#/odds-comparison/1x2-odds/full-time')
         driver.get(odds_link)
-        time.sleep(5)  # 동적 로딩 대기
+        # 동적 로딩 대기 (Over/Under 탭이나 odds 테이블이 나타나면 바로 진행)
+        wait_for_any(driver, [(By.XPATH, OVER_UNDER_TAB_XPATH, 10)] + ODDS_TABLE_LOCATORS)
         
         # Over/Under odds 찾기
         odds_data = {
@@ -115,55 +119,18 @@ def extract_odds_from_page(driver, match_link):
         
         # Over/Under 탭 클릭 시도
         try:
-            over_under_tab = driver.find_element(By.XPATH, "//span[contains(text(), 'Over/Under') or contains(text(), '오버/언더')]")
+            over_under_tab = driver.find_element(By.XPATH, OVER_UNDER_TAB_XPATH)
             over_under_tab.click()
-            time.sleep(3)
+            wait_for_any(driver, ODDS_TABLE_LOCATORS)
         except:
             pass
         
-        # Over/Under odds 테이블 찾기
+        # Over/Under odds 테이블 찾기 (페이지 HTML을 한 번만 받아서 파싱)
         try:
-            # 다양한 선택자로 odds 테이블 찾기
-            table_selectors = [
-                '.odds-table',
-                '.oddsTable',
-                '[class*="odds"]',
-                'table'
-            ]
-            
-            for selector in table_selectors:
-                try:
-                    tables = driver.find_elements(By.CSS_SELECTOR, selector)
-                    for table in tables:
-                        rows = table.find_elements(By.TAG_NAME, 'tr')
-                        for row in rows:
-                            cells = row.find_elements(By.TAG_NAME, 'td')
-                            if len(cells) >= 3:
-                                # 첫 번째 셀에서 handicap 값 추출
-                                handicap_text = cells[0].text.strip()
-                                if re.match(r'^\d+\.?\d*$', handicap_text):
-                                    handicap = float(handicap_text)
-                                    
-                                    # 두 번째와 세 번째 셀에서 over/under odds 추출
-                                    over_text = cells[1].text.strip()
-                                    under_text = cells[2].text.strip()
-                                    
-                                    if re.match(r'^\d+\.?\d*$', over_text) and re.match(r'^\d+\.?\d*$', under_text):
-                                        over_odds = float(over_text)
-                                        under_odds = float(under_text)
-                                        
-                                        odds_entry = {
-                                            "handicap": str(handicap),
-                                            "average": {
-                                                "over": str(over_odds),
-                                                "under": str(under_odds)
-                                            },
-                                            "bookmakers": []
-                                        }
-                                        odds_data["over-under"].append(odds_entry)
-                except:
-                    continue
-                    
+            page_source = driver.page_source
+            odds_data["over-under"] = parse_odds_tables_html(page_source)
+            if cache is not None and odds_data["over-under"]:
+                cache.put(cache_url, page_source, finished)
         except Exception as e:
             print(f"⚠️ odds 테이블 파싱 실패: {e}")
         
@@ -173,11 +140,11 @@ def extract_odds_from_page(driver, match_link):
         print(f"⚠️ odds 추출 실패 ({match_link}): {e}")
         return None
 
-def get_matches_missing_data():
-    """데이터베이스에서 누락된 데이터가 있는 경기들 조회"""
+def get_matches_missing_data(limit=50):
+    """데이터베이스에서 누락된 데이터가 있는 경기들 조회 (종류별 최대 limit개)"""
     conn = connect_to_db()
     if not conn:
-        return []
+        return [], []
     
     try:
         cursor = conn.cursor(cursor_factory=RealDictCursor)
@@ -189,8 +156,8 @@ def get_matches_missing_data():
             WHERE (status IS NULL OR status = 'Unknown') 
             AND match_link IS NOT NULL
             ORDER BY match_time DESC
-            LIMIT 50
-        """)
+            LIMIT %s
+        """, (limit,))
         
         missing_status_matches = cursor.fetchall()
         
@@ -203,8 +170,8 @@ def get_matches_missing_data():
             AND status != 'Unknown'
             AND match_link IS NOT NULL
             ORDER BY match_time DESC
-            LIMIT 50
-        """)
+            LIMIT %s
+        """, (limit,))
         
         missing_odds_matches = cursor.fetchall()
         
@@ -215,92 +182,223 @@ def get_matches_missing_data():
         return [], []
     finally:
         cursor.close()
-        conn.close()
+        release_connection(conn)
 
-def update_match_status(match_id, status):
-    """경기 상태 업데이트"""
-    conn = connect_to_db()
-    if not conn:
-        return False
-    
-    try:
-        cursor = conn.cursor()
-        cursor.execute(
-            "UPDATE matches SET status = %s WHERE id = %s",
-            (status, match_id)
-        )
-        conn.commit()
-        print(f"✅ status 업데이트: {match_id} -> {status}")
-        return True
-    except Exception as e:
-        print(f"❌ status 업데이트 실패: {e}")
-        conn.rollback()
-        return False
-    finally:
-        cursor.close()
-        conn.close()
+class MatchUpdateWriter:
+    """
+    경기 status/odds 업데이트를 모아서 백그라운드 스레드가 일괄 기록하는 write-behind 버퍼
 
-def update_match_odds(match_id, best_benchmark, best_over_odds, best_under_odds):
-    """경기 배당률 업데이트"""
-    conn = connect_to_db()
-    if not conn:
-        return False
-    
-    try:
-        cursor = conn.cursor()
-        cursor.execute(
-            "UPDATE matches SET best_benchmark = %s, best_over_odds = %s, best_under_odds = %s WHERE id = %s",
-            (best_benchmark, best_over_odds, best_under_odds, match_id)
-        )
-        conn.commit()
-        print(f"✅ odds 업데이트: {match_id} -> {best_benchmark}/{best_over_odds}/{best_under_odds}")
-        return True
-    except Exception as e:
-        print(f"❌ odds 업데이트 실패: {e}")
-        conn.rollback()
-        return False
-    finally:
-        cursor.close()
-        conn.close()
+    수집 루프는 update_status/update_over_under로 큐에 넣고 바로 다음 경기로 넘어간다.
+    큐에 쌓인 경기가 batch_size개가 되거나 첫 항목 이후 flush_interval초가 지나면
+    UPDATE ... FROM (VALUES ...) 한 번으로 기록한다. over-under 라인의 기준점은 기록할 때
+    find_best_odds_batch로 배치 전체를 한 번에 고르고, 고를 라인이 없는 경기는 no_best로 센다.
+    큐가 가득 차면 기록이 따라잡을 때까지 update_*가 대기하고, close()는 남은 항목을 모두 기록한다.
+    기록에 실패한 경기는 failed_path(JSONL)에 남기고, 백그라운드 스레드가 멈췄으면
+    이후 업데이트도 같은 파일에 바로 남긴다.
+    """
 
-def find_best_odds(over_under_odds_list):
-    """최적의 배당률을 찾는 함수"""
-    if not over_under_odds_list or len(over_under_odds_list) == 0:
-        return None
-    
-    best_odds = None
-    min_difference = float('inf')
-    max_over_odds = -1
-    
-    for odds_data in over_under_odds_list:
+    _STOP = object()
+
+    def __init__(self, batch_size=UPDATE_BATCH_SIZE, flush_interval=UPDATE_FLUSH_INTERVAL,
+                 max_pending=UPDATE_QUEUE_SIZE, failed_path=FAILED_UPDATES_PATH):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.stats = {'written': 0, 'failed': 0, 'batches': 0, 'no_best': 0}
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        self._failed_journal = ResultJournal(failed_path)
+        self._thread = threading.Thread(target=self._run, name="match-update-writer", daemon=True)
+        self._thread.start()
+
+    def update_status(self, match_id, status):
+        """경기 상태 업데이트 예약"""
+        self._submit(match_id, {'status': status})
+
+    def update_over_under(self, match_id, over_under):
+        """수집한 over-under 라인으로 경기 기준점 업데이트 예약 (기준점은 기록할 때 배치로 선택)"""
+        self._submit(match_id, {'over_under': over_under})
+
+    def update_odds(self, match_id, best_benchmark, best_over_odds, best_under_odds):
+        """경기 배당률 업데이트 예약"""
+        self._submit(match_id, {
+            'best_benchmark': best_benchmark,
+            'best_over_odds': best_over_odds,
+            'best_under_odds': best_under_odds
+        })
+
+    def _submit(self, match_id, values):
+        if self._closed:
+            raise RuntimeError("이미 종료된 MatchUpdateWriter")
+        # 큐가 가득 찬 채로 스레드가 멈췄으면 영원히 기다리지 않도록 주기적으로 확인
+        while self._thread.is_alive():
+            try:
+                self._queue.put((match_id, values), timeout=1.0)
+                return
+            except queue.Full:
+                continue
+        self._record_failed({match_id: values}, "기록 스레드가 종료됨")
+
+    def close(self, timeout=UPDATE_CLOSE_TIMEOUT):
+        """남은 업데이트를 모두 기록하고 백그라운드 스레드 종료 (timeout초 안에 끝나지 않으면 포기)"""
+        deadline = time.monotonic() + timeout
+        if not self._closed:
+            self._closed = True
+            while self._thread.is_alive():
+                try:
+                    self._queue.put(self._STOP, timeout=min(1.0, max(0.0, deadline - time.monotonic())))
+                    break
+                except queue.Full:
+                    if time.monotonic() >= deadline:
+                        break
+        # 종료 대기 중 Ctrl-C로 끊겨도 다시 호출하면 기록이 끝날 때까지 기다림
+        self._thread.join(max(0.0, deadline - time.monotonic()))
+        if self._thread.is_alive():
+            print(f"⚠️ 경기 업데이트 기록이 {timeout:g}초 안에 끝나지 않았습니다 (대기 {self._queue.qsize()}개)")
+        else:
+            # 스레드가 비정상 종료했으면 큐에 남은 항목을 실패로 남김
+            leftover = {}
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not self._STOP:
+                    leftover.setdefault(item[0], {}).update(item[1])
+            if leftover:
+                self._record_failed(leftover, "기록 스레드가 종료됨")
+        self._failed_journal.close()
+
+    def _record_failed(self, pending, error):
+        """기록하지 못한 업데이트를 실패 파일에 남김"""
+        self.stats['failed'] += len(pending)
         try:
-            over_odds = float(odds_data['average']['over'])
-            under_odds = float(odds_data['average']['under'])
-            
-            difference = abs(over_odds - under_odds)
-            
-            if difference < min_difference:
-                min_difference = difference
-                max_over_odds = over_odds
-                best_odds = odds_data
-            elif difference == min_difference and over_odds > max_over_odds:
-                max_over_odds = over_odds
-                best_odds = odds_data
-                
-        except (ValueError, KeyError, TypeError):
-            continue
-    
-    return best_odds
+            for match_id, values in pending.items():
+                self._failed_journal.append({'match_id': match_id, **values, 'error': str(error)})
+            self._failed_journal.sync()
+        except Exception as e:
+            print(f"❌ 실패한 업데이트 저장 실패 ({len(pending)}개): {e}")
+            return
+        print(f"📝 기록하지 못한 업데이트 {len(pending)}개 저장: {self._failed_journal.path}")
+
+    def _run(self):
+        """큐를 비우며 크기/시간 기준에 따라 일괄 기록"""
+        pending = {}
+        deadline = None
+
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                # 시간 기준 도달
+                item = None
+
+            stop = item is self._STOP
+            if item is not None and not stop:
+                match_id, values = item
+                # 같은 경기의 status와 odds는 한 행으로 합침
+                pending.setdefault(match_id, {}).update(values)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(pending) < self.batch_size:
+                    continue
+
+            if pending:
+                try:
+                    self._flush(pending)
+                except Exception as e:
+                    # 예상하지 못한 오류로 스레드가 멈추지 않도록 이번 배치만 실패 처리
+                    print(f"❌ 경기 업데이트 일괄 기록 중 오류 ({len(pending)}개): {e}")
+                    self._record_failed(pending, e)
+                pending = {}
+            deadline = None
+
+            if stop:
+                return
+
+    def _flush(self, pending):
+        """모인 업데이트를 UPDATE ... FROM (VALUES ...) 한 번으로 기록"""
+        # over-under 라인은 배치 전체의 기준점을 한 번에 골라 best_* 값으로 바꿈
+        lined = [match_id for match_id, values in pending.items() if 'over_under' in values]
+        for match_id, best_odds in zip(lined, find_best_odds_batch([pending[match_id]['over_under'] for match_id in lined])):
+            values = pending[match_id]
+            del values['over_under']
+            if best_odds:
+                values.update(
+                    best_benchmark=best_odds['handicap'],
+                    best_over_odds=best_odds['average']['over'],
+                    best_under_odds=best_odds['average']['under']
+                )
+            else:
+                print(f"⚠️ 최적 odds 찾기 실패: {match_id}")
+                self.stats['no_best'] += 1
+                if not values:
+                    del pending[match_id]
+        if not pending:
+            return
+
+        rows = [
+            (match_id, values.get('status'), values.get('best_benchmark'),
+             values.get('best_over_odds'), values.get('best_under_odds'))
+            for match_id, values in pending.items()
+        ]
+
+        conn = connect_to_db()
+        if not conn:
+            self._record_failed(pending, "데이터베이스 연결 실패")
+            return
+
+        cursor = conn.cursor()
+        try:
+            # 값이 없는(NULL) 컬럼은 기존 값을 유지
+            execute_values(
+                cursor,
+                """
+                UPDATE matches AS m
+                SET status = COALESCE(v.status, m.status),
+                    best_benchmark = COALESCE(v.best_benchmark, m.best_benchmark),
+                    best_over_odds = COALESCE(v.best_over_odds, m.best_over_odds),
+                    best_under_odds = COALESCE(v.best_under_odds, m.best_under_odds)
+                FROM (VALUES %s) AS v(id, status, best_benchmark, best_over_odds, best_under_odds)
+                WHERE m.id = v.id
+                """,
+                rows,
+                template="(%s, %s::text, %s::numeric, %s::numeric, %s::numeric)",
+                page_size=len(rows)
+            )
+            conn.commit()
+            self.stats['written'] += len(rows)
+            self.stats['batches'] += 1
+            print(f"💾 경기 업데이트 일괄 기록: {len(rows)}개")
+        except Exception as e:
+            print(f"❌ 경기 업데이트 일괄 기록 실패 ({len(rows)}개): {e}")
+            conn.rollback()
+            self._record_failed(pending, e)
+        finally:
+            cursor.close()
+            release_connection(conn)
 
 def main():
     """메인 함수"""
     print("🚀 누락된 데이터 수집 시작")
     
-    # Selenium 드라이버 설정
-    driver = setup_selenium_driver()
-    if not driver:
-        print("❌ Selenium 드라이버 초기화 실패")
-        return
+    # FLASHSCORE_HTTP_FIRST=1이면 페이지를 HTTP로 먼저 받고, 결과가 없을 때만 Selenium 드라이버를 띄워서 렌더링
+    session = create_session(pool_size=1) if HTTP_FIRST else None
+    driver = None
+    # 이미 받은 페이지는 캐시에서 읽음 (종료된 경기는 만료되지 않음)
+    cache = open_page_cache()
+    
+    def get_driver():
+        nonlocal driver
+        if driver is None:
+            driver = setup_selenium_driver()
+            if not driver:
+                print("❌ Selenium 드라이버 초기화 실패")
+        return driver
+    
+    # 수집 결과는 백그라운드에서 일괄 기록
+    writer = MatchUpdateWriter()
+    throttle = RequestThrottle(REQUEST_INTERVAL)
     
     try:
         # 누락된 데이터가 있는 경기들 조회
@@ -319,18 +417,18 @@ def main():
             
             print(f"🔄 status 수집 중: {match_id}")
             
-            status = extract_status_from_page(driver, match_link)
+            # 요청 간격 조절 (직전 요청 이후 지난 시간은 빼고 대기, 캐시에 있으면 요청하지 않으므로 생략)
+            if cache is None or not cache.has(request_url(match_link)):
+                throttle.wait()
+            status = fetch_status_http(session, match_link, cache)
+            if not status and get_driver():
+                status = extract_status_from_page(driver, match_link, cache)
             if status:
-                if update_match_status(match_id, status):
-                    status_success += 1
-                else:
-                    status_failed += 1
+                writer.update_status(match_id, status)
+                status_success += 1
             else:
                 print(f"⚠️ status 추출 실패: {match_id}")
                 status_failed += 1
-            
-            # 요청 간격 조절
-            time.sleep(2)
         
         # Odds 수집
         odds_success = 0
@@ -342,38 +440,44 @@ def main():
             
             print(f"🔄 odds 수집 중: {match_id}")
             
-            odds_data = extract_odds_from_page(driver, match_link)
+            if cache is None or not cache.has(request_url(build_over_under_url(match_link))):
+                throttle.wait()
+            finished = is_finished_status(match['status'])
+            odds_data = fetch_over_under_http(session, match_link, match_id, cache=cache, finished=finished)
+            if not odds_data and get_driver():
+                odds_data = extract_odds_from_page(driver, match_link, cache, finished)
             if odds_data and odds_data["over-under"]:
-                best_odds = find_best_odds(odds_data["over-under"])
-                if best_odds:
-                    best_benchmark = best_odds['handicap']
-                    best_over_odds = best_odds['average']['over']
-                    best_under_odds = best_odds['average']['under']
-                    
-                    if update_match_odds(match_id, best_benchmark, best_over_odds, best_under_odds):
-                        odds_success += 1
-                    else:
-                        odds_failed += 1
-                else:
-                    print(f"⚠️ 최적 odds 찾기 실패: {match_id}")
-                    odds_failed += 1
+                # 기준점은 writer가 배치로 고름 (고르지 못한 경기는 writer.stats['no_best'])
+                writer.update_over_under(match_id, odds_data["over-under"])
+                odds_success += 1
             else:
                 print(f"⚠️ odds 추출 실패: {match_id}")
                 odds_failed += 1
-            
-            # 요청 간격 조절
-            time.sleep(3)
         
-        # 결과 출력
+        # 남은 업데이트 기록 후 결과 출력
+        writer.close()
         print(f"\n📊 수집 완료!")
         print(f"  Status - 성공: {status_success}개, 실패: {status_failed}개")
-        print(f"  Odds - 성공: {odds_success}개, 실패: {odds_failed}개")
+        # 기준점을 고르지 못한 경기는 실패로 셈
+        no_best = writer.stats['no_best']
+        print(f"  Odds - 성공: {odds_success - no_best}개, 실패: {odds_failed + no_best}개")
         
+    except KeyboardInterrupt:
+        print("\n⏹️ 수집 중단 - 지금까지 수집한 결과를 기록합니다")
     except Exception as e:
         print(f"❌ 수집 중 오류: {e}")
     finally:
-        driver.quit()
-        print("🔌 Selenium 드라이버 종료")
+        writer.close()
+        stats = writer.stats
+        print(f"💾 DB 기록 - 성공: {stats['written']}개, 실패: {stats['failed']}개 ({stats['batches']}번 일괄 기록)")
+        if session is not None:
+            session.close()
+        if cache is not None:
+            print(f"📦 페이지 캐시 - {cache.format_stats()}")
+            cache.close()
+        if driver:
+            driver.quit()
+            print("🔌 Selenium 드라이버 종료")
 
 if __name__ == "__main__":
     main()
@@ -4,25 +4,39 @@ Colab용 멀티스레드 odds 수집 스크립트
 기존 JSON 파일에서 odds가 null인 경기들만 선별하여 수집
 """
 
-import json
-import requests
-import time
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import queue
 import os
-from datetime import datetime
+import sys
+
+from best_odds import find_best_odds_batch
+from html_parsers import find_over_under_rows, is_finished_status, make_soup, parse_over_under_rows
+from http_fetcher import HTTP_FIRST, build_over_under_url, create_session, fetch_over_under_http, request_url
+from json_stream import KEEP_BACKUPS, iter_matches, write_season_file
+from page_cache import open_page_cache
+from result_journal import ResultJournal, journal_path_for
+from selenium_waits import wait_for_any
 
 # Colab용 설정
 COLAB_MODE = True  # Colab 환경에서는 True로 설정
 
+# 드라이버 풀 설정
+DRIVER_MAX_PAGES = 50        # 드라이버 하나로 처리할 최대 페이지 수 (넘으면 새 드라이버로 교체)
+DRIVER_MAX_RSS_MB = 1500     # chromedriver + Chrome 프로세스 메모리 합계 한도 (MB)
+DRIVER_CRASH_RETRIES = 2     # 드라이버가 죽었을 때 같은 경기를 새 드라이버로 다시 시도하는 횟수
+
+# odds 행 대기 선택자 (By, 선택자, 타임아웃 초) - 앞쪽이 우선, 대체 선택자는 짧게 확인
+ODDS_ROW_LOCATORS = [
+    (By.CSS_SELECTOR, '.ui-table__row', 15),
+    (By.CSS_SELECTOR, '.odds-table tbody tr', 5),
+    (By.CSS_SELECTOR, '.oddsTable tbody tr', 5),
+    (By.CSS_SELECTOR, 'table tbody tr', 5)
+]
+
 def setup_selenium_driver_colab():
     """Colab 환경에 최적화된 Selenium 드라이버 설정"""
     chrome_options = Options()
@@ -44,43 +58,180 @@ def setup_selenium_driver_colab():
     try:
         # 최신 Selenium은 자동으로 드라이버 관리
         driver = webdriver.Chrome(options=chrome_options)
-        driver.implicitly_wait(10)
+        # 대기는 selenium_waits로 명시적으로 처리 (implicit wait는 없는 요소를 찾을 때마다 지연됨)
+        driver.implicitly_wait(0)
         return driver
     except Exception as e:
         print(f"❌ Selenium 드라이버 설정 실패: {e}")
         return None
 
-def extract_odds_from_page(driver, match_link, match_id):
-    """경기 페이지에서 odds 정보 추출 (멀티스레드 안전)"""
+def _process_tree_rss(root_pid):
+    """root_pid와 모든 자손 프로세스의 RSS 합계 (바이트, /proc이 없으면 0)"""
+    try:
+        entries = os.listdir('/proc')
+    except OSError:
+        return 0
+
+    children = {}
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'rb') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # 프로세스 이름에 공백이나 괄호가 있을 수 있으므로 마지막 ')' 뒤에서 필드 분리
+        ppid = int(stat[stat.rindex(b')') + 2:].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    total = 0
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        try:
+            with open(f'/proc/{pid}/statm') as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, ValueError, IndexError):
+            pass
+        stack.extend(children.get(pid, ()))
+    return total
+
+def driver_memory_usage(driver):
+    """드라이버(chromedriver와 하위 Chrome 프로세스 전체)의 메모리 사용량 (바이트)"""
+    process = getattr(getattr(driver, 'service', None), 'process', None)
+    if process is None:
+        return 0
+    return _process_tree_rss(process.pid)
+
+def is_driver_alive(driver):
+    """드라이버 세션이 아직 응답하는지 확인"""
+    try:
+        driver.execute_script("return 1")
+        return True
+    except Exception:
+        return False
+
+class DriverPool:
+    """
+    스레드들이 공유하는 Selenium 드라이버 풀
+
+    드라이버는 처음 필요할 때 size개까지 만들고, 반환되면 다음 경기에 다시 쓴다.
+    max_pages번 사용했거나 메모리가 max_rss_mb를 넘은 드라이버, 죽은 드라이버는 닫고 버리며
+    빈자리는 다음 acquire()에서 새 드라이버로 채운다.
+    driver_factory는 새 드라이버를 만드는 함수 (실패 시 None 반환)
+    """
+
+    def __init__(self, size, max_pages=DRIVER_MAX_PAGES, max_rss_mb=DRIVER_MAX_RSS_MB,
+                 driver_factory=setup_selenium_driver_colab):
+        self.size = size
+        self.driver_factory = driver_factory
+        self.max_pages = max_pages
+        self.max_rss_bytes = max_rss_mb * 1024 * 1024
+        self.stats = {'created': 0, 'recycled': 0, 'crashed': 0}
+        self._idle = queue.LifoQueue()
+        self._pages = {}
+        self._open_count = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """드라이버 대여 (모두 사용 중이면 반환될 때까지 대기, 생성 실패 시 None)"""
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                can_create = self._open_count < self.size
+                if can_create:
+                    self._open_count += 1
+            if can_create:
+                break
+
+            # 다른 스레드가 반환하거나 폐기해서 자리가 날 때까지 대기
+            try:
+                return self._idle.get(timeout=1.0)
+            except queue.Empty:
+                continue
+
+        driver = self.driver_factory()
+        with self._lock:
+            if driver is None:
+                self._open_count -= 1
+                return None
+            self._pages[id(driver)] = 0
+            self.stats['created'] += 1
+        return driver
+
+    def release(self, driver, crashed=False):
+        """
+        드라이버 반환
+
+        Args:
+            crashed: 드라이버가 죽었으면 True (풀에 돌려놓지 않고 폐기)
+        """
+        with self._lock:
+            self._pages[id(driver)] = self._pages.get(id(driver), 0) + 1
+            pages = self._pages[id(driver)]
+
+        if crashed:
+            self.stats['crashed'] += 1
+            self._discard(driver)
+            return
+
+        memory_usage = driver_memory_usage(driver)
+        if pages >= self.max_pages or memory_usage > self.max_rss_bytes:
+            print(f"♻️ 드라이버 교체: {pages}페이지 처리, 메모리 {memory_usage / 1024 / 1024:.0f}MB")
+            self.stats['recycled'] += 1
+            self._discard(driver)
+            return
+
+        self._idle.put(driver)
+
+    def _discard(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        with self._lock:
+            self._pages.pop(id(driver), None)
+            self._open_count -= 1
+
+    def close(self):
+        """풀에 남은 드라이버 모두 종료"""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+def extract_odds_from_page(driver, match_link, match_id, cache=None, finished=False):
+    """경기 페이지에서 odds 정보 추출 (멀티스레드 안전, cache가 있으면 odds가 있는 페이지를 저장)"""
     try:
-        # odds 페이지로 이동 (URL 구조 수정)
-        # 기존: .../?mid=ID#/match-summary/match-summary
-        # 변경: .../odds/over-under/full-time/?mid=ID
-        if '?mid=' in match_link and '#/match-summary/match-summary' in match_link:
-            # mid 파라미터 추출
-            mid_part = match_link.split('?mid=')[1].split('#')[0]
-            # 기본 경로에서 mid 제거 (끝의 / 제거하여 중복 방지)
-            base_path = match_link.split('?mid=')[0].rstrip('/')
-            # 올바른 odds URL 구성
-            odds_link = f"{base_path}/odds/over-under/full-time/?mid={mid_part}"
-        else:
-            # fallback: 기존 방식
-            odds_link = match_link.replace('#/match-summary/match-summary', '/odds/over-under/full-time/')
+        # odds 페이지로 이동
+        odds_link = build_over_under_url(match_link)
         
         print(f"[{match_id}] 접속 URL: {odds_link}")
         
         driver.get(odds_link)
         
-        # 동적 로딩 대기
-        time.sleep(5)
+        # 동적 로딩 대기 (odds 행이 나타나면 바로 진행)
+        matched, _ = wait_for_any(driver, ODDS_ROW_LOCATORS)
+        if matched is None:
+            print(f"[{match_id}] ⏱️ odds 행 대기 시간 초과")
         
         # 페이지 상태 확인
         page_title = driver.title
         print(f"[{match_id}] 페이지 제목: {page_title}")
         
+        # 페이지 HTML은 한 번만 받아서 파싱 (요소별 WebDriver 호출 없음)
+        page_source = driver.page_source
+        
         # 페이지 내용 일부 확인
-        page_content = driver.page_source[:500]
-        print(f"[{match_id}] 페이지 내용 (처음 500자): {page_content}")
+        print(f"[{match_id}] 페이지 내용 (처음 500자): {page_source[:500]}")
         
         # 에러 페이지 확인
         if "error" in page_title.lower() or "404" in page_title or "not found" in page_title.lower():
@@ -94,106 +245,21 @@ def extract_odds_from_page(driver, match_link, match_id):
         
         # Over/Under odds 테이블 찾기
         try:
-            # 다양한 선택자로 odds 테이블 찾기
-            table_selectors = [
-                '.ui-table__row',
-                '.odds-table tbody tr',
-                '.oddsTable tbody tr',
-                'table tbody tr'
-            ]
+            soup = make_soup(page_source)
+            selector, rows = find_over_under_rows(soup)
             
-            print(f"[{match_id}] odds 테이블 선택자 시도 중...")
-            found_rows = False
-            
-            for selector in table_selectors:
-                try:
-                    rows = driver.find_elements(By.CSS_SELECTOR, selector)
-                    print(f"[{match_id}] {selector}: {len(rows)}개 행 발견")
-                    if rows:
-                        found_rows = True
-                        print(f"[{match_id}] ✅ {len(rows)}개 odds 행 발견 - {selector} 사용")
-                        
-                        # 기준점별로 배당률을 그룹화
-                        odds_by_handicap = {}
-                        
-                        for row in rows:
-                            try:
-                                # 북메이커명 추출
-                                bookmaker_elements = row.find_elements(By.CSS_SELECTOR, 'img[title], img[alt], .bookmaker')
-                                bookmaker_name = "Unknown"
-                                if bookmaker_elements:
-                                    bookmaker_name = bookmaker_elements[0].get_attribute('title') or bookmaker_elements[0].get_attribute('alt') or "Unknown"
-                                
-                                # 기준점 추출
-                                handicap_elements = row.find_elements(By.CSS_SELECTOR, 'span[data-testid="wcl-oddsValue"], .handicap, .line')
-                                if not handicap_elements:
-                                    continue
-                                
-                                handicap_text = handicap_elements[0].text.strip()
-                                if not handicap_text.replace('.', '').replace(',', '').isdigit():
-                                    continue
-                                
-                                handicap = float(handicap_text)
-                                
-                                # Over/Under 배당률 추출
-                                odds_cells = row.find_elements(By.CSS_SELECTOR, 'a.oddsCell__odd, .odds-cell, .odd')
-                                
-                                if len(odds_cells) >= 2:
-                                    over_text = odds_cells[0].text.strip().split('\n')[0]
-                                    under_text = odds_cells[1].text.strip().split('\n')[0]
-                                    
-                                    # 숫자 확인
-                                    try:
-                                        over_odds = float(over_text)
-                                        under_odds = float(under_text)
-                                        
-                                        if handicap not in odds_by_handicap:
-                                            odds_by_handicap[handicap] = []
-                                        
-                                        odds_by_handicap[handicap].append({
-                                            "bookmaker": bookmaker_name,
-                                            "over": str(over_odds),
-                                            "under": str(under_odds)
-                                        })
-                                    except ValueError:
-                                        continue
-                            
-                            except Exception as row_error:
-                                continue
-                        
-                        # 각 기준점별로 평균 계산
-                        for handicap, bookmaker_odds in odds_by_handicap.items():
-                            if len(bookmaker_odds) > 0:
-                                # 평균 계산
-                                over_values = [float(b['over']) for b in bookmaker_odds]
-                                under_values = [float(b['under']) for b in bookmaker_odds]
-                                
-                                avg_over = sum(over_values) / len(over_values)
-                                avg_under = sum(under_values) / len(under_values)
-                                
-                                odds_entry = {
-                                    "handicap": str(handicap),
-                                    "average": {
-                                        "over": f"{avg_over:.2f}",
-                                        "under": f"{avg_under:.2f}"
-                                    },
-                                    "bookmakers": bookmaker_odds
-                                }
-                                odds_data["over-under"].append(odds_entry)
-                        
-                        break  # 첫 번째로 찾은 테이블 사용
-                
-                except Exception as e:
-                    print(f"[{match_id}] {selector} 실패: {e}")
-                    continue
-            
-            if not found_rows:
+            if not rows:
                 print(f"[{match_id}] ❌ 모든 선택자에서 odds 테이블을 찾을 수 없음")
                 # 페이지의 모든 테이블 요소 확인
-                all_tables = driver.find_elements(By.TAG_NAME, 'table')
-                all_divs_with_odds = driver.find_elements(By.XPATH, "//div[contains(@class, 'odds') or contains(@class, 'table')]")
+                all_tables = soup.find_all('table')
+                all_divs_with_odds = soup.select('div[class*="odds"], div[class*="table"]')
                 print(f"[{match_id}] 전체 테이블: {len(all_tables)}개, odds 관련 div: {len(all_divs_with_odds)}개")
                 return None
+            
+            print(f"[{match_id}] ✅ {len(rows)}개 odds 행 발견 - {selector} 사용")
+            odds_data["over-under"] = parse_over_under_rows(rows)
+            if cache is not None and odds_data["over-under"]:
+                cache.put(request_url(odds_link), page_source, finished)
                     
         except Exception as e:
             print(f"[{match_id}] odds 테이블 파싱 실패: {e}")
@@ -204,162 +270,222 @@ def extract_odds_from_page(driver, match_link, match_id):
         print(f"[{match_id}] odds 추출 실패: {e}")
         return None
 
-def find_best_odds(over_under_odds_list):
-    """최적의 배당률을 찾는 함수"""
-    if not over_under_odds_list or len(over_under_odds_list) == 0:
-        return None
+def build_odds_result(match_id, odds_data, thread_id):
+    """수집한 odds에서 기준점을 골라 워커 결과 생성"""
+    if odds_data and odds_data["over-under"]:
+        # 워커는 경기 하나씩 결과를 내고 성공 여부로 브라우저 재시도를 정하므로 한 경기짜리 배치로 고름
+        best_odds = find_best_odds_batch([odds_data["over-under"]])[0]
+        if best_odds:
+            result = {
+                'match_id': match_id,
+                'odds': odds_data,
+                'best_benchmark': best_odds['handicap'],
+                'best_over_odds': best_odds['average']['over'],
+                'best_under_odds': best_odds['average']['under'],
+                'success': True
+            }
+            print(f"[Thread-{thread_id}] ✅ {match_id}: {len(odds_data['over-under'])}개 odds 수집")
+            return result
     
-    best_odds = None
-    min_difference = float('inf')
-    max_over_odds = -1
-    
-    for odds_data in over_under_odds_list:
-        try:
-            over_odds = float(odds_data['average']['over'])
-            under_odds = float(odds_data['average']['under'])
-            
-            difference = abs(over_odds - under_odds)
-            
-            if difference < min_difference:
-                min_difference = difference
-                max_over_odds = over_odds
-                best_odds = odds_data
-            elif difference == min_difference and over_odds > max_over_odds:
-                max_over_odds = over_odds
-                best_odds = odds_data
-                
-        except (ValueError, KeyError, TypeError):
-            continue
-    
-    return best_odds
+    print(f"[Thread-{thread_id}] ❌ {match_id}: odds 수집 실패")
+    return {'match_id': match_id, 'success': False}
 
-def process_match_worker(match_data, thread_id):
+def process_match_worker(match_data, thread_id, driver_pool, session=None, cache=None):
     """개별 경기 처리 워커 함수 (멀티스레드용)"""
     match_id, match_info = match_data
     
-    # 각 스레드마다 독립적인 드라이버 생성
-    driver = setup_selenium_driver_colab()
-    if not driver:
+    match_link = match_info.get('match_link')
+    if not match_link:
         return None
     
-    try:
-        match_link = match_info.get('match_link')
-        if not match_link:
+    # 종료된 경기의 페이지는 캐시에서 만료되지 않음
+    finished = is_finished_status(match_info.get('status'))
+    
+    # 캐시(FLASHSCORE_HTTP_FIRST=1이면 HTTP도)로 먼저 시도하고 odds를 얻지 못했을 때만 브라우저로 렌더링
+    if session is not None or cache is not None:
+        odds_data = fetch_over_under_http(session, match_link, match_id, cache=cache, finished=finished)
+        if odds_data:
+            result = build_odds_result(match_id, odds_data, thread_id)
+            if result['success']:
+                return result
+        if session is not None:
+            print(f"[Thread-{thread_id}] 🌐 {match_id}: HTTP 응답에 odds 없음 - 브라우저로 수집")
+    
+    # 풀에서 드라이버를 빌려 쓰고, 도중에 드라이버가 죽으면 새 드라이버로 같은 경기를 다시 시도
+    for attempt in range(DRIVER_CRASH_RETRIES + 1):
+        driver = driver_pool.acquire()
+        if not driver:
             return None
         
-        print(f"[Thread-{thread_id}] Processing {match_id}...")
-        
-        # odds 수집
-        odds_data = extract_odds_from_page(driver, match_link, match_id)
-        
-        if odds_data and odds_data["over-under"]:
-            best_odds = find_best_odds(odds_data["over-under"])
-            if best_odds:
-                result = {
-                    'match_id': match_id,
-                    'odds': odds_data,
-                    'best_benchmark': best_odds['handicap'],
-                    'best_over_odds': best_odds['average']['over'],
-                    'best_under_odds': best_odds['average']['under'],
-                    'success': True
-                }
-                print(f"[Thread-{thread_id}] ✅ {match_id}: {len(odds_data['over-under'])}개 odds 수집")
+        crashed = False
+        try:
+            print(f"[Thread-{thread_id}] Processing {match_id}...")
+            odds_data = extract_odds_from_page(driver, match_link, match_id, cache, finished)
+            result = build_odds_result(match_id, odds_data, thread_id)
+            # extract_odds_from_page는 예외를 삼키므로 실패하면 드라이버 상태를 직접 확인
+            crashed = not result['success'] and not is_driver_alive(driver)
+            if not crashed:
                 return result
         
-        print(f"[Thread-{thread_id}] ❌ {match_id}: odds 수집 실패")
-        return {'match_id': match_id, 'success': False}
+        except Exception as e:
+            crashed = not is_driver_alive(driver)
+            if not crashed:
+                print(f"[Thread-{thread_id}] ❌ {match_id}: {e}")
+                return {'match_id': match_id, 'success': False, 'error': str(e)}
         
-    except Exception as e:
-        print(f"[Thread-{thread_id}] ❌ {match_id}: {e}")
-        return {'match_id': match_id, 'success': False, 'error': str(e)}
+        finally:
+            driver_pool.release(driver, crashed=crashed)
+        
+        print(f"[Thread-{thread_id}] ⚠️ {match_id}: 드라이버 비정상 종료 - 새 드라이버로 재시도 ({attempt + 1}/{DRIVER_CRASH_RETRIES})")
     
-    finally:
-        try:
-            driver.quit()
-        except:
-            pass
+    return {'match_id': match_id, 'success': False, 'error': '드라이버 비정상 종료 반복'}
 
-def load_existing_json(file_path):
-    """기존 JSON 파일 로드"""
+def load_matches_without_odds(file_path):
+    """
+    기존 JSON 파일을 스트리밍으로 읽어 odds가 null인 경기만 선별
+    
+    Returns:
+        tuple: (처리 대상 경기 리스트, 전체 경기 수) - 실패 시 (None, 0)
+    """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        matches_to_process = []
+        total_count = 0
+        for match_id, match_data in iter_matches(file_path):
+            total_count += 1
+            if 'odds' not in match_data or match_data['odds'] is None:
+                matches_to_process.append((match_id, match_data))
+        return matches_to_process, total_count
     except Exception as e:
         print(f"❌ JSON 파일 로드 실패: {e}")
-        return None
+        return None, 0
 
-def save_updated_json(data, file_path, backup=True):
-    """업데이트된 JSON 파일 저장"""
+def save_updated_json(file_path, odds_updates, backup=True, compress=None):
+    """
+    수집한 odds를 기존 JSON 파일에 병합하여 저장
+    
+    원본 파일을 스트리밍으로 읽으면서 write_season_file로 임시 파일에 기록한 뒤 교체하므로
+    전체 데이터를 메모리에 올리지 않고, 저장 도중 중단되어도 원본이 남는다.
+    
+    Args:
+        odds_updates: {match_id: odds} 딕셔너리
+        backup: 교체 전 파일을 백업할지 여부 (최근 KEEP_BACKUPS개만 유지)
+        compress: gzip 압축 여부 (None이면 기존 파일 형식 유지)
+    
+    Returns:
+        int: 업데이트된 경기 수 (실패 시 None)
+    """
     try:
-        if backup:
-            backup_path = f"{file_path}.backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            import shutil
-            shutil.copy2(file_path, backup_path)
-            print(f"📁 백업 파일 생성: {backup_path}")
+        updated_count = 0
+        
+        def merged_matches():
+            nonlocal updated_count
+            for match_id, match_data in iter_matches(file_path):
+                if match_id in odds_updates:
+                    match_data['odds'] = odds_updates[match_id]
+                    updated_count += 1
+                yield match_id, match_data
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        write_season_file(
+            file_path, merged_matches(),
+            compress=compress,
+            keep_backups=KEEP_BACKUPS if backup else 0
+        )
         
         print(f"💾 업데이트된 JSON 파일 저장: {file_path}")
-        return True
+        return updated_count
     except Exception as e:
         print(f"❌ JSON 파일 저장 실패: {e}")
-        return False
+        return None
 
 def main():
     """메인 함수 - 멀티스레드 odds 수집"""
     
+    if len(sys.argv) > 1 and sys.argv[1] in ('-h', '--help'):
+        print("사용법: python collect_odds_colab.py [JSON 파일 경로] [--retry-failed] [--gzip]")
+        print("")
+        print("이전 실행이 중간에 끊겼으면 <JSON 파일>.journal.jsonl에 기록된 경기는 건너뜁니다")
+        print("--retry-failed: 저널에 실패로 기록된 경기도 다시 수집")
+        print("--gzip: 결과 파일을 gzip으로 압축해서 저장 (파일 이름은 그대로, 읽을 때 자동 판별)")
+        return
+    
+    # 옵션 분리
+    retry_failed = '--retry-failed' in sys.argv[1:]
+    compress = True if '--gzip' in sys.argv[1:] else None
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    
     # 파일 경로 설정
-    json_file_path = "src/data/soccer_england_championship-2025-2026.json"
+    json_file_path = args[0] if args else "src/data/soccer_england_championship-2025-2026.json"
     
     print("🚀 멀티스레드 odds 수집 시작")
     print(f"📁 대상 파일: {json_file_path}")
     
-    # 기존 JSON 로드
-    existing_data = load_existing_json(json_file_path)
-    if not existing_data:
+    # 기존 JSON에서 odds가 null인 경기들만 스트리밍으로 선별
+    matches_to_process, total_count = load_matches_without_odds(json_file_path)
+    if matches_to_process is None:
         return
     
-    # odds가 null인 경기들만 필터링
-    matches_to_process = []
-    for match_id, match_data in existing_data.items():
-        if 'odds' not in match_data or match_data['odds'] is None:
-            matches_to_process.append((match_id, match_data))
+    # 이전 실행의 저널에 결과가 있는 경기는 건너뜀
+    journal = ResultJournal(journal_path_for(json_file_path))
+    journaled = journal.load()
+    if journaled:
+        skipped = {
+            match_id for match_id, record in journaled.items()
+            if record.get('success') or not retry_failed
+        }
+        matches_to_process = [match for match in matches_to_process if match[0] not in skipped]
+        print(f"📒 저널에서 이전 결과 {len(journaled)}개 발견 - {len(skipped)}개 경기 건너뜀")
     
     print(f"📊 처리 대상: {len(matches_to_process)}개 경기")
-    print(f"📊 총 경기 수: {len(existing_data)}개")
+    print(f"📊 총 경기 수: {total_count}개")
     
-    if not matches_to_process:
+    if not matches_to_process and not journaled:
         print("✅ 모든 경기의 odds가 이미 수집되었습니다!")
         return
     
     # 멀티스레드 설정 (디버깅을 위해 1개 스레드로 시작)
     MAX_WORKERS = 1  # 디버깅용: 1개 스레드로 시작
-    results = []
     
     print(f"🔄 {MAX_WORKERS}개 스레드로 처리 시작...")
     print(f"📝 디버깅 모드: 상세한 로그 출력")
     
+    # HTTP 세션(FLASHSCORE_HTTP_FIRST=1일 때)은 모든 스레드가 공유하고, 드라이버는 HTTP로 얻지 못한 경기에만 스레드 수만큼 만들어 재사용
+    session = create_session(pool_size=MAX_WORKERS) if HTTP_FIRST else None
+    driver_pool = DriverPool(MAX_WORKERS)
+    cache = open_page_cache()
+    
     # ThreadPoolExecutor로 멀티스레드 처리
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        # 작업 제출
-        future_to_match = {
-            executor.submit(process_match_worker, match_data, i % MAX_WORKERS): match_data 
-            for i, match_data in enumerate(matches_to_process)
-        }
-        
-        # 결과 수집
-        completed = 0
-        for future in as_completed(future_to_match):
-            result = future.result()
-            if result:
-                results.append(result)
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            # 작업 제출
+            future_to_match = {
+                executor.submit(process_match_worker, match_data, i % MAX_WORKERS, driver_pool, session, cache): match_data 
+                for i, match_data in enumerate(matches_to_process)
+            }
             
-            completed += 1
-            progress = (completed / len(matches_to_process)) * 100
-            print(f"📈 진행률: {completed}/{len(matches_to_process)} ({progress:.1f}%)")
+            # 결과 수집 (끝나는 대로 저널에 기록)
+            completed = 0
+            for future in as_completed(future_to_match):
+                result = future.result()
+                if result:
+                    journal.append(result)
+                
+                completed += 1
+                progress = (completed / len(matches_to_process)) * 100
+                print(f"📈 진행률: {completed}/{len(matches_to_process)} ({progress:.1f}%)")
+    finally:
+        journal.close()
+        driver_pool.close()
+        if session is not None:
+            session.close()
+        if cache is not None:
+            print(f"📦 페이지 캐시 - {cache.format_stats()}")
+            cache.close()
     
-    # 결과 분석
+    pool_stats = driver_pool.stats
+    print(f"🚗 드라이버 생성 {pool_stats['created']}개, 교체 {pool_stats['recycled']}개, 비정상 종료 {pool_stats['crashed']}개")
+    
+    # 결과 분석 (이전 실행에서 기록된 결과 포함)
+    results = list(journal.load().values())
     successful_results = [r for r in results if r.get('success', False)]
     failed_results = [r for r in results if not r.get('success', False)]
     
@@ -367,16 +493,11 @@ def main():
     print(f"  ✅ 성공: {len(successful_results)}개")
     print(f"  ❌ 실패: {len(failed_results)}개")
     
-    # 기존 데이터 업데이트
-    updated_count = 0
-    for result in successful_results:
-        match_id = result['match_id']
-        if match_id in existing_data:
-            existing_data[match_id]['odds'] = result['odds']
-            updated_count += 1
-    
-    # 업데이트된 JSON 저장
-    if save_updated_json(existing_data, json_file_path):
+    # 기존 데이터 업데이트 후 JSON 저장 (병합에 성공하면 저널 삭제)
+    odds_updates = {result['match_id']: result['odds'] for result in successful_results}
+    updated_count = save_updated_json(json_file_path, odds_updates, compress=compress)
+    if updated_count is not None:
+        journal.remove()
         print(f"🎉 {updated_count}개 경기의 odds 데이터 업데이트 완료!")
     
     # 실패한 경기들 출력
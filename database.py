@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+공용 데이터베이스 접근 모듈
+
+접속 정보는 환경 변수(FLASHSCORE_DB_HOST, FLASHSCORE_DB_PORT, FLASHSCORE_DB_NAME,
+FLASHSCORE_DB_USER, FLASHSCORE_DB_PASSWORD)에서 읽는다. 환경 변수가 없는 항목은 로컬 설정 파일
+(.flashscore_db.json, 저장소에 올리지 않음. FLASHSCORE_DB_CONFIG로 경로 변경 가능)에서 읽고,
+호스트/사용자/비밀번호가 끝내 없으면 연결하지 않고 어떤 값이 빠졌는지 알려준다.
+
+프로세스마다 하나의 연결 풀을 두고 connect_to_db()로 연결을 빌려 release_connection()으로 돌려준다.
+Supabase 트랜잭션 모드 풀러(6543 포트)는 트랜잭션이 끝날 때마다 서버 쪽 연결이 바뀔 수 있으므로
+세션 상태(SET, 서버 측 prepared statement, 트랜잭션 밖의 임시 테이블)에 기대지 말고
+한 작업은 BEGIN ~ COMMIT 한 트랜잭션 안에서 끝내야 한다.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+
+import psycopg2
+from psycopg2 import extensions
+from psycopg2 import pool as pg_pool
+
+# 로컬 설정 파일 (예: {"host": "...", "user": "...", "password": "..."})
+DB_CONFIG_PATH = os.environ.get("FLASHSCORE_DB_CONFIG", ".flashscore_db.json")
+# 설정 키 → 환경 변수
+DB_CONFIG_ENV = {
+    "host": "FLASHSCORE_DB_HOST",
+    "database": "FLASHSCORE_DB_NAME",
+    "user": "FLASHSCORE_DB_USER",
+    "password": "FLASHSCORE_DB_PASSWORD",
+    "port": "FLASHSCORE_DB_PORT"
+}
+# 기본값이 없어 반드시 지정해야 하는 항목
+REQUIRED_DB_CONFIG = ("host", "user", "password")
+
+
+def _load_db_config():
+    """환경 변수 → 로컬 설정 파일 → 기본값 순서로 접속 정보 구성 (없는 항목은 None)"""
+    file_config = {}
+    if os.path.exists(DB_CONFIG_PATH):
+        try:
+            with open(DB_CONFIG_PATH, 'r', encoding='utf-8') as f:
+                file_config = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ DB 설정 파일을 읽지 못했습니다 ({DB_CONFIG_PATH}): {e}")
+
+    config = {"database": "postgres", "port": "6543"}
+    for key, env_name in DB_CONFIG_ENV.items():
+        value = os.environ.get(env_name)
+        if value is None:
+            value = file_config.get(key, config.get(key))
+        config[key] = None if value is None else str(value)
+    return config
+
+
+# 데이터베이스 설정
+DB_CONFIG = _load_db_config()
+
+
+def _check_db_config():
+    """필수 접속 정보가 빠졌으면 설정 방법을 담은 예외 발생"""
+    missing = [key for key in REQUIRED_DB_CONFIG if DB_CONFIG.get(key) is None]
+    if missing:
+        names = ", ".join(DB_CONFIG_ENV[key] for key in missing)
+        raise RuntimeError(
+            f"접속 정보가 없습니다 - 환경 변수 {names}를 설정하거나 {DB_CONFIG_PATH}에 "
+            f"{', '.join(missing)} 값을 넣으세요"
+        )
+
+# 연결 풀 설정
+POOL_MIN_CONNECTIONS = int(os.environ.get("FLASHSCORE_DB_POOL_MIN", "1"))
+POOL_MAX_CONNECTIONS = int(os.environ.get("FLASHSCORE_DB_POOL_MAX", "8"))
+# 풀이 모두 사용 중일 때 빈 연결을 기다리는 최대 시간(초)
+POOL_ACQUIRE_TIMEOUT = float(os.environ.get("FLASHSCORE_DB_POOL_TIMEOUT", "30"))
+# 이 시간(초) 이상 쉬던 연결은 빌려주기 전에 SELECT 1로 살아 있는지 확인
+HEALTH_CHECK_IDLE_SECONDS = float(os.environ.get("FLASHSCORE_DB_HEALTH_CHECK_IDLE", "30"))
+
+# 풀러가 유휴 연결을 끊었을 때 빨리 알아채도록 TCP keepalive 사용
+CONNECT_OPTIONS = {
+    "connect_timeout": int(os.environ.get("FLASHSCORE_DB_CONNECT_TIMEOUT", "10")),
+    "keepalives": 1,
+    "keepalives_idle": 30,
+    "keepalives_interval": 10,
+    "keepalives_count": 3
+}
+
+_pool = None
+_pool_pid = None
+_pool_slots = None
+_pool_lock = threading.Lock()
+# 연결별 마지막 반환 시각 (id(conn) → time.monotonic())
+_last_released = {}
+# fork 이전 부모 프로세스의 풀 (자식에서 닫으면 부모의 소켓이 끊기므로 참조만 유지)
+_inherited_pools = []
+
+
+def db_identity():
+    """접속 대상 DB 식별자 (호스트:포트/DB 이름) - 로컬 캐시를 DB별로 나눌 때 사용"""
+    return f"{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}"
+
+
+def _get_pool():
+    """현재 프로세스의 연결 풀 (처음 호출할 때 생성, fork된 자식에서는 새로 생성)"""
+    global _pool, _pool_pid, _pool_slots
+
+    pid = os.getpid()
+    with _pool_lock:
+        if _pool is not None and _pool_pid == pid:
+            return _pool
+
+        if _pool is not None:
+            _inherited_pools.append(_pool)
+        _last_released.clear()
+
+        _check_db_config()
+        _pool = pg_pool.ThreadedConnectionPool(
+            POOL_MIN_CONNECTIONS, POOL_MAX_CONNECTIONS, **DB_CONFIG, **CONNECT_OPTIONS
+        )
+        _pool_pid = pid
+        _pool_slots = threading.BoundedSemaphore(POOL_MAX_CONNECTIONS)
+        print(f"✅ 데이터베이스 연결 풀 생성 (최대 {POOL_MAX_CONNECTIONS}개)")
+        return _pool
+
+
+def _is_healthy(conn):
+    """연결 상태 확인 (최근에 쓴 연결은 확인 쿼리 생략)"""
+    if conn.closed:
+        return False
+
+    last_released = _last_released.get(id(conn))
+    if last_released is None or time.monotonic() - last_released < HEALTH_CHECK_IDLE_SECONDS:
+        return True
+
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1")
+        cursor.close()
+        conn.rollback()
+        return True
+    except psycopg2.Error:
+        return False
+
+
+def connect_to_db():
+    """
+    데이터베이스 연결 (공용 풀에서 빌림)
+
+    사용이 끝나면 반드시 release_connection(conn)으로 돌려줘야 한다.
+
+    Returns:
+        connection: 정상 상태의 psycopg2 연결 (실패 시 None)
+    """
+    try:
+        db_pool = _get_pool()
+        slots = _pool_slots
+    except Exception as e:
+        print(f"❌ 데이터베이스 연결 실패: {e}")
+        return None
+
+    if not slots.acquire(timeout=POOL_ACQUIRE_TIMEOUT):
+        print(f"❌ 데이터베이스 연결 실패: {POOL_ACQUIRE_TIMEOUT:g}초 동안 풀에 빈 연결이 없음")
+        return None
+
+    try:
+        # 끊어진 연결은 버리고 다시 받음 (풀 크기만큼 시도하면 결국 새 연결이 만들어짐)
+        for _ in range(POOL_MAX_CONNECTIONS + 1):
+            conn = db_pool.getconn()
+            if _is_healthy(conn):
+                return conn
+            _last_released.pop(id(conn), None)
+            db_pool.putconn(conn, close=True)
+        raise psycopg2.OperationalError("정상 상태의 연결을 얻지 못함")
+    except Exception as e:
+        slots.release()
+        print(f"❌ 데이터베이스 연결 실패: {e}")
+        return None
+
+
+def release_connection(conn):
+    """
+    빌린 연결을 풀에 반환
+
+    끝나지 않은 트랜잭션은 롤백해서 다음 사용자에게 넘어가지 않게 하고,
+    끊어진 연결은 풀에 남기지 않고 닫는다.
+    """
+    if conn is None:
+        return
+
+    if _pool is None or _pool_pid != os.getpid():
+        # 풀이 없거나 fork 이전에 부모가 빌린 연결 (닫으면 부모의 소켓이 끊김)
+        return
+
+    broken = bool(conn.closed)
+    if not broken:
+        try:
+            if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+        except psycopg2.Error:
+            broken = True
+
+    try:
+        _pool.putconn(conn, close=broken)
+    except pg_pool.PoolError:
+        # 이 풀에서 빌린 연결이 아님
+        return
+
+    if broken:
+        _last_released.pop(id(conn), None)
+    else:
+        _last_released[id(conn)] = time.monotonic()
+    _pool_slots.release()
+
+
+def close_pool():
+    """현재 프로세스의 연결 풀 닫기 (프로세스 종료 시 자동 호출)"""
+    global _pool, _pool_pid, _pool_slots
+
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.closeall()
+        _pool = None
+        _pool_pid = None
+        _pool_slots = None
+        _last_released.clear()
+
+
+atexit.register(close_pool)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+저장된 응답을 돌려주는 로컬 fixture 서버
+
+fixture 디렉터리 구조는 요청 URL 경로와 같다 (쿼리 문자열은 무시, 디렉터리 경로는 index.html).
+예: fixtures/match/soccer/a-AbCd1234/b-EfGh5678/odds/over-under/full-time/index.html
+
+FLASHSCORE_BASE_URL=http://127.0.0.1:<포트> 로 실행하면 http_fetcher가 이 서버에 요청한다.
+응답 지연(latency + 0~jitter 초)을 지정하면 요청마다 그만큼 기다린 뒤 응답해서 실제 사이트의 왕복 시간을 흉내 낸다.
+"""
+
+import functools
+import os
+import random
+import sys
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+DEFAULT_FIXTURE_DIR = "fixtures"
+DEFAULT_PORT = 8765
+
+
+def fixture_path(fixture_dir, url):
+    """URL에 해당하는 fixture 파일 경로"""
+    path = urlsplit(url).path
+    file_path = os.path.join(fixture_dir, *[part for part in path.split('/') if part])
+    if path.endswith('/') or not os.path.splitext(path)[1]:
+        file_path = os.path.join(file_path, "index.html")
+    return file_path
+
+
+def save_fixture(fixture_dir, url, html):
+    """받아 온 페이지 HTML을 fixture로 저장"""
+    file_path = fixture_path(fixture_dir, url)
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(html)
+    return file_path
+
+
+class FixtureRequestHandler(SimpleHTTPRequestHandler):
+    """fixture 디렉터리의 파일을 keep-alive로 제공 (요청 로그 생략, 요청마다 응답 지연)"""
+
+    protocol_version = "HTTP/1.1"
+    # 헤더와 본문을 따로 보낼 때 Nagle + delayed ACK로 요청마다 40ms씩 지연되는 것 방지
+    disable_nagle_algorithm = True
+
+    def __init__(self, *args, latency=0.0, jitter=0.0, **kwargs):
+        # 부모 __init__이 요청을 바로 처리하므로 먼저 설정
+        self.latency = latency
+        self.jitter = jitter
+        super().__init__(*args, **kwargs)
+
+    def send_head(self):
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+        return super().send_head()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fixture_server(fixture_dir, host="127.0.0.1", port=0, latency=0.0, jitter=0.0):
+    """
+    백그라운드 스레드에서 fixture 서버 시작
+
+    Args:
+        port: 0이면 빈 포트 자동 선택
+        latency: 요청마다 응답 전에 기다리는 시간 (초)
+        jitter: latency에 더하는 무작위 지연의 최댓값 (초)
+
+    Returns:
+        tuple: (서버 객체, 기본 URL) - 종료는 server.shutdown()
+    """
+    handler = functools.partial(
+        FixtureRequestHandler, directory=os.path.abspath(fixture_dir), latency=latency, jitter=jitter
+    )
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+
+    thread = threading.Thread(target=server.serve_forever, name="fixture-server", daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    """메인 함수"""
+
+    if len(sys.argv) > 1 and sys.argv[1] in ('-h', '--help'):
+        print("사용법: python fixture_server.py [fixture 디렉터리] [포트] [응답 지연 ms] [지연 편차 ms]")
+        print("예시: python fixture_server.py fixtures 8765 150 50")
+        return
+
+    fixture_dir = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_FIXTURE_DIR
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_PORT
+    latency = float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 0.0
+    jitter = float(sys.argv[4]) / 1000 if len(sys.argv) > 4 else 0.0
+
+    if not os.path.isdir(fixture_dir):
+        print(f"❌ fixture 디렉터리를 찾을 수 없습니다: {fixture_dir}")
+        return
+
+    server, base_url = start_fixture_server(fixture_dir, port=port, latency=latency, jitter=jitter)
+    print(f"🚀 fixture 서버 시작: {base_url} ({fixture_dir})")
+    if latency or jitter:
+        print(f"   응답 지연: {latency * 1000:.0f}ms + 0~{jitter * 1000:.0f}ms")
+    print(f"   FLASHSCORE_BASE_URL={base_url} 로 수집기를 실행하세요")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        print("\n⏹️ fixture 서버 종료")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
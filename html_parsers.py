@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Flashscore 페이지 HTML 파서
+
+드라이버에서 page_source를 한 번만 받아 와서 BeautifulSoup(lxml)으로 파싱한다.
+행·셀마다 find_elements/.text/get_attribute를 호출하면 호출마다 WebDriver 왕복이 생기므로
+수집기(collect_*.py)는 이 모듈의 함수로 같은 구조의 결과를 만든다.
+"""
+
+import re
+
+from bs4 import BeautifulSoup
+
+# BeautifulSoup 파서 (html.parser보다 빠름)
+HTML_PARSER = "lxml"
+
+# over-under 페이지의 odds 행 선택자 (앞쪽부터 시도, 처음으로 행이 있는 선택자 사용)
+OVER_UNDER_ROW_SELECTORS = [
+    '.ui-table__row',
+    '.odds-table tbody tr',
+    '.oddsTable tbody tr',
+    'table tbody tr'
+]
+
+# 비교 페이지의 odds 테이블 선택자 (모든 선택자의 결과를 누적)
+ODDS_TABLE_SELECTORS = [
+    '.odds-table',
+    '.oddsTable',
+    '[class*="odds"]',
+    'table'
+]
+
+# 경기 요약 페이지의 상태 선택자 (앞쪽부터 시도)
+STATUS_SELECTORS = [
+    '.event__time',
+    '.event__stage',
+    '.detailScore__status',
+    '.matchInfo__status',
+    '[class*="status"]',
+    '[class*="time"]'
+]
+
+# 경기 종료를 나타내는 상태 문구 (공백을 하나로 줄인 소문자 전체 문구로 비교)
+FINISHED_STATUSES = {
+    '종료', '경기 종료', '경기종료', '완료',
+    'finished', 'ft', 'full time', 'full-time',
+    'after extra time', 'aet', 'after penalties', 'after pen.',
+}
+
+_NUMBER_PATTERN = re.compile(r'^\d+\.?\d*$')
+
+
+def make_soup(html):
+    """HTML 문자열을 BeautifulSoup 객체로 변환"""
+    return BeautifulSoup(html, HTML_PARSER)
+
+
+def element_text(element):
+    """
+    요소의 보이는 텍스트 (WebDriver .text와 비슷하게 줄 단위로 공백 정리)
+
+    하위 요소 경계는 줄바꿈으로 나누고 빈 줄은 버린다.
+    """
+    lines = (line.strip() for line in element.get_text("\n").splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def find_over_under_rows(soup):
+    """
+    over-under odds 행 찾기
+
+    Returns:
+        tuple: (사용한 선택자, 행 리스트) - 찾지 못하면 (None, [])
+    """
+    for selector in OVER_UNDER_ROW_SELECTORS:
+        rows = soup.select(selector)
+        if rows:
+            return selector, rows
+    return None, []
+
+
+def parse_over_under_rows(rows):
+    """
+    over-under odds 행들을 기준점별 북메이커 배당률과 평균으로 정리
+
+    Returns:
+        list: [{"handicap", "average": {"over", "under"}, "bookmakers": [...]}, ...]
+    """
+    # 기준점별로 배당률을 그룹화
+    odds_by_handicap = {}
+
+    for row in rows:
+        try:
+            # 북메이커명 추출
+            bookmaker_elements = row.select('img[title], img[alt], .bookmaker')
+            bookmaker_name = "Unknown"
+            if bookmaker_elements:
+                bookmaker_name = bookmaker_elements[0].get('title') or bookmaker_elements[0].get('alt') or "Unknown"
+
+            # 기준점 추출
+            handicap_elements = row.select('span[data-testid="wcl-oddsValue"], .handicap, .line')
+            if not handicap_elements:
+                continue
+
+            handicap_text = element_text(handicap_elements[0])
+            if not handicap_text.replace('.', '').replace(',', '').isdigit():
+                continue
+
+            handicap = float(handicap_text)
+
+            # Over/Under 배당률 추출
+            odds_cells = row.select('a.oddsCell__odd, .odds-cell, .odd')
+            if len(odds_cells) < 2:
+                continue
+
+            over_text = element_text(odds_cells[0]).split('\n')[0]
+            under_text = element_text(odds_cells[1]).split('\n')[0]
+
+            # 숫자 확인
+            try:
+                over_odds = float(over_text)
+                under_odds = float(under_text)
+            except ValueError:
+                continue
+
+            odds_by_handicap.setdefault(handicap, []).append({
+                "bookmaker": bookmaker_name,
+                "over": str(over_odds),
+                "under": str(under_odds)
+            })
+
+        except Exception:
+            continue
+
+    # 각 기준점별로 평균 계산
+    over_under = []
+    for handicap, bookmaker_odds in odds_by_handicap.items():
+        over_values = [float(b['over']) for b in bookmaker_odds]
+        under_values = [float(b['under']) for b in bookmaker_odds]
+
+        avg_over = sum(over_values) / len(over_values)
+        avg_under = sum(under_values) / len(under_values)
+
+        over_under.append({
+            "handicap": str(handicap),
+            "average": {
+                "over": f"{avg_over:.2f}",
+                "under": f"{avg_under:.2f}"
+            },
+            "bookmakers": bookmaker_odds
+        })
+
+    return over_under
+
+
+def parse_over_under_html(html):
+    """
+    over-under odds 페이지 HTML에서 odds 추출
+
+    Returns:
+        list: "over-under" 항목 리스트 (odds 행이 없으면 빈 리스트)
+    """
+    _, rows = find_over_under_rows(make_soup(html))
+    return parse_over_under_rows(rows)
+
+
+def parse_odds_tables_html(html):
+    """
+    odds 비교 페이지 HTML의 테이블에서 (기준점, 오버, 언더) 행 추출
+
+    첫 세 칸이 모두 숫자인 행만 사용하며 북메이커별 배당률은 없다.
+
+    Returns:
+        list: "over-under" 항목 리스트
+    """
+    soup = make_soup(html)
+    over_under = []
+
+    for selector in ODDS_TABLE_SELECTORS:
+        for table in soup.select(selector):
+            for row in table.find_all('tr'):
+                cells = row.find_all('td')
+                if len(cells) < 3:
+                    continue
+
+                # 첫 번째 셀에서 handicap 값 추출
+                handicap_text = element_text(cells[0])
+                if not _NUMBER_PATTERN.match(handicap_text):
+                    continue
+
+                # 두 번째와 세 번째 셀에서 over/under odds 추출
+                over_text = element_text(cells[1])
+                under_text = element_text(cells[2])
+                if not (_NUMBER_PATTERN.match(over_text) and _NUMBER_PATTERN.match(under_text)):
+                    continue
+
+                over_under.append({
+                    "handicap": str(float(handicap_text)),
+                    "average": {
+                        "over": str(float(over_text)),
+                        "under": str(float(under_text))
+                    },
+                    "bookmakers": []
+                })
+
+    return over_under
+
+
+def parse_over_under_page(html):
+    """
+    캐시·스냅샷의 over-under 페이지에서 odds 추출
+
+    over-under 페이지 형식으로 먼저 시도하고, 행이 없으면 collect_missing_data가
+    브라우저로 렌더링해 저장한 odds 비교 테이블 형식으로 다시 시도한다.
+
+    Returns:
+        list: "over-under" 항목 리스트 (odds 행이 없으면 빈 리스트)
+    """
+    return parse_over_under_html(html) or parse_odds_tables_html(html)
+
+
+def is_finished_status(status):
+    """
+    경기 상태 문구가 종료를 나타내는지 확인 (parse_status_html 결과나 저장된 status 값)
+
+    부분 문자열이 아니라 정규화한 전체 문구로 비교한다 ("Draft"나 "Left" 같은 문구를 종료로 보지 않도록).
+    """
+    if not status:
+        return False
+    return ' '.join(status.split()).lower() in FINISHED_STATUSES
+
+
+def parse_status_html(html, strict=False):
+    """
+    경기 요약 페이지 HTML에서 경기 상태 추출
+
+    Args:
+        strict: True면 "종료", "진행중", "예정"으로 판별한 상태만 돌려줌
+            (렌더링되지 않은 페이지의 엉뚱한 문구를 상태로 쓰지 않도록 HTTP 수집에서 사용)
+
+    Returns:
+        str: "종료", "진행중", "예정" 또는 페이지의 상태 문구 (찾지 못하면 None)
+    """
+    soup = make_soup(html)
+
+    for selector in STATUS_SELECTORS:
+        for element in soup.select(selector):
+            text = element_text(element)
+            if not text or text in ['VS', 'v', '-']:
+                continue
+
+            # 경기 상태 판별
+            lowered = text.lower()
+            if is_finished_status(text):
+                return "종료"
+            elif any(keyword in lowered for keyword in ['live', '진행', '중']):
+                return "진행중"
+            elif any(keyword in lowered for keyword in ['예정', 'scheduled', 'upcoming']):
+                return "예정"
+            elif ':' in text and len(text) <= 5:  # 시간 형태 (예: "90+5", "HT")
+                continue
+            elif strict:
+                continue
+            else:
+                return text
+
+    return None
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+렌더링된 HTML 페이지 수집기 (HTTP)
+
+경기 요약 페이지와 over-under odds 페이지의 HTML을 풀링된 requests.Session으로 받아
+html_parsers로 파싱한다. 수집기(collect_*.py)는 여기서 결과를 얻지 못했을 때만 Selenium으로 렌더링한다.
+
+Flashscore 경기 페이지는 클라이언트에서 렌더링되고 odds·상태는 별도의 데이터 피드로 받아 오므로,
+실제 사이트의 HTTP 응답에는 보통 상태나 odds 행이 없다. 이 모듈은 그 피드를 읽지 않으며,
+이미 렌더링된 HTML을 돌려주는 서버(저장된 응답을 내주는 fixture_server.py 등)에서만 결과를 낸다.
+그래서 FLASHSCORE_HTTP_FIRST=1일 때만 요청을 보내고, 꺼져 있으면 페이지 캐시만 확인한다.
+실제 사이트에 대해 브라우저보다 빠르다고 기대할 수 없으며, 실제 수집은 Selenium 경로가 맡는다.
+
+FLASHSCORE_BASE_URL 환경 변수를 지정하면 match_link의 호스트를 그 주소로 바꿔서 요청하므로
+fixture_server.py로 띄운 로컬 서버의 저장된 응답으로 시험할 수 있다.
+page_cache.PageCache를 넘기면 요청 전에 캐시를 먼저 확인하고, 받아 온 페이지는 파싱에 성공했을 때만 저장한다.
+"""
+
+import os
+from urllib.parse import urldefrag, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from html_parsers import is_finished_status, parse_over_under_page, parse_status_html
+
+# 요청 호스트 대체 주소 (없으면 match_link 그대로)
+BASE_URL = os.environ.get("FLASHSCORE_BASE_URL")
+# 렌더링된 HTML을 HTTP로 먼저 받을지 여부 (기본: 사용 안 함, 브라우저로만 수집)
+HTTP_FIRST = os.environ.get("FLASHSCORE_HTTP_FIRST", "0") == "1"
+
+# (연결, 읽기) 타임아웃 초
+HTTP_TIMEOUT = (5, 15)
+HTTP_POOL_SIZE = 16
+HTTP_RETRIES = 3
+
+REQUEST_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8"
+}
+
+
+def create_session(pool_size=HTTP_POOL_SIZE, retries=HTTP_RETRIES):
+    """
+    연결을 재사용하는 requests.Session 생성
+
+    일시적인 오류(429, 5xx, 연결 실패)는 지수 백오프로 재시도한다.
+    여러 스레드가 같은 세션을 쓸 수 있도록 호스트별 연결 풀 크기를 pool_size로 맞춘다.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET"]),
+        respect_retry_after_header=True
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(REQUEST_HEADERS)
+    return session
+
+
+def rebase_url(url, base_url=None):
+    """url의 scheme과 호스트를 base_url의 것으로 교체 (base_url이 없으면 그대로)"""
+    if not base_url:
+        return url
+    parts = urlsplit(url)
+    base = urlsplit(base_url)
+    return urlunsplit((base.scheme, base.netloc, parts.path, parts.query, parts.fragment))
+
+
+def build_over_under_url(match_link):
+    """경기 링크에서 over-under full-time odds 페이지 주소 생성"""
+    # 기존: .../?mid=ID#/match-summary/match-summary
+    # 변경: .../odds/over-under/full-time/?mid=ID
+    if '?mid=' in match_link and '#/match-summary/match-summary' in match_link:
+        # mid 파라미터 추출
+        mid_part = match_link.split('?mid=')[1].split('#')[0]
+        # 기본 경로에서 mid 제거 (끝의 / 제거하여 중복 방지)
+        base_path = match_link.split('?mid=')[0].rstrip('/')
+        return f"{base_path}/odds/over-under/full-time/?mid={mid_part}"
+
+    # fallback: 기존 방식
+    return match_link.replace('#/match-summary/match-summary', '/odds/over-under/full-time/')
+
+
+def request_url(url):
+    """실제로 요청할 주소 (fragment 제거, FLASHSCORE_BASE_URL 적용) - 페이지 캐시 키로도 사용"""
+    return rebase_url(urldefrag(url)[0], BASE_URL)
+
+
+def fetch_html(session, url, timeout=HTTP_TIMEOUT):
+    """페이지 HTML 요청 (HTTP 오류는 requests 예외로 전달)"""
+    response = session.get(request_url(url), timeout=timeout)
+    response.raise_for_status()
+    # Content-Type에 charset이 없으면 requests가 ISO-8859-1로 디코딩하므로 UTF-8로 지정
+    if 'charset' not in response.headers.get('Content-Type', '').lower():
+        response.encoding = 'utf-8'
+    return response.text
+
+
+def _load_page(session, url, cache):
+    """
+    캐시에서 먼저 찾고 없으면 요청 (저장은 호출한 쪽이 파싱에 성공한 뒤에 함)
+
+    Returns:
+        tuple: (HTML, 캐시에서 읽었는지) - session 없이 캐시에도 없으면 (None, False)
+    """
+    if cache is not None:
+        html = cache.get(url)
+        if html is not None:
+            return html, True
+    if session is None:
+        return None, False
+    return fetch_html(session, url), False
+
+
+def fetch_over_under_http(session, match_link, match_id=None, cache=None, finished=False):
+    """
+    over-under odds를 HTTP로 수집
+
+    odds 행을 파싱한 페이지만 캐시에 저장한다 (렌더링되지 않은 페이지가 만료되지 않고 남지 않도록).
+
+    Args:
+        session: requests.Session (None이면 캐시만 확인)
+        finished: 경기가 종료되었으면 True (캐시된 odds 페이지가 만료되지 않음)
+
+    Returns:
+        dict: {"over-under": [...]} (요청 실패나 odds 행이 없으면 None)
+    """
+    url = request_url(build_over_under_url(match_link))
+    try:
+        html, cached = _load_page(session, url, cache)
+    except requests.RequestException as e:
+        print(f"[{match_id}] ⚠️ HTTP odds 요청 실패: {e}")
+        return None
+    if html is None:
+        return None
+
+    # 캐시에는 브라우저로 렌더링한 odds 비교 테이블 페이지도 있으므로 두 형식 모두 시도
+    over_under = parse_over_under_page(html)
+    if not over_under:
+        return None
+    if cache is not None and not cached:
+        cache.put(url, html, finished)
+    return {"over-under": over_under}
+
+
+def fetch_status_http(session, match_link, cache=None):
+    """
+    경기 상태를 HTTP로 수집
+
+    상태를 판별한 페이지만 캐시에 저장하고, 상태가 종료일 때만 만료되지 않는 항목으로 저장한다.
+    렌더링되지 않은 페이지의 엉뚱한 문구를 받지 않도록 판별된 상태("종료", "진행중", "예정")만 인정한다.
+
+    Args:
+        session: requests.Session (None이면 캐시만 확인)
+
+    Returns:
+        str: 경기 상태 (요청 실패나 상태 요소가 없으면 None)
+    """
+    url = request_url(match_link)
+    try:
+        html, cached = _load_page(session, url, cache)
+    except requests.RequestException as e:
+        print(f"⚠️ HTTP status 요청 실패 ({match_link}): {e}")
+        return None
+    if html is None:
+        return None
+
+    status = parse_status_html(html, strict=True)
+    if status and cache is not None and not cached:
+        cache.put(url, html, is_finished_status(status))
+    return status
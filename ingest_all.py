@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+여러 시즌 JSON 파일을 프로세스 풀로 병렬 적재하는 스크립트
+각 파일은 ingest_pipeline으로 한 번만 파싱하여 적재하며, 워커 프로세스마다 DB 연결 하나를 재사용
+"""
+
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from database import connect_to_db
+from ingest_manifest import IngestManifest
+from ingest_pipeline import ingest_season_file
+from insert_matches import extract_season_from_filename
+
+# 기본 설정
+DEFAULT_DATA_DIR = "src/data"
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+# 워커 프로세스별 DB 연결과 매니페스트
+_worker_conn = None
+_worker_manifest = None
+
+def _init_worker():
+    """워커 프로세스 시작 시 DB 연결과 매니페스트를 하나씩 생성"""
+    global _worker_conn, _worker_manifest
+    _worker_conn = connect_to_db()
+    _worker_manifest = IngestManifest()
+
+def ingest_file(json_file_path, odds_method='average', conn=None, manifest=None):
+    """
+    시즌 파일 하나를 통합 파이프라인으로 적재
+
+    Returns:
+        dict: 파일별 처리 통계
+    """
+    conn = conn or _worker_conn
+    manifest = manifest or _worker_manifest
+    season = extract_season_from_filename(json_file_path)
+    summary = {
+        'file': json_file_path,
+        'season': season,
+        'matches': 0,
+        'rows': 0,
+        'elapsed': 0.0,
+        'success': False
+    }
+
+    if conn is None:
+        summary['error'] = "DB 연결 없음"
+        return summary
+
+    start_time = time.perf_counter()
+    try:
+        stats = ingest_season_file(json_file_path, odds_method, conn=conn, manifest=manifest)
+        if not stats:
+            summary['error'] = "통합 적재 실패"
+            return summary
+
+        summary['matches'] = stats['matches']
+        summary['rows'] = sum(stats['rows'].values())
+        summary['success'] = stats['errors'] == 0
+        if stats['errors']:
+            summary['error'] = f"{stats['errors']}개 경기 기록 실패"
+        return summary
+
+    except Exception as e:
+        summary['error'] = str(e)
+        return summary
+
+    finally:
+        summary['elapsed'] = time.perf_counter() - start_time
+
+def find_season_files(target):
+    """디렉터리 또는 glob 패턴에서 시즌 JSON 파일 목록 생성"""
+    if os.path.isdir(target):
+        pattern = os.path.join(target, "soccer_*.json")
+    else:
+        pattern = target
+    return sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
+
+def print_summary(summaries, total_elapsed):
+    """파일별 처리량 요약 출력"""
+    print(f"\n📊 파일별 처리량 요약")
+    print("=" * 100)
+    print(f"{'파일':<55} {'경기':>8} {'행':>10} {'초':>8} {'경기/초':>10}  결과")
+    print("-" * 100)
+
+    total_matches = 0
+    total_rows = 0
+    for summary in sorted(summaries, key=lambda s: s['file']):
+        elapsed = summary['elapsed']
+        rate = summary['matches'] / elapsed if elapsed > 0 else 0.0
+        result = "✅" if summary['success'] else f"❌ {summary.get('error', '')}"
+        print(f"{os.path.basename(summary['file']):<55} {summary['matches']:>8} {summary['rows']:>10} "
+              f"{elapsed:>8.1f} {rate:>10.1f}  {result}")
+        total_matches += summary['matches']
+        total_rows += summary['rows']
+
+    print("-" * 100)
+    total_rate = total_matches / total_elapsed if total_elapsed > 0 else 0.0
+    print(f"{'합계':<55} {total_matches:>8} {total_rows:>10} {total_elapsed:>8.1f} {total_rate:>10.1f}")
+
+def ingest_all(json_files, workers=DEFAULT_WORKERS, odds_method='average'):
+    """시즌 파일들을 프로세스 풀에 분배하여 적재"""
+    summaries = []
+    start_time = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        future_to_file = {
+            executor.submit(ingest_file, json_file, odds_method): json_file
+            for json_file in json_files
+        }
+
+        completed = 0
+        for future in as_completed(future_to_file):
+            json_file = future_to_file[future]
+            try:
+                summary = future.result()
+            except Exception as e:
+                summary = {
+                    'file': json_file,
+                    'season': extract_season_from_filename(json_file),
+                    'matches': 0,
+                    'rows': 0,
+                    'elapsed': 0.0,
+                    'success': False,
+                    'error': str(e)
+                }
+            summaries.append(summary)
+
+            completed += 1
+            print(f"📈 진행률: {completed}/{len(json_files)} - {os.path.basename(json_file)}")
+
+    print_summary(summaries, time.perf_counter() - start_time)
+    return summaries
+
+def main():
+    """메인 함수"""
+
+    if len(sys.argv) > 1 and sys.argv[1] in ('-h', '--help'):
+        print("사용법: python ingest_all.py [디렉터리|glob 패턴] [워커 수] [odds_method] [--full]")
+        print('예시: python ingest_all.py "src/data/soccer_greece_*.json" 8 average')
+        return
+
+    # 옵션 분리: --full (매니페스트 무시하고 전체 재적재)
+    full_mode = '--full' in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+
+    target = args[0] if len(args) > 0 else DEFAULT_DATA_DIR
+    workers = int(args[1]) if len(args) > 1 else DEFAULT_WORKERS
+    odds_method = args[2] if len(args) > 2 else 'average'
+
+    json_files = find_season_files(target)
+    if not json_files:
+        print(f"❌ 시즌 JSON 파일을 찾을 수 없습니다: {target}")
+        return
+
+    if full_mode:
+        manifest = IngestManifest()
+        for json_file in json_files:
+            manifest.forget(season=extract_season_from_filename(json_file))
+        manifest.forget_teams()
+        manifest.close()
+
+    print(f"🚀 병렬 적재 시작: {len(json_files)}개 파일, 워커 {workers}개")
+
+    summaries = ingest_all(json_files, workers, odds_method)
+
+    failed = [summary for summary in summaries if not summary['success']]
+    if failed:
+        print(f"💥 {len(failed)}개 파일 적재 실패")
+    else:
+        print("🎉 모든 파일 적재 완료!")
+
+if __name__ == "__main__":
+    main()
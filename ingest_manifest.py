@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+경기별 콘텐츠 해시 매니페스트
+
+경기 데이터를 정규화한 페이로드의 해시와 마지막 적재 시각을 로컬 SQLite 파일에 저장한다.
+재적재 시 해시가 같은 경기는 DB 작업 전에 건너뛰어, 변경된 경기만 다시 쓰도록 한다.
+DB에 이미 기록된 팀도 함께 저장하여, 새 팀이 없으면 teams 테이블에 아무 문장도 보내지 않는다.
+SQLite를 사용하므로 ingest_all.py의 여러 워커 프로세스가 동시에 사용해도 안전하다.
+
+모든 항목은 대상 DB(호스트:포트/DB 이름)별로 따로 저장하므로 다른 DB로 적재하면 처음부터 다시 쓴다.
+같은 DB를 초기화한 경우에 대비해 cursor를 넘기면 로드할 때 DB에 실제로 있는 항목만 남긴다.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime, timezone
+
+from database import db_identity
+
+# 기본 매니페스트 경로 (INGEST_MANIFEST_PATH 환경변수로 변경 가능)
+DEFAULT_MANIFEST_PATH = ".ingest_manifest.sqlite"
+
+# 단계별로 해시가 기록된 경기가 DB에 있는지 확인할 (테이블, 컬럼)
+STAGE_TABLES = {
+    'matches': ('matches', 'id'),
+    'pipeline': ('matches', 'id'),
+    'odds': ('odds_metadata', 'match_id'),
+}
+
+
+def payload_hash(payload):
+    """페이로드를 정규화(키 정렬, 공백 제거)한 JSON의 SHA-256 해시"""
+    normalized = json.dumps(
+        payload,
+        sort_keys=True,
+        separators=(',', ':'),
+        ensure_ascii=False,
+        default=str
+    )
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def _existing_ids(cursor, table, column, ids):
+    """ids 중 DB의 table.column에 있는 값 (조회 후 트랜잭션을 닫아 호출자의 BEGIN과 겹치지 않게 함)"""
+    cursor.execute(f"SELECT {column} FROM {table} WHERE {column} = ANY(%s)", (list(ids),))
+    existing = {row[0] for row in cursor.fetchall()}
+    cursor.connection.commit()
+    return existing
+
+
+class IngestManifest:
+    """(DB, stage, match_id)별 해시를 저장하는 매니페스트"""
+
+    def __init__(self, path=None, db_key=None):
+        """
+        Args:
+            path: SQLite 파일 경로 (없으면 INGEST_MANIFEST_PATH 환경변수 또는 기본 경로)
+            db_key: 대상 DB 식별자 (없으면 현재 접속 설정의 호스트:포트/DB 이름)
+        """
+        self.path = path or os.environ.get("INGEST_MANIFEST_PATH", DEFAULT_MANIFEST_PATH)
+        self.db_key = db_key or db_identity()
+        self.conn = sqlite3.connect(self.path, timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+
+        # DB 구분이 없던 이전 형식은 어느 DB의 기록인지 알 수 없으므로 버림 (다음 적재 때 전체를 다시 씀)
+        for table in ('match_hashes', 'known_teams'):
+            columns = [row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")]
+            if columns and 'db_key' not in columns:
+                self.conn.execute(f"DROP TABLE {table}")
+
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS match_hashes (
+                db_key TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                match_id TEXT NOT NULL,
+                season TEXT,
+                payload_hash TEXT NOT NULL,
+                ingested_at TEXT NOT NULL,
+                PRIMARY KEY (db_key, stage, match_id)
+            )
+        """)
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_match_hashes_stage_season ON match_hashes(db_key, stage, season)"
+        )
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS known_teams (
+                db_key TEXT NOT NULL,
+                team_id TEXT NOT NULL,
+                team TEXT,
+                sport_type TEXT,
+                nation TEXT,
+                PRIMARY KEY (db_key, team_id)
+            )
+        """)
+        self.conn.commit()
+
+    def load(self, stage, season, cursor=None):
+        """
+        시즌의 저장된 해시 로드
+
+        Args:
+            cursor: 주어지면 DB에 없는 경기(DB 초기화 등)의 해시는 지우고 제외
+
+        Returns:
+            dict: {match_id: payload_hash}
+        """
+        rows = self.conn.execute(
+            "SELECT match_id, payload_hash FROM match_hashes WHERE db_key = ? AND stage = ? AND season = ?",
+            (self.db_key, stage, season)
+        )
+        hashes = dict(rows.fetchall())
+        if cursor is None or not hashes:
+            return hashes
+
+        table, column = STAGE_TABLES.get(stage, STAGE_TABLES['matches'])
+        existing = _existing_ids(cursor, table, column, hashes)
+        missing = [match_id for match_id in hashes if match_id not in existing]
+        if missing:
+            print(f"⚠️ 매니페스트의 {len(missing)}개 경기가 DB에 없음 - 다시 적재")
+            self.conn.executemany(
+                "DELETE FROM match_hashes WHERE db_key = ? AND stage = ? AND match_id = ?",
+                [(self.db_key, stage, match_id) for match_id in missing]
+            )
+            self.conn.commit()
+        return {match_id: digest for match_id, digest in hashes.items() if match_id in existing}
+
+    def mark(self, stage, season, entries):
+        """
+        DB 커밋이 끝난 경기들의 해시 기록
+
+        Args:
+            entries: (match_id, payload_hash) 목록
+        """
+        if not entries:
+            return
+        ingested_at = datetime.now(timezone.utc).isoformat()
+        self.conn.executemany(
+            """
+            INSERT INTO match_hashes (db_key, stage, match_id, season, payload_hash, ingested_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (db_key, stage, match_id) DO UPDATE SET
+                season = excluded.season,
+                payload_hash = excluded.payload_hash,
+                ingested_at = excluded.ingested_at
+            """,
+            [(self.db_key, stage, match_id, season, digest, ingested_at) for match_id, digest in entries]
+        )
+        self.conn.commit()
+
+    def forget(self, stage=None, season=None):
+        """해시 삭제 (다음 적재 때 전체를 다시 쓰도록)"""
+        conditions = ["db_key = ?"]
+        params = [self.db_key]
+        if stage is not None:
+            conditions.append("stage = ?")
+            params.append(stage)
+        if season is not None:
+            conditions.append("season = ?")
+            params.append(season)
+        self.conn.execute(f"DELETE FROM match_hashes WHERE {' AND '.join(conditions)}", params)
+        self.conn.commit()
+
+    def load_teams(self, cursor=None):
+        """
+        DB에 기록된 것으로 알려진 팀 로드
+
+        Args:
+            cursor: 주어지면 DB에 없는 팀(DB 초기화 등)은 캐시에서 지우고 제외
+
+        Returns:
+            dict: {team_id: (team, sport_type, nation)}
+        """
+        rows = self.conn.execute(
+            "SELECT team_id, team, sport_type, nation FROM known_teams WHERE db_key = ?", (self.db_key,)
+        )
+        teams = {row[0]: tuple(row[1:]) for row in rows.fetchall()}
+        if cursor is None or not teams:
+            return teams
+
+        existing = _existing_ids(cursor, 'teams', 'team_id', teams)
+        missing = [team_id for team_id in teams if team_id not in existing]
+        if missing:
+            print(f"⚠️ 팀 캐시의 {len(missing)}개 팀이 DB에 없음 - 다시 기록")
+            self.conn.executemany(
+                "DELETE FROM known_teams WHERE db_key = ? AND team_id = ?",
+                [(self.db_key, team_id) for team_id in missing]
+            )
+            self.conn.commit()
+        return {team_id: team for team_id, team in teams.items() if team_id in existing}
+
+    def mark_teams(self, teams):
+        """
+        DB 커밋이 끝난 팀 기록
+
+        Args:
+            teams: (team_id, team, sport_type, nation) 목록
+        """
+        if not teams:
+            return
+        self.conn.executemany(
+            """
+            INSERT INTO known_teams (db_key, team_id, team, sport_type, nation)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (db_key, team_id) DO UPDATE SET
+                team = excluded.team,
+                sport_type = excluded.sport_type,
+                nation = excluded.nation
+            """,
+            [(self.db_key, *team) for team in teams]
+        )
+        self.conn.commit()
+
+    def forget_teams(self):
+        """팀 캐시 삭제 (DB를 새로 만들었을 때 등)"""
+        self.conn.execute("DELETE FROM known_teams WHERE db_key = ?", (self.db_key,))
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+시즌 JSON 파일을 한 번만 파싱하여 teams, matches, odds, statistics, events를 함께 적재하는 스크립트
+
+각 경기를 한 번 파싱해 테이블별 행 버퍼에 나눠 담고, 배치마다 하나의 연결·하나의 트랜잭션에서
+FK 순서(teams → matches → odds_metadata/handicap_odds → bookmaker_odds → match_statistics → match_events)로
+일괄 기록한다. matches가 먼저 적재되지 않아 odds가 스킵되는 문제가 생기지 않는다.
+"""
+
+import os
+import sys
+import time
+
+from psycopg2.extras import execute_values
+
+from database import connect_to_db, release_connection
+from ingest_manifest import IngestManifest, payload_hash
+from insert_matches import (
+    MATCH_COLUMNS,
+    RejectFile,
+    build_match_row,
+    extract_season_from_filename,
+    set_best_odds,
+)
+from insert_odds import build_bookmaker_rows, build_odds_rows_batch, validate_over_under, write_odds_batch
+from insert_teams import extract_match_teams, upsert_teams
+from json_stream import iter_matches
+
+# 매니페스트에서 통합 파이프라인 단계를 구분하는 이름
+MANIFEST_STAGE = 'pipeline'
+
+# 한 트랜잭션으로 기록하는 경기 수
+DEFAULT_BATCH_SIZE = 500
+
+# execute_values 한 번에 보내는 행 수
+PAGE_SIZE = 1000
+
+# match_events 테이블 CHECK 제약조건에 허용된 값
+EVENT_TYPES = ('골', '교체', '카드', '기타')
+EVENT_TEAMS = ('홈', '어웨이')
+CARD_TYPES = ('Yellow Card', 'Red Card')
+
+
+class RowBuffers:
+    """
+    배치 하나 분량의 테이블별 행 버퍼
+
+    경기별로 만든 행도 entries에 함께 보관해서, 배치 기록이 실패하면 split()으로 나눠 다시 시도할 수 있다.
+    """
+
+    def __init__(self):
+        self.entries = []
+        self.teams = {}
+        self.written_teams = []
+        self.matches = []
+        self.over_under_odds = []
+        self.handicap_odds = []
+        self.bookmaker_odds = []
+        self.match_statistics = []
+        self.match_events = []
+        self.hashes = []
+
+    def __len__(self):
+        return len(self.matches)
+
+    def add(self, match_id, row, teams, over_under_odds, bookmaker_rows, statistics_rows, event_rows):
+        """경기 하나의 행들을 테이블별 버퍼에 추가"""
+        self.entries.append((match_id, row, teams, over_under_odds, bookmaker_rows, statistics_rows, event_rows))
+        for team in teams:
+            self.teams[team[0]] = team
+        self.matches.append(row)
+        if over_under_odds:
+            # 대표 배당률은 flush 시 배치 전체를 한 번에 계산
+            self.over_under_odds.append((match_id, over_under_odds))
+            self.bookmaker_odds.extend(bookmaker_rows)
+        self.match_statistics.extend(statistics_rows)
+        self.match_events.extend(event_rows)
+
+    def split(self):
+        """경기 순서대로 반씩 나눈 두 버퍼 (해시도 함께 나눔)"""
+        digests = dict(self.hashes)
+        half = len(self.entries) // 2
+        parts = []
+        for entries in (self.entries[:half], self.entries[half:]):
+            part = RowBuffers()
+            for entry in entries:
+                part.add(*entry)
+                if entry[0] in digests:
+                    part.hashes.append((entry[0], digests[entry[0]]))
+            parts.append(part)
+        return parts
+
+    def row_counts(self):
+        return {
+            'teams': len(self.written_teams),
+            'matches': len(self.matches),
+            'handicap_odds': len(self.handicap_odds),
+            'bookmaker_odds': len(self.bookmaker_odds),
+            'match_statistics': len(self.match_statistics),
+            'match_events': len(self.match_events),
+        }
+
+
+def build_statistics_rows(match_id, statistics):
+    """statistics 배열을 match_statistics 행으로 변환 (카테고리 중복 제거)"""
+    rows = {}
+    for stat in statistics or []:
+        category = stat.get('category')
+        home_value = stat.get('homeValue')
+        away_value = stat.get('awayValue')
+        if not category or home_value is None or away_value is None:
+            continue
+        rows.setdefault(category, (match_id, category, home_value, away_value))
+    return list(rows.values())
+
+
+def build_event_rows(match_id, events):
+    """events 객체를 match_events 행으로 변환 (CHECK 제약조건에 맞게 정규화)"""
+    if not events or not events.get('events'):
+        return []
+
+    first_half_score = events.get('firstHalfScore')
+    second_half_score = events.get('secondHalfScore')
+
+    rows = []
+    seen = set()
+    for event in events['events']:
+        event_type = event.get('eventType')
+        if event_type not in EVENT_TYPES:
+            event_type = '기타'
+        team = event.get('team') if event.get('team') in EVENT_TEAMS else None
+        card_type = event.get('card_type') if event.get('card_type') in CARD_TYPES else None
+        event_time = event.get('time') if isinstance(event.get('time'), int) else None
+
+        # 교체의 경우 교체된(나간) 선수를 주요 선수로 저장
+        player_name = event.get('player_out') if event_type == '교체' else event.get('player')
+
+        # UNIQUE(match_id, event_time, event_type, team, player_name) 위반 방지 (NULL은 중복으로 보지 않음)
+        key = (event_time, event_type, team, player_name)
+        if None not in key:
+            if key in seen:
+                continue
+            seen.add(key)
+
+        rows.append((
+            match_id,
+            event_type,
+            event_time,
+            team,
+            event.get('description'),
+            player_name,
+            event.get('assist'),
+            card_type,
+            event.get('player_out'),
+            event.get('player_in'),
+            first_half_score,
+            second_half_score
+        ))
+    return rows
+
+
+def parse_match(buffers, match_id, match_data, season):
+    """
+    경기 하나를 파싱하여 테이블별 버퍼에 추가
+
+    모든 행을 먼저 만든 뒤 한꺼번에 추가하므로, 도중에 예외가 나면 버퍼에는 아무것도 남지 않는다.
+    over-under 구조가 잘못된 경기는 flush 때 배치 전체가 실패하지 않도록 여기서 거부한다.
+    기준점(best_*) 컬럼은 flush 때 배치 단위로 채운다.
+
+    Returns:
+        str: 검증 실패 사유 (성공 시 None)
+    """
+    row, reason = build_match_row(match_id, match_data, season, select_best=False)
+    if row is None:
+        return reason
+
+    odds = match_data.get('odds')
+    over_under_odds = odds.get('over-under') if isinstance(odds, dict) else None
+    bookmaker_rows = []
+    if over_under_odds:
+        reason = validate_over_under(over_under_odds)
+        if reason:
+            return reason
+        bookmaker_rows = build_bookmaker_rows(match_id, over_under_odds)
+
+    teams = extract_match_teams(match_data)
+    statistics_rows = build_statistics_rows(match_id, match_data.get('statistics'))
+    event_rows = build_event_rows(match_id, match_data.get('events'))
+
+    buffers.add(match_id, row, teams, over_under_odds, bookmaker_rows, statistics_rows, event_rows)
+    return None
+
+
+def flush_buffers(cursor, buffers, odds_method='average', known_teams=None):
+    """
+    버퍼를 FK 순서대로 한 트랜잭션에서 기록 (트랜잭션은 호출자가 관리)
+
+    Args:
+        known_teams: {team_id: (team, sport_type, nation)} - DB에 이미 있는 팀
+    """
+    # 1. teams (이미 같은 값으로 기록된 팀은 보내지 않음)
+    buffers.written_teams = upsert_teams(cursor, buffers.teams.values(), known_teams)
+
+    # 기준점과 배당률 행은 배치 전체를 한 번에 계산
+    odds_rows = build_odds_rows_batch(buffers.over_under_odds, odds_method) if buffers.over_under_odds else []
+    best_lines = {match_id: best_line for (match_id, _), (_, _, best_line) in zip(buffers.over_under_odds, odds_rows)}
+    match_rows = [set_best_odds(row, best_lines.get(row[0])) for row in buffers.matches]
+
+    # 2. matches
+    execute_values(
+        cursor,
+        f"""
+        INSERT INTO matches ({', '.join(MATCH_COLUMNS)})
+        VALUES %s
+        ON CONFLICT (id) DO UPDATE SET
+            match_link = EXCLUDED.match_link,
+            match_time = EXCLUDED.match_time,
+            status = EXCLUDED.status,
+            home_team_id = EXCLUDED.home_team_id,
+            away_team_id = EXCLUDED.away_team_id,
+            home_score = EXCLUDED.home_score,
+            away_score = EXCLUDED.away_score,
+            season = EXCLUDED.season,
+            best_benchmark = EXCLUDED.best_benchmark,
+            best_over_odds = EXCLUDED.best_over_odds,
+            best_under_odds = EXCLUDED.best_under_odds
+        """,
+        match_rows,
+        page_size=PAGE_SIZE
+    )
+
+    # 3. odds_metadata / handicap_odds / bookmaker_odds
+    # 배치의 모든 경기를 교체 대상으로 넘겨서 over-under가 사라진 경기의 기존 라인도 지움
+    match_ids = [row[0] for row in buffers.matches]
+    buffers.handicap_odds = [row for _, handicap_rows, _ in odds_rows for row in handicap_rows]
+    write_odds_batch(
+        cursor,
+        [metadata for metadata, _, _ in odds_rows],
+        buffers.handicap_odds,
+        match_ids,
+        buffers.bookmaker_odds
+    )
+    odds_match_ids = {match_id for match_id, _ in buffers.over_under_odds}
+    without_odds = [match_id for match_id in match_ids if match_id not in odds_match_ids]
+    if without_odds:
+        cursor.execute("DELETE FROM odds_metadata WHERE match_id = ANY(%s)", (without_odds,))
+
+    # 4. match_statistics
+    if buffers.match_statistics:
+        execute_values(
+            cursor,
+            """
+            INSERT INTO match_statistics (match_id, category, home_value, away_value)
+            VALUES %s
+            ON CONFLICT (match_id, category) DO UPDATE SET
+                home_value = EXCLUDED.home_value,
+                away_value = EXCLUDED.away_value
+            """,
+            buffers.match_statistics,
+            page_size=PAGE_SIZE
+        )
+
+    # 5. match_events (경기 단위로 교체)
+    cursor.execute("DELETE FROM match_events WHERE match_id = ANY(%s)", (match_ids,))
+    if buffers.match_events:
+        execute_values(
+            cursor,
+            """
+            INSERT INTO match_events (
+                match_id, event_type, event_time, team, description, player_name,
+                assisting_player, card_type, substitution_out, substitution_in,
+                first_half_score, second_half_score
+            )
+            VALUES %s
+            """,
+            buffers.match_events,
+            page_size=PAGE_SIZE
+        )
+
+
+def ingest_season_file(json_file_path, odds_method='average', batch_size=DEFAULT_BATCH_SIZE,
+                       conn=None, manifest=None, reject_file_path=None):
+    """
+    시즌 JSON 파일을 한 번 읽어 모든 테이블에 적재
+
+    Args:
+        conn: 재사용할 DB 연결 (없으면 새로 연결 후 종료)
+        manifest: IngestManifest - 주어지면 내용이 바뀌지 않은 경기는 건너뜀
+
+    Returns:
+        dict: 적재 통계 (실패 시 False)
+    """
+    season = extract_season_from_filename(json_file_path)
+    print(f"🎯 추출된 season: {season}")
+
+    if reject_file_path is None:
+        reject_file_path = f"{json_file_path}.rejects.jsonl"
+    rejects = RejectFile(reject_file_path)
+
+    # 데이터베이스 연결
+    own_conn = conn is None
+    if own_conn:
+        conn = connect_to_db()
+        if not conn:
+            return False
+
+    stats = {
+        'matches': 0,
+        'written': 0,
+        'unchanged': 0,
+        'skipped': 0,
+        'errors': 0,
+        'rows': {},
+    }
+
+    try:
+        cursor = conn.cursor()
+
+        print(f"📁 JSON 파일 읽는 중: {json_file_path}")
+
+        # 이전 적재 시 해시 (변경 없는 경기 건너뛰기용)
+        known_hashes = manifest.load(MANIFEST_STAGE, season, cursor) if manifest else {}
+        # DB에 이미 있는 팀 (배치 사이에서도 같은 팀을 다시 보내지 않도록 갱신)
+        known_teams = manifest.load_teams(cursor) if manifest else {}
+
+        def flush(buffers):
+            try:
+                cursor.execute("BEGIN;")
+                flush_buffers(cursor, buffers, odds_method, known_teams)
+                cursor.execute("COMMIT;")
+            except Exception as db_error:
+                cursor.execute("ROLLBACK;")
+                # 문제 경기만 거부되도록 반씩 나눠 다시 시도 (경기 하나까지 줄어들면 거부)
+                if len(buffers) > 1:
+                    print(f"⚠️ 배치 기록 실패 ({len(buffers)}개 경기) - 나눠서 다시 시도: {db_error}")
+                    for part in buffers.split():
+                        flush(part)
+                    return
+                match_id = buffers.matches[0][0]
+                print(f"❌ 경기 {match_id} 기록 실패: {db_error}")
+                rejects.write(match_id, f"기록 실패: {db_error}", None)
+                stats['errors'] += 1
+                return
+
+            for team in buffers.written_teams:
+                known_teams[team[0]] = tuple(team[1:])
+            if manifest:
+                manifest.mark(MANIFEST_STAGE, season, buffers.hashes)
+                manifest.mark_teams(buffers.written_teams)
+            stats['written'] += len(buffers)
+            for table, count in buffers.row_counts().items():
+                stats['rows'][table] = stats['rows'].get(table, 0) + count
+            print(f"📈 진행: {stats['matches']}개 경기 읽음, {stats['written']}개 기록 완료")
+
+        buffers = RowBuffers()
+        for match_id, match_data in iter_matches(json_file_path):
+            stats['matches'] += 1
+
+            digest = payload_hash([odds_method, match_data])
+            if known_hashes.get(match_id) == digest:
+                stats['unchanged'] += 1
+                continue
+
+            try:
+                reason = parse_match(buffers, match_id, match_data, season)
+            except Exception as e:
+                reason = f"처리 실패: {e}"
+            if reason:
+                rejects.write(match_id, reason, match_data)
+                stats['skipped'] += 1
+                continue
+            buffers.hashes.append((match_id, digest))
+
+            if len(buffers) >= batch_size:
+                flush(buffers)
+                buffers = RowBuffers()
+
+        if len(buffers) > 0:
+            flush(buffers)
+
+        # 결과 출력
+        print(f"\n📊 통합 적재 완료!")
+        print(f"  ✅ 기록: {stats['written']}개")
+        if manifest:
+            print(f"  💤 변경 없음: {stats['unchanged']}개")
+        print(f"  ⚠️ 건너뜀: {stats['skipped']}개")
+        print(f"  ❌ 오류: {stats['errors']}개")
+        print(f"  📈 총 처리: {stats['matches']}개")
+        for table, count in stats['rows'].items():
+            print(f"    - {table}: {count}행")
+
+        return stats
+
+    except Exception as e:
+        print(f"❌ 통합 적재 중 오류: {e}")
+        return False
+
+    finally:
+        rejects.close()
+        cursor.close()
+        if own_conn:
+            release_connection(conn)
+            print("🔌 데이터베이스 연결 종료")
+
+
+def main():
+    """메인 함수"""
+
+    # 옵션 분리: --full (매니페스트 무시하고 전체 재적재)
+    full_mode = '--full' in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+
+    if len(args) < 1:
+        print("사용법: python ingest_pipeline.py <json_file_path> [odds_method] [batch_size] [--full]")
+        print("예시: python ingest_pipeline.py src/data/soccer_greece_super-league-2-2025-2026.json average 500")
+        return
+
+    json_file_path = args[0]
+    odds_method = args[1] if len(args) > 1 else 'average'
+    batch_size = int(args[2]) if len(args) > 2 else DEFAULT_BATCH_SIZE
+
+    if not os.path.exists(json_file_path):
+        print(f"❌ 파일을 찾을 수 없습니다: {json_file_path}")
+        return
+
+    print(f"🚀 통합 적재 시작: {json_file_path}")
+    print(f"⚙️ 설정: odds_method={odds_method}, batch_size={batch_size}")
+
+    manifest = IngestManifest()
+    if full_mode:
+        manifest.forget(MANIFEST_STAGE, extract_season_from_filename(json_file_path))
+        manifest.forget_teams()
+
+    start_time = time.perf_counter()
+    try:
+        success = ingest_season_file(json_file_path, odds_method, batch_size, manifest=manifest)
+    finally:
+        manifest.close()
+
+    if success:
+        elapsed = time.perf_counter() - start_time
+        print(f"🎉 통합 적재 성공! ({elapsed:.1f}초)")
+    else:
+        print("💥 통합 적재 실패!")
+
+
+if __name__ == "__main__":
+    main()
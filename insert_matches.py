@@ -3,31 +3,18 @@
 Flashscore JSON 데이터를 PostgreSQL matches 테이블에 삽입하는 스크립트
 """
 
+import csv
+import io
 import json
-import psycopg2
 from psycopg2.extras import RealDictCursor
 import os
 from datetime import datetime, timezone, timedelta
 import sys
 
-# 데이터베이스 설정
-DB_CONFIG = {
-    "host": "aws-1-ap-northeast-2.pooler.supabase.com",
-    "database": "postgres",
-    "user": "postgres.dvwwcmhzlllaukscjuya",
-    "password": "!Qdhdbrclf56",
-    "port": "6543"
-}
-
-def connect_to_db():
-    """데이터베이스 연결"""
-    try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        print("✅ 데이터베이스 연결 성공")
-        return conn
-    except Exception as e:
-        print(f"❌ 데이터베이스 연결 실패: {e}")
-        return None
+from best_odds import find_best_odds, find_best_odds_batch
+from database import connect_to_db, release_connection
+from ingest_manifest import IngestManifest, payload_hash
+from json_stream import iter_matches
 
 def parse_match_time(date_str):
     """날짜 문자열을 PostgreSQL TIMESTAMPTZ 형식으로 변환 (로컬 시간 → UTC 변환)"""
@@ -70,130 +57,228 @@ def extract_season_from_filename(filename):
     
     return season
 
-def find_best_odds(over_under_odds_list):
+# 매니페스트에서 matches 적재 단계를 구분하는 이름
+MANIFEST_STAGE = 'matches'
+
+# 일괄 모드에서 COPY 한 번에 보내는 행 수
+COPY_CHUNK_SIZE = 5000
+
+MATCH_COLUMNS = [
+    'id', 'match_link', 'match_time', 'status', 'home_team_id', 'away_team_id',
+    'home_score', 'away_score', 'season', 'best_benchmark', 'best_over_odds', 'best_under_odds'
+]
+
+def build_match_row(match_id, match_data, season, select_best=True):
     """
-    최적의 배당률을 찾는 함수
-    1. 오버배당률과 언더배당률의 차이의 절댓값이 가장 작은 것
-    2. 차이가 같으면 오버 배당률이 더 높은 것
-    3. 그것도 같으면 아무거나
+    경기 데이터를 matches 테이블 한 행으로 변환
+    
+    Args:
+        select_best: False면 best_* 컬럼을 비워 둠 (여러 경기를 모아 set_best_odds로 채울 때)
+    
+    Returns:
+        tuple: (row, reason) - 검증 실패 시 row는 None, reason에 사유
     """
-    if not over_under_odds_list or len(over_under_odds_list) == 0:
-        return None
+    # 필수 데이터 확인
+    if not all(key in match_data for key in ['date', 'home', 'away']):
+        return None, "필수 데이터 누락"
+    
+    # 경기 시간 파싱
+    match_time = parse_match_time(match_data['date'])
+    if not match_time:
+        return None, f"날짜 파싱 실패: {match_data['date']}"
+    
+    # 팀 정보 추출
+    home_team_id = match_data['home'].get('id')
+    away_team_id = match_data['away'].get('id')
+    
+    if not home_team_id or not away_team_id:
+        return None, "팀 ID 누락"
+    
+    # 경기 상태 추출
+    status = match_data.get('status', 'Unknown')
+    
+    # match_link 추출
+    match_link = match_data.get('match_link')
+    
+    # 점수 추출 (result 객체에서)
+    home_score = None
+    away_score = None
+    if 'result' in match_data and match_data['result']:
+        result = match_data['result']
+        if 'home' in result and 'away' in result:
+            # status가 없을 때 result가 이상하게 저장되는 문제 해결
+            try:
+                home_score = int(result['home']) if result['home'].isdigit() else None
+                away_score = int(result['away']) if result['away'].isdigit() else None
+            except (ValueError, AttributeError):
+                # 숫자가 아닌 값이면 None으로 설정
+                home_score = None
+                away_score = None
+    
+    # 최적 배당률 추출 (odds에서)
+    best_benchmark = None
+    best_over_odds = None
+    best_under_odds = None
+    
+    if select_best and 'odds' in match_data and match_data['odds'] and 'over-under' in match_data['odds']:
+        over_under_odds = match_data['odds']['over-under']
+        if over_under_odds and len(over_under_odds) > 0:
+            best_odds = find_best_odds(over_under_odds)
+            if best_odds:
+                best_benchmark = best_odds['handicap']
+                best_over_odds = best_odds['average']['over']
+                best_under_odds = best_odds['average']['under']
+    
+    row = (
+        match_id,
+        match_link,
+        match_time,
+        status,
+        home_team_id,
+        away_team_id,
+        home_score,
+        away_score,
+        season,
+        best_benchmark,
+        best_over_odds,
+        best_under_odds
+    )
+    return row, None
+
+def match_over_under(match_data):
+    """경기 데이터의 over-under 라인 목록 (없으면 None)"""
+    odds = match_data.get('odds')
+    if isinstance(odds, dict) and 'over-under' in odds:
+        return odds['over-under']
+    return None
+
+def set_best_odds(row, best_odds):
+    """matches 행의 best_* 컬럼을 선택된 라인(없으면 NULL)으로 채운 새 행"""
+    if not best_odds:
+        return row[:-3] + (None, None, None)
+    return row[:-3] + (best_odds['handicap'], best_odds['average']['over'], best_odds['average']['under'])
+
+def build_match_rows(matches, season):
+    """
+    여러 경기를 matches 행으로 변환 (기준점은 find_best_odds_batch 한 번으로 선택)
     
-    best_odds = None
-    min_difference = float('inf')
-    max_over_odds = -1
+    Args:
+        matches: (match_id, match_data) 리스트
     
-    for odds_data in over_under_odds_list:
+    Returns:
+        list: 경기 순서대로 (row, reason) - build_match_row와 같은 결과
+    """
+    results = []
+    for match_id, match_data in matches:
         try:
-            over_odds = float(odds_data['average']['over'])
-            under_odds = float(odds_data['average']['under'])
-            
-            # 오버배당률과 언더배당률의 차이 절댓값
-            difference = abs(over_odds - under_odds)
-            
-            # 조건 1: 차이가 가장 작은 것
-            if difference < min_difference:
-                min_difference = difference
-                max_over_odds = over_odds
-                best_odds = odds_data
-            # 조건 2: 차이가 같으면 오버 배당률이 더 높은 것
-            elif difference == min_difference and over_odds > max_over_odds:
-                max_over_odds = over_odds
-                best_odds = odds_data
-                
-        except (ValueError, KeyError, TypeError):
-            # 숫자 변환 실패 시 해당 데이터 건너뛰기
-            continue
+            results.append(build_match_row(match_id, match_data, season, select_best=False))
+        except Exception as e:
+            results.append((None, f"처리 실패: {e}"))
+    
+    built = [index for index, (row, _) in enumerate(results) if row is not None]
+    best_lines = find_best_odds_batch([match_over_under(matches[index][1]) for index in built])
+    for index, best_odds in zip(built, best_lines):
+        results[index] = (set_best_odds(results[index][0], best_odds), None)
+    return results
+
+def iter_match_rows(json_file_path, season, chunk_size=COPY_CHUNK_SIZE):
+    """
+    시즌 파일의 경기를 스트리밍으로 읽어 matches 행으로 변환
+    
+    chunk_size개 경기마다 build_match_rows로 기준점을 한 번에 고른다.
+    
+    Yields:
+        tuple: (match_id, match_data, row, reason) - 검증 실패 시 row는 None
+    """
+    chunk = []
+    for match in iter_matches(json_file_path):
+        chunk.append(match)
+        if len(chunk) >= chunk_size:
+            for (match_id, match_data), (row, reason) in zip(chunk, build_match_rows(chunk, season)):
+                yield match_id, match_data, row, reason
+            chunk = []
+    if chunk:
+        for (match_id, match_data), (row, reason) in zip(chunk, build_match_rows(chunk, season)):
+            yield match_id, match_data, row, reason
+
+class RejectFile:
+    """검증/삽입에 실패한 경기를 JSONL 파일에 한 줄씩 기록 (첫 기록 시 파일 생성)"""
+    
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = None
     
-    return best_odds
+    def write(self, match_id, reason, match_data):
+        if self._file is None:
+            self._file = open(self.path, 'w', encoding='utf-8')
+        self._file.write(json.dumps({
+            'match_id': match_id,
+            'reason': reason,
+            'data': match_data
+        }, ensure_ascii=False, default=str) + '\n')
+        self.count += 1
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            print(f"📝 거부된 경기 {self.count}개 기록: {self.path}")
 
-def insert_matches_from_json(json_file_path):
-    """JSON 파일에서 경기 데이터를 읽어서 matches 테이블에 삽입"""
+def insert_matches_from_json(json_file_path, conn=None, manifest=None):
+    """
+    JSON 파일에서 경기 데이터를 읽어서 matches 테이블에 삽입
+    
+    Args:
+        conn: 재사용할 DB 연결 (없으면 새로 연결 후 종료)
+        manifest: IngestManifest - 주어지면 해시가 바뀌지 않은 경기는 건너뜀
+    
+    Returns:
+        dict: 삽입 통계 (실패 시 False)
+    """
     
     # 파일명에서 season 추출
     season = extract_season_from_filename(json_file_path)
     print(f"🎯 추출된 season: {season}")
     
     # 데이터베이스 연결
-    conn = connect_to_db()
-    if not conn:
-        return False
+    own_conn = conn is None
+    if own_conn:
+        conn = connect_to_db()
+        if not conn:
+            return False
     
     try:
         cursor = conn.cursor()
         
-        # JSON 파일 읽기
+        # JSON 파일 스트리밍 읽기
         print(f"📁 JSON 파일 읽는 중: {json_file_path}")
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        print(f"📊 총 {len(data)}개 경기 데이터 발견")
         
         # 삽입 통계
+        total_count = 0
         inserted_count = 0
+        unchanged_count = 0
         skipped_count = 0
         error_count = 0
         
+        # 이전 적재 시 해시 (변경 없는 경기 건너뛰기용)
+        known_hashes = manifest.load(MANIFEST_STAGE, season, cursor) if manifest else {}
+        committed_hashes = []
+        
         # 각 경기 데이터 처리 (개별 트랜잭션으로 처리)
-        for match_id, match_data in data.items():
+        for match_id, match_data, row, reason in iter_match_rows(json_file_path, season):
+            total_count += 1
             try:
-                # 필수 데이터 확인
-                if not all(key in match_data for key in ['date', 'home', 'away']):
-                    print(f"⚠️ 필수 데이터 누락: {match_id}")
-                    skipped_count += 1
-                    continue
-                
-                # 경기 시간 파싱
-                match_time = parse_match_time(match_data['date'])
-                if not match_time:
+                if row is None:
+                    print(f"⚠️ {reason}: {match_id}")
                     skipped_count += 1
                     continue
                 
-                # 팀 정보 추출
-                home_team_id = match_data['home'].get('id')
-                away_team_id = match_data['away'].get('id')
-                
-                if not home_team_id or not away_team_id:
-                    print(f"⚠️ 팀 ID 누락: {match_id}")
-                    skipped_count += 1
+                digest = payload_hash(row)
+                if known_hashes.get(match_id) == digest:
+                    unchanged_count += 1
                     continue
                 
-                # 경기 상태 추출
-                status = match_data.get('status', 'Unknown')
-                
-                # match_link 추출
-                match_link = match_data.get('match_link')
-                
-                # 점수 추출 (result 객체에서)
-                home_score = None
-                away_score = None
-                if 'result' in match_data and match_data['result']:
-                    result = match_data['result']
-                    if 'home' in result and 'away' in result:
-                        # status가 없을 때 result가 이상하게 저장되는 문제 해결
-                        try:
-                            home_score = int(result['home']) if result['home'].isdigit() else None
-                            away_score = int(result['away']) if result['away'].isdigit() else None
-                        except (ValueError, AttributeError):
-                            # 숫자가 아닌 값이면 None으로 설정
-                            home_score = None
-                            away_score = None
-                
-                # 최적 배당률 추출 (odds에서)
-                best_benchmark = None
-                best_over_odds = None
-                best_under_odds = None
-                
-                if 'odds' in match_data and match_data['odds'] and 'over-under' in match_data['odds']:
-                    over_under_odds = match_data['odds']['over-under']
-                    if over_under_odds and len(over_under_odds) > 0:
-                        best_odds = find_best_odds(over_under_odds)
-                        if best_odds:
-                            best_benchmark = best_odds['handicap']
-                            best_over_odds = best_odds['average']['over']
-                            best_under_odds = best_odds['average']['under']
-                
                 # 개별 트랜잭션으로 처리
                 try:
                     cursor.execute("BEGIN;")
@@ -216,23 +301,11 @@ def insert_matches_from_json(json_file_path):
                         best_under_odds = EXCLUDED.best_under_odds
                     """
                     
-                    cursor.execute(insert_query, (
-                        match_id,
-                        match_link,
-                        match_time,
-                        status,
-                        home_team_id,
-                        away_team_id,
-                        home_score,
-                        away_score,
-                        season,
-                        best_benchmark,
-                        best_over_odds,
-                        best_under_odds
-                    ))
+                    cursor.execute(insert_query, row)
                     
                     cursor.execute("COMMIT;")
                     inserted_count += 1
+                    committed_hashes.append((match_id, digest))
                     
                     # 진행 상황 출력 (100개마다)
                     if inserted_count % 100 == 0:
@@ -249,30 +322,225 @@ def insert_matches_from_json(json_file_path):
                 error_count += 1
                 continue
         
+        if manifest:
+            manifest.mark(MANIFEST_STAGE, season, committed_hashes)
+        
         # 결과 출력
         print(f"\n📊 삽입 완료!")
         print(f"  ✅ 성공: {inserted_count}개")
+        if manifest:
+            print(f"  💤 변경 없음: {unchanged_count}개")
+        print(f"  ⚠️ 건너뜀: {skipped_count}개")
+        print(f"  ❌ 오류: {error_count}개")
+        print(f"  📈 총 처리: {total_count}개")
+        
+        return {
+            'matches': total_count,
+            'inserted': inserted_count,
+            'updated': 0,
+            'unchanged': unchanged_count,
+            'skipped': skipped_count,
+            'errors': error_count
+        }
+        
+    except Exception as e:
+        print(f"❌ 데이터 삽입 중 오류: {e}")
+        return False
+        
+    finally:
+        cursor.close()
+        if own_conn:
+            release_connection(conn)
+            print("🔌 데이터베이스 연결 종료")
+
+def copy_rows(cursor, table_name, columns, rows):
+    """행 목록을 CSV로 직렬화하여 COPY로 한 번에 전송"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(['\\N' if value is None else value for value in row])
+    buffer.seek(0)
+    cursor.copy_expert(
+        f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+        buffer
+    )
+
+def insert_matches_bulk(json_file_path, reject_file_path=None, copy_chunk_size=COPY_CHUNK_SIZE, conn=None, manifest=None):
+    """
+    JSON 파일의 경기 데이터를 COPY + 단일 upsert로 일괄 삽입
+    
+    모든 행을 임시 스테이징 테이블에 COPY한 뒤 한 번의 INSERT ... ON CONFLICT로
+    matches에 병합한다. 검증에 실패하거나 teams에 없는 팀을 참조하는 경기는
+    배치를 중단하지 않고 reject 파일(JSONL)에 기록한다.
+    
+    Args:
+        conn: 재사용할 DB 연결 (없으면 새로 연결 후 종료)
+        manifest: IngestManifest - 주어지면 해시가 바뀌지 않은 경기는 건너뜀
+    
+    Returns:
+        dict: 삽입 통계 (실패 시 False)
+    """
+    
+    # 파일명에서 season 추출
+    season = extract_season_from_filename(json_file_path)
+    print(f"🎯 추출된 season: {season}")
+    
+    if reject_file_path is None:
+        reject_file_path = f"{json_file_path}.rejects.jsonl"
+    rejects = RejectFile(reject_file_path)
+    
+    # 데이터베이스 연결
+    own_conn = conn is None
+    if own_conn:
+        conn = connect_to_db()
+        if not conn:
+            return False
+    
+    try:
+        cursor = conn.cursor()
+        
+        print(f"📁 JSON 파일 읽는 중: {json_file_path}")
+        
+        total_count = 0
+        staged_count = 0
+        unchanged_count = 0
+        skipped_count = 0
+        inserted_count = 0
+        updated_count = 0
+        error_count = 0
+        
+        # 이전 적재 시 해시 (변경 없는 경기 건너뛰기용)
+        known_hashes = manifest.load(MANIFEST_STAGE, season, cursor) if manifest else {}
+        staged_hashes = {}
+        
+        try:
+            cursor.execute("BEGIN;")
+            
+            # 1. 트랜잭션 범위의 스테이징 테이블 (pooler 트랜잭션 모드에서도 안전)
+            cursor.execute("""
+                CREATE TEMP TABLE matches_staging
+                (LIKE matches INCLUDING DEFAULTS)
+                ON COMMIT DROP
+            """)
+            
+            # 2. 스트리밍으로 행 변환 후 청크 단위 COPY (검증 실패는 reject 파일로)
+            rows = []
+            for match_id, match_data, row, reason in iter_match_rows(json_file_path, season, copy_chunk_size):
+                total_count += 1
+                if row is None:
+                    rejects.write(match_id, reason, match_data)
+                    skipped_count += 1
+                    continue
+                
+                digest = payload_hash(row)
+                if known_hashes.get(match_id) == digest:
+                    unchanged_count += 1
+                    continue
+                staged_hashes[match_id] = digest
+                
+                rows.append(row)
+                if len(rows) >= copy_chunk_size:
+                    copy_rows(cursor, 'matches_staging', MATCH_COLUMNS, rows)
+                    staged_count += len(rows)
+                    rows = []
+            
+            if rows:
+                copy_rows(cursor, 'matches_staging', MATCH_COLUMNS, rows)
+                staged_count += len(rows)
+            print(f"📤 스테이징 테이블에 {staged_count}개 행 COPY 완료")
+            
+            # 3. 팀이 존재하지 않아 FK 위반이 될 행은 병합 전에 분리
+            cursor.execute(f"""
+                DELETE FROM matches_staging s
+                WHERE NOT EXISTS (SELECT 1 FROM teams t WHERE t.team_id = s.home_team_id)
+                   OR NOT EXISTS (SELECT 1 FROM teams t WHERE t.team_id = s.away_team_id)
+                RETURNING {', '.join('s.' + column for column in MATCH_COLUMNS)}
+            """)
+            for row in cursor.fetchall():
+                rejects.write(row[0], "teams 테이블에 없는 팀 ID", dict(zip(MATCH_COLUMNS, row)))
+                staged_hashes.pop(row[0], None)
+                error_count += 1
+            
+            # 4. 단일 set 기반 upsert
+            cursor.execute(f"""
+                WITH upserted AS (
+                    INSERT INTO matches ({', '.join(MATCH_COLUMNS)})
+                    SELECT {', '.join(MATCH_COLUMNS)} FROM matches_staging
+                    ON CONFLICT (id) DO UPDATE SET
+                        match_link = EXCLUDED.match_link,
+                        match_time = EXCLUDED.match_time,
+                        status = EXCLUDED.status,
+                        home_team_id = EXCLUDED.home_team_id,
+                        away_team_id = EXCLUDED.away_team_id,
+                        home_score = EXCLUDED.home_score,
+                        away_score = EXCLUDED.away_score,
+                        season = EXCLUDED.season,
+                        best_benchmark = EXCLUDED.best_benchmark,
+                        best_over_odds = EXCLUDED.best_over_odds,
+                        best_under_odds = EXCLUDED.best_under_odds
+                    RETURNING (xmax = 0) AS inserted
+                )
+                SELECT
+                    COUNT(*) FILTER (WHERE inserted),
+                    COUNT(*) FILTER (WHERE NOT inserted)
+                FROM upserted
+            """)
+            inserted_count, updated_count = cursor.fetchone()
+            
+            cursor.execute("COMMIT;")
+            
+            if manifest:
+                manifest.mark(MANIFEST_STAGE, season, staged_hashes.items())
+            
+        except Exception as db_error:
+            cursor.execute("ROLLBACK;")
+            print(f"❌ 일괄 삽입 실패: {db_error}")
+            return False
+        
+        # 결과 출력
+        print(f"\n📊 일괄 삽입 완료!")
+        print(f"  ✅ 성공: {inserted_count + updated_count}개 (신규 {inserted_count}개, 갱신 {updated_count}개)")
+        if manifest:
+            print(f"  💤 변경 없음: {unchanged_count}개")
         print(f"  ⚠️ 건너뜀: {skipped_count}개")
         print(f"  ❌ 오류: {error_count}개")
-        print(f"  📈 총 처리: {len(data)}개")
+        print(f"  📈 총 처리: {total_count}개")
         
-        return True
+        return {
+            'matches': total_count,
+            'inserted': inserted_count,
+            'updated': updated_count,
+            'unchanged': unchanged_count,
+            'skipped': skipped_count,
+            'errors': error_count
+        }
         
     except Exception as e:
         print(f"❌ 데이터 삽입 중 오류: {e}")
         return False
         
     finally:
+        rejects.close()
         cursor.close()
-        conn.close()
-        print("🔌 데이터베이스 연결 종료")
+        if own_conn:
+            release_connection(conn)
+            print("🔌 데이터베이스 연결 종료")
 
 def main():
     """메인 함수"""
     
+    # 옵션 분리: --bulk (COPY 일괄 모드), --full (매니페스트 무시), --reject-file=<path>
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    bulk_mode = '--bulk' in sys.argv[1:]
+    full_mode = '--full' in sys.argv[1:]
+    reject_file = None
+    for arg in sys.argv[1:]:
+        if arg.startswith('--reject-file='):
+            reject_file = arg.split('=', 1)[1]
+    
     # JSON 파일 경로 확인
-    if len(sys.argv) > 1:
-        json_file = sys.argv[1]
+    if len(args) > 0:
+        json_file = args[0]
     else:
         # 기본 파일 경로들 시도
         possible_files = [
@@ -289,7 +557,7 @@ def main():
         
         if not json_file:
             print("❌ JSON 파일을 찾을 수 없습니다.")
-            print("사용법: python insert_matches.py <json_file_path>")
+            print("사용법: python insert_matches.py <json_file_path> [--bulk] [--full] [--reject-file=<path>]")
             print("또는 src/data/ 폴더에 JSON 파일을 넣어주세요.")
             return
     
@@ -300,8 +568,20 @@ def main():
     print(f"🚀 경기 데이터 삽입 시작")
     print(f"📁 파일: {json_file}")
     
+    # 변경된 경기만 쓰도록 매니페스트 사용 (--full이면 전체 재적재)
+    manifest = IngestManifest()
+    if full_mode:
+        manifest.forget(MANIFEST_STAGE, extract_season_from_filename(json_file))
+    
     # 데이터 삽입 실행
-    success = insert_matches_from_json(json_file)
+    try:
+        if bulk_mode:
+            print("⚡ 일괄(COPY) 모드")
+            success = insert_matches_bulk(json_file, reject_file, manifest=manifest)
+        else:
+            success = insert_matches_from_json(json_file, manifest=manifest)
+    finally:
+        manifest.close()
     
     if success:
         print("🎉 모든 작업이 성공적으로 완료되었습니다!")
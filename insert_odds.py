@@ -3,30 +3,24 @@
 Flashscore JSON 데이터에서 배당률 정보를 추출하여 odds 테이블에 삽입하는 스크립트
 """
 
-import json
-import psycopg2
 import os
 import sys
 from decimal import Decimal
 
-# 데이터베이스 설정
-DB_CONFIG = {
-    "host": "aws-1-ap-northeast-2.pooler.supabase.com",
-    "database": "postgres",
-    "user": "postgres.dvwwcmhzlllaukscjuya",
-    "password": "!Qdhdbrclf56",
-    "port": "6543"
-}
+from psycopg2.extras import execute_values
 
-def connect_to_db():
-    """데이터베이스 연결"""
-    try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        print("✅ 데이터베이스 연결 성공")
-        return conn
-    except Exception as e:
-        print(f"❌ 데이터베이스 연결 실패: {e}")
-        return None
+from best_odds import find_best_odds_batch
+from database import connect_to_db, release_connection
+from ingest_manifest import IngestManifest, payload_hash
+from insert_matches import copy_rows, extract_season_from_filename
+from json_stream import iter_matches
+from odds_aggregation import aggregate_odds
+
+# bookmaker_odds 스테이징 테이블 컬럼 (handicap_id는 (match_id, handicap) 조인으로 결정)
+BOOKMAKER_STAGING_COLUMNS = ['match_id', 'handicap', 'bookmaker', 'over_odds', 'under_odds']
+
+# handicap_odds 병합용 스테이징 테이블 컬럼
+HANDICAP_STAGING_COLUMNS = ['match_id', 'handicap', 'avg_over', 'avg_under']
 
 def select_best_odds(bookmakers_data, method='average'):
     """
@@ -91,141 +85,299 @@ def select_best_odds(bookmakers_data, method='average'):
         # 기본값: 평균
         return select_best_odds(bookmakers_data, 'average')
 
-def insert_odds_from_json(json_file_path, odds_method='average', batch_size=100):
-    """JSON 파일에서 배당률 정보 추출하여 삽입 (배치 처리)"""
+def validate_over_under(over_under_odds):
+    """
+    over-under 배당률 구조 검사
+
+    배치 계산(build_odds_rows_batch, aggregate_odds)은 한 경기라도 구조가 잘못되면 배치 전체가 실패하므로
+    배치에 넣기 전에 경기 단위로 걸러낸다.
+
+    Returns:
+        str: 잘못된 구조의 사유 (정상이면 None)
+    """
+    if not isinstance(over_under_odds, list):
+        return "over-under가 리스트가 아님"
+    for handicap_data in over_under_odds:
+        if not isinstance(handicap_data, dict):
+            return "핸디캡 항목이 객체가 아님"
+        bookmakers = handicap_data.get('bookmakers', [])
+        if not isinstance(bookmakers, list):
+            return "bookmakers가 리스트가 아님"
+        if not all(isinstance(bookmaker, dict) for bookmaker in bookmakers):
+            return "북메이커 항목이 객체가 아님"
+        average = handicap_data.get('average')
+        if average and not isinstance(average, dict):
+            return "average가 객체가 아님"
+    return None
+
+def build_odds_rows(match_id, over_under_odds, odds_method='average'):
+    """
+    한 경기의 over-under 배당률을 odds_metadata / handicap_odds 행으로 변환
+    
+    Returns:
+        tuple: (metadata 행, handicap_odds 행 리스트, 기준점 라인 또는 None)
+    """
+    return build_odds_rows_batch([(match_id, over_under_odds)], odds_method)[0]
+
+def build_odds_rows_batch(matches_odds, odds_method='average'):
+    """
+    여러 경기의 over-under 배당률을 한 번에 odds_metadata / handicap_odds 행으로 변환
+    
+    북메이커별 대표값은 odds_aggregation으로, 경기별 기준점(matches.best_*)은
+    find_best_odds_batch로 배치 전체를 한 번에 계산한다.
+    
+    Args:
+        matches_odds: (match_id, over_under_odds) 리스트 - validate_over_under를 통과한 경기만
+    
+    Returns:
+        list: 경기 순서대로 (metadata 행, handicap_odds 행 리스트, 기준점 라인 또는 None)
+    """
+    # 핸디캡 값이 유효한 라인만 대표값 계산 대상
+    lines = []
+    for match_index, (match_id, over_under_odds) in enumerate(matches_odds):
+        for handicap_data in over_under_odds:
+            handicap = handicap_data.get('handicap')
+            if not handicap:
+                continue
+            
+            try:
+                handicap_value = float(handicap.replace(',', '.'))
+            except (ValueError, AttributeError):
+                continue
+            lines.append((match_index, handicap_value, handicap_data))
+    
+    # 북메이커별 배당률에서 대표값 선택
+    selected = aggregate_odds(
+        [handicap_data.get('bookmakers', []) for _, _, handicap_data in lines],
+        odds_method
+    )
+    
+    # 경기별 기준점 라인 선택
+    best_lines = find_best_odds_batch([over_under_odds for _, over_under_odds in matches_odds])
+    
+    results = []
+    for (match_id, over_under_odds), best_line in zip(matches_odds, best_lines):
+        # 메타데이터 준비
+        bookmaker_count = sum(len(handicap.get('bookmakers', [])) for handicap in over_under_odds)
+        handicap_count = len(over_under_odds)
+        results.append(((match_id, bookmaker_count, handicap_count, 'flashscore'), [], best_line))
+    
+    # 각 핸디캡별 배당률 처리
+    for (match_index, handicap_value, handicap_data), (selected_over, selected_under) in zip(lines, selected):
+        # JSON에 average가 있으면 그것을 우선 사용
+        if 'average' in handicap_data and handicap_data['average']:
+            try:
+                avg_over = float(handicap_data['average'].get('over', 0)) if handicap_data['average'].get('over') else selected_over
+                avg_under = float(handicap_data['average'].get('under', 0)) if handicap_data['average'].get('under') else selected_under
+            except (ValueError, TypeError):
+                avg_over, avg_under = selected_over, selected_under
+        else:
+            avg_over, avg_under = selected_over, selected_under
+        
+        # 배치에 추가
+        if avg_over and avg_under:
+            match_id = matches_odds[match_index][0]
+            results[match_index][1].append((match_id, handicap_value, avg_over, avg_under))
+    
+    return results
+
+def _parse_odds_value(value):
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+def build_bookmaker_rows(match_id, over_under_odds):
+    """
+    한 경기의 over-under 배당률을 북메이커별 행으로 변환
+    
+    Returns:
+        list: (match_id, handicap, bookmaker, over_odds, under_odds) 행 리스트
+    """
+    rows = {}
+    for handicap_data in over_under_odds:
+        try:
+            handicap_value = float(handicap_data.get('handicap').replace(',', '.'))
+        except (ValueError, AttributeError):
+            continue
+        
+        for bookmaker in handicap_data.get('bookmakers') or []:
+            name = bookmaker.get('bookmaker')
+            if not name:
+                continue
+            # 같은 (핸디캡, 북메이커)가 중복되면 첫 번째 값을 사용
+            rows.setdefault((handicap_value, name), (
+                match_id,
+                handicap_value,
+                name,
+                _parse_odds_value(bookmaker.get('over')),
+                _parse_odds_value(bookmaker.get('under'))
+            ))
+    return list(rows.values())
+
+def insert_odds_from_json(json_file_path, odds_method='average', batch_size=100, conn=None, manifest=None):
+    """
+    JSON 파일에서 배당률 정보 추출하여 삽입 (배치 처리)
+    
+    Args:
+        conn: 재사용할 DB 연결 (없으면 새로 연결 후 종료)
+        manifest: IngestManifest - 주어지면 배당률이 바뀌지 않은 경기는 건너뜀
+    
+    Returns:
+        dict: 삽입 통계 (실패 시 False)
+    """
+    
+    season = extract_season_from_filename(json_file_path)
+    manifest_stage = 'odds'
     
     # 데이터베이스 연결
-    conn = connect_to_db()
-    if not conn:
-        return False
+    own_conn = conn is None
+    if own_conn:
+        conn = connect_to_db()
+        if not conn:
+            return False
     
     try:
         cursor = conn.cursor()
         
-        # JSON 파일 읽기
+        # JSON 파일 스트리밍 읽기
         print(f"📁 JSON 파일 읽는 중: {json_file_path}")
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
         
-        total_matches = len(data)
+        total_matches = 0
         processed_matches = 0
-        inserted_handicaps = 0
+        # 핸디캡 라인 삽입/갱신/삭제 수와 변경된 북메이커 배당률 수
+        changes = {'inserted': 0, 'updated': 0, 'deleted': 0, 'bookmakers': 0}
         skipped_matches = 0
+        failed_matches = 0
+        missing_matches = 0
+        unchanged_matches = 0
         
-        print(f"📊 총 {total_matches}개 경기 처리 시작...")
+        # 이전 적재 시 해시 (변경 없는 경기 건너뛰기용)
+        known_hashes = manifest.load(manifest_stage, season, cursor) if manifest else {}
+        batch_hashes = {}
+        
+        print(f"📊 경기 처리 시작...")
         print(f"🎯 배당률 선택 방법: {odds_method}")
         print(f"🔄 배치 크기: {batch_size}개 경기씩 처리")
         
-        # matches 테이블에 존재하는 match_id들을 한 번에 확인 (성능 최적화)
-        print(f"🔍 matches 테이블에서 경기 ID 확인 중...")
-        all_match_ids = list(data.keys())
-        cursor.execute(
-            "SELECT id FROM matches WHERE id = ANY(%s)",
-            (all_match_ids,)
-        )
-        existing_match_ids = set(row[0] for row in cursor.fetchall())
-        print(f"✅ {len(existing_match_ids)}/{len(all_match_ids)}개 경기가 matches 테이블에 존재")
-        
         # 배치 단위로 데이터 준비
         metadata_batch = []
         handicap_batch = []
-        match_ids_to_delete = []
+        bookmaker_batch = []
+        batch_match_ids = []
         
-        batch_count = 0
+        # 대표 배당률 계산을 기다리는 경기 (배치 단위로 한 번에 계산)
+        pending_odds = []
         
-        for match_id, match_data in data.items():
-            try:
-                # matches 테이블에 존재하는지 확인
-                if match_id not in existing_match_ids:
-                    skipped_matches += 1
-                    continue
-                
-                # odds 데이터 확인
-                if 'odds' not in match_data or match_data['odds'] is None or 'over-under' not in match_data['odds']:
-                    skipped_matches += 1
+        def flush():
+            nonlocal processed_matches, missing_matches
+            nonlocal metadata_batch, handicap_batch, bookmaker_batch, batch_match_ids, batch_hashes
+            
+            written_match_ids, batch_changes = _flush_batch(
+                cursor, metadata_batch, handicap_batch, bookmaker_batch, batch_match_ids
+            )
+            if manifest:
+                manifest.mark(manifest_stage, season, [(written_id, batch_hashes[written_id]) for written_id in written_match_ids])
+            
+            processed_matches += len(written_match_ids)
+            for key, count in batch_changes.items():
+                changes[key] += count
+            missing_matches += len(batch_match_ids) - len(written_match_ids)
+            
+            print(f"📊 진행상황: {total_matches}개 경기 읽음, {processed_matches}개 처리 완료 (핸디캡 삽입 {changes['inserted']}개, 갱신 {changes['updated']}개)")
+            
+            # 배치 초기화
+            metadata_batch = []
+            handicap_batch = []
+            bookmaker_batch = []
+            batch_match_ids = []
+            batch_hashes = {}
+        
+        def prepare_pending():
+            nonlocal unchanged_matches, failed_matches
+            
+            for (match_id, over_under_odds), (metadata, match_handicaps, _) in zip(
+                pending_odds, build_odds_rows_batch(pending_odds, odds_method)
+            ):
+                try:
+                    match_bookmakers = build_bookmaker_rows(match_id, over_under_odds)
+                except Exception as e:
+                    print(f"⚠️ 경기 {match_id} 처리 실패 (배치에서 제외): {e}")
+                    failed_matches += 1
                     continue
                 
-                over_under_odds = match_data['odds']['over-under']
-                if not over_under_odds:
-                    skipped_matches += 1
+                # 정규화된 행이 이전 적재와 같으면 DB 작업 없이 건너뜀 (선택 방법이 바뀌면 다시 씀)
+                digest = payload_hash([odds_method, metadata, match_handicaps, match_bookmakers])
+                if known_hashes.get(match_id) == digest:
+                    unchanged_matches += 1
                     continue
+                batch_hashes[match_id] = digest
                 
-                # 메타데이터 준비
-                bookmaker_count = sum(len(handicap.get('bookmakers', [])) for handicap in over_under_odds)
-                handicap_count = len(over_under_odds)
-                metadata_batch.append((match_id, bookmaker_count, handicap_count, 'flashscore'))
-                
-                # 삭제할 match_id 목록에 추가
-                match_ids_to_delete.append(match_id)
-                
-                # 각 핸디캡별 배당률 처리
-                for handicap_data in over_under_odds:
-                    handicap = handicap_data.get('handicap')
-                    if not handicap:
-                        continue
-                    
-                    try:
-                        handicap_value = float(handicap.replace(',', '.'))
-                    except (ValueError, AttributeError):
-                        continue
-                    
-                    # 북메이커별 배당률에서 대표값 선택
-                    bookmakers = handicap_data.get('bookmakers', [])
-                    selected_over, selected_under = select_best_odds(bookmakers, odds_method)
-                    
-                    # JSON에 average가 있으면 그것을 우선 사용
-                    if 'average' in handicap_data and handicap_data['average']:
-                        try:
-                            avg_over = float(handicap_data['average'].get('over', 0)) if handicap_data['average'].get('over') else selected_over
-                            avg_under = float(handicap_data['average'].get('under', 0)) if handicap_data['average'].get('under') else selected_under
-                        except (ValueError, TypeError):
-                            avg_over, avg_under = selected_over, selected_under
-                    else:
-                        avg_over, avg_under = selected_over, selected_under
-                    
-                    # 배치에 추가
-                    if avg_over and avg_under:
-                        handicap_batch.append((match_id, handicap_value, avg_over, avg_under))
-                
-                batch_count += 1
+                metadata_batch.append(metadata)
+                handicap_batch.extend(match_handicaps)
+                bookmaker_batch.extend(match_bookmakers)
                 
-                # 배치 크기에 도달하면 DB에 삽입
-                if batch_count >= batch_size:
-                    _execute_batch_insert(cursor, metadata_batch, handicap_batch, match_ids_to_delete)
-                    
-                    processed_matches += batch_count
-                    inserted_handicaps += len(handicap_batch)
-                    
-                    print(f"📊 진행상황: {processed_matches}/{total_matches} 경기 처리 완료 (핸디캡 {inserted_handicaps}개)")
-                    
-                    # 배치 초기화
-                    metadata_batch = []
-                    handicap_batch = []
-                    match_ids_to_delete = []
-                    batch_count = 0
-                
-            except Exception as e:
-                print(f"⚠️ 경기 {match_id} 처리 실패 (배치에서 제외): {e}")
+                # 병합 대상 match_id 목록에 추가
+                batch_match_ids.append(match_id)
+            pending_odds.clear()
+        
+        for match_id, match_data in iter_matches(json_file_path):
+            total_matches += 1
+            
+            # odds 데이터 확인
+            odds = match_data.get('odds')
+            if not isinstance(odds, dict) or not odds.get('over-under'):
                 skipped_matches += 1
                 continue
+            
+            # 구조가 잘못된 경기는 배치 계산 전에 제외 (배치 전체가 실패하지 않도록)
+            over_under_odds = odds['over-under']
+            reason = validate_over_under(over_under_odds)
+            if reason:
+                print(f"⚠️ 경기 {match_id} 처리 실패 (배치에서 제외): {reason}")
+                failed_matches += 1
+                continue
+            
+            pending_odds.append((match_id, over_under_odds))
+            
+            # 배치 크기에 도달하면 대표값 계산 후 DB에 삽입
+            if len(pending_odds) >= batch_size:
+                prepare_pending()
+                if len(batch_match_ids) >= batch_size:
+                    flush()
         
         # 남은 데이터 삽입
-        if batch_count > 0:
-            _execute_batch_insert(cursor, metadata_batch, handicap_batch, match_ids_to_delete)
-            processed_matches += batch_count
-            inserted_handicaps += len(handicap_batch)
+        if pending_odds:
+            prepare_pending()
+        if batch_match_ids:
+            flush()
+        
+        # matches 테이블에 없는 경기도 스킵으로 집계
+        skipped_matches += missing_matches
         
         print(f"\n📊 배당률 삽입 완료!")
         print(f"  ✅ 처리된 경기: {processed_matches}개")
-        print(f"  📈 삽입된 핸디캡: {inserted_handicaps}개")
+        print(f"  📈 핸디캡 라인: 삽입 {changes['inserted']}개, 갱신 {changes['updated']}개, 삭제 {changes['deleted']}개")
+        print(f"  📈 변경된 북메이커 배당률: {changes['bookmakers']}개")
+        if manifest:
+            print(f"  💤 변경 없음: {unchanged_matches}개")
         print(f"  ⚠️ 스킵된 경기: {skipped_matches}개")
+        print(f"  ❌ 처리 실패: {failed_matches}개")
         
         # matches 테이블에 없는 경기 개수
-        missing_matches = len(all_match_ids) - len(existing_match_ids)
         if missing_matches > 0:
             print(f"  ℹ️ matches 테이블에 없는 경기: {missing_matches}개 (먼저 insert_matches.py 실행 필요)")
         
-        return True
+        return {
+            'matches': total_matches,
+            'processed': processed_matches,
+            'handicaps': changes['inserted'] + changes['updated'],
+            'handicaps_deleted': changes['deleted'],
+            'bookmakers': changes['bookmakers'],
+            'unchanged': unchanged_matches,
+            'skipped': skipped_matches,
+            'failed': failed_matches
+        }
         
     except Exception as e:
         print(f"❌ 배당률 데이터 처리 중 오류: {e}")
@@ -235,65 +387,227 @@ def insert_odds_from_json(json_file_path, odds_method='average', batch_size=100)
         
     finally:
         cursor.close()
-        conn.close()
-        print("🔌 데이터베이스 연결 종료")
+        if own_conn:
+            release_connection(conn)
+            print("🔌 데이터베이스 연결 종료")
+
+def _flush_batch(cursor, metadata_batch, handicap_batch, bookmaker_batch, batch_match_ids):
+    """
+    matches 테이블에 존재하는 경기만 남겨서 배치 삽입
+    
+    Returns:
+        tuple: (삽입된 경기 ID 목록, write_odds_batch 변경 통계)
+    """
+    cursor.execute(
+        "SELECT id FROM matches WHERE id = ANY(%s)",
+        (batch_match_ids,)
+    )
+    existing_match_ids = set(row[0] for row in cursor.fetchall())
+    
+    metadata_batch = [row for row in metadata_batch if row[0] in existing_match_ids]
+    handicap_batch = [row for row in handicap_batch if row[0] in existing_match_ids]
+    bookmaker_batch = [row for row in bookmaker_batch if row[0] in existing_match_ids]
+    batch_match_ids = [match_id for match_id in batch_match_ids if match_id in existing_match_ids]
+    
+    changes = {'inserted': 0, 'updated': 0, 'deleted': 0, 'bookmakers': 0}
+    if batch_match_ids:
+        changes = _execute_batch_insert(cursor, metadata_batch, handicap_batch, bookmaker_batch, batch_match_ids)
+    
+    return batch_match_ids, changes
 
-def _execute_batch_insert(cursor, metadata_batch, handicap_batch, match_ids_to_delete):
+def _execute_batch_insert(cursor, metadata_batch, handicap_batch, bookmaker_batch, batch_match_ids):
     """배치 단위로 DB에 삽입 (한 트랜잭션으로)"""
     try:
         cursor.execute("BEGIN;")
-        
-        # 1. 기존 handicap_odds 삭제 (배치)
-        if match_ids_to_delete:
-            cursor.execute(
-                "DELETE FROM handicap_odds WHERE match_id = ANY(%s)",
-                (match_ids_to_delete,)
-            )
-        
-        # 2. 메타데이터 배치 삽입
-        if metadata_batch:
-            from psycopg2.extras import execute_values
-            execute_values(
-                cursor,
-                """
-                INSERT INTO odds_metadata (match_id, bookmaker_count, handicap_count, source)
-                VALUES %s
-                ON CONFLICT (match_id) DO UPDATE SET
-                    bookmaker_count = EXCLUDED.bookmaker_count,
-                    handicap_count = EXCLUDED.handicap_count,
-                    collected_at = NOW()
-                """,
-                metadata_batch
-            )
-        
-        # 3. handicap_odds 배치 삽입
-        if handicap_batch:
-            from psycopg2.extras import execute_values
-            execute_values(
-                cursor,
-                """
-                INSERT INTO handicap_odds (match_id, handicap, avg_over, avg_under)
-                VALUES %s
-                ON CONFLICT (match_id, handicap) DO UPDATE SET
-                    avg_over = EXCLUDED.avg_over,
-                    avg_under = EXCLUDED.avg_under
-                """,
-                handicap_batch
-            )
-        
+        changes = write_odds_batch(cursor, metadata_batch, handicap_batch, batch_match_ids, bookmaker_batch)
         cursor.execute("COMMIT;")
+        return changes
         
     except Exception as e:
         cursor.execute("ROLLBACK;")
         print(f"❌ 배치 삽입 실패: {e}")
         raise
 
+def write_odds_batch(cursor, metadata_batch, handicap_batch, match_ids, bookmaker_batch=None):
+    """
+    odds_metadata / handicap_odds / bookmaker_odds 배치 쓰기 (트랜잭션은 호출자가 관리)
+    
+    handicap_odds와 bookmaker_odds는 기존 행과 비교하여 새 라인은 삽입, 배당률이 바뀐 라인만 갱신,
+    사라진 라인만 삭제한다. 쓰기량과 dead tuple이 배치 크기가 아니라 변경량에 비례한다.
+    
+    Args:
+        match_ids: 배치에 포함된 경기 ID (이 경기들의 라인만 삭제 대상)
+        bookmaker_batch: None이면 bookmaker_odds는 건드리지 않음
+    
+    Returns:
+        dict: 삽입/갱신/삭제된 핸디캡 수와 변경된 북메이커 배당률 수
+    """
+    # 1. 메타데이터 배치 삽입
+    if metadata_batch:
+        execute_values(
+            cursor,
+            """
+            INSERT INTO odds_metadata (match_id, bookmaker_count, handicap_count, source)
+            VALUES %s
+            ON CONFLICT (match_id) DO UPDATE SET
+                bookmaker_count = EXCLUDED.bookmaker_count,
+                handicap_count = EXCLUDED.handicap_count,
+                collected_at = NOW()
+            """,
+            metadata_batch
+        )
+    
+    # 2. handicap_odds 병합
+    inserted, updated, deleted = merge_handicap_odds(cursor, handicap_batch, match_ids)
+    
+    # 3. bookmaker_odds 병합
+    bookmakers = 0
+    if bookmaker_batch is not None:
+        bookmakers = load_bookmaker_odds(cursor, bookmaker_batch, match_ids)
+    
+    return {
+        'inserted': inserted,
+        'updated': updated,
+        'deleted': deleted,
+        'bookmakers': bookmakers
+    }
+
+def merge_handicap_odds(cursor, rows, match_ids):
+    """
+    handicap_odds를 들어온 라인과 비교하여 병합
+    
+    Args:
+        rows: (match_id, handicap, avg_over, avg_under) 행 리스트
+        match_ids: 이 경기들 중 rows에 없는 라인은 삭제
+    
+    Returns:
+        tuple: (삽입 수, 갱신 수, 삭제 수)
+    """
+    # 컬럼 타입을 handicap_odds와 맞춰 반올림 후 비교
+    cursor.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS handicap_odds_staging (
+            match_id TEXT,
+            handicap NUMERIC(4, 2),
+            avg_over NUMERIC(8, 2),
+            avg_under NUMERIC(8, 2)
+        ) ON COMMIT DROP
+    """)
+    cursor.execute("TRUNCATE handicap_odds_staging")
+    copy_rows(cursor, 'handicap_odds_staging', HANDICAP_STAGING_COLUMNS, rows)
+    
+    # 1. 사라진 라인 삭제 (연결된 bookmaker_odds는 CASCADE)
+    cursor.execute("""
+        DELETE FROM handicap_odds h
+        WHERE h.match_id = ANY(%s)
+          AND NOT EXISTS (
+              SELECT 1 FROM handicap_odds_staging s
+              WHERE s.match_id = h.match_id AND s.handicap = h.handicap
+          )
+    """, (list(match_ids),))
+    deleted = cursor.rowcount
+    
+    # 2. 배당률이 바뀐 라인만 갱신
+    cursor.execute("""
+        UPDATE handicap_odds h
+        SET avg_over = s.avg_over,
+            avg_under = s.avg_under
+        FROM (
+            SELECT DISTINCT ON (match_id, handicap) match_id, handicap, avg_over, avg_under
+            FROM handicap_odds_staging
+            ORDER BY match_id, handicap
+        ) s
+        WHERE h.match_id = s.match_id
+          AND h.handicap = s.handicap
+          AND (h.avg_over, h.avg_under) IS DISTINCT FROM (s.avg_over, s.avg_under)
+    """)
+    updated = cursor.rowcount
+    
+    # 3. 새 라인 삽입
+    cursor.execute("""
+        INSERT INTO handicap_odds (match_id, handicap, avg_over, avg_under)
+        SELECT DISTINCT ON (s.match_id, s.handicap) s.match_id, s.handicap, s.avg_over, s.avg_under
+        FROM handicap_odds_staging s
+        WHERE NOT EXISTS (
+            SELECT 1 FROM handicap_odds h
+            WHERE h.match_id = s.match_id AND h.handicap = s.handicap
+        )
+        ORDER BY s.match_id, s.handicap
+        ON CONFLICT (match_id, handicap) DO NOTHING
+    """)
+    inserted = cursor.rowcount
+    
+    return inserted, updated, deleted
+
+def load_bookmaker_odds(cursor, rows, match_ids=None):
+    """
+    북메이커별 배당률을 스테이징 테이블에 COPY한 뒤 한 번의 조인 INSERT로 병합
+    
+    handicap_id를 얻기 위해 핸디캡마다 RETURNING 왕복을 하지 않고,
+    (match_id, handicap)으로 handicap_odds와 조인하여 한 번에 결정한다.
+    대표 배당률이 없어 handicap_odds 행이 없는 핸디캡의 북메이커는 조인에서 제외된다.
+    배당률이 같은 기존 행은 갱신하지 않는다. 트랜잭션은 호출자가 관리한다.
+    
+    Args:
+        rows: (match_id, handicap, bookmaker, over_odds, under_odds) 행 리스트
+        match_ids: 주어지면 이 경기들의 북메이커 중 rows에 없는 것은 삭제
+    
+    Returns:
+        int: 삽입/갱신/삭제된 bookmaker_odds 행 수
+    """
+    # 트랜잭션 종료 시 자동 삭제 (트랜잭션 모드 풀러에서도 안전)
+    cursor.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS bookmaker_odds_staging (
+            match_id TEXT,
+            handicap NUMERIC(4, 2),
+            bookmaker TEXT,
+            over_odds NUMERIC(8, 2),
+            under_odds NUMERIC(8, 2)
+        ) ON COMMIT DROP
+    """)
+    cursor.execute("TRUNCATE bookmaker_odds_staging")
+    copy_rows(cursor, 'bookmaker_odds_staging', BOOKMAKER_STAGING_COLUMNS, rows)
+    
+    changed = 0
+    if match_ids:
+        cursor.execute("""
+            DELETE FROM bookmaker_odds b
+            USING handicap_odds h
+            WHERE b.handicap_id = h.id
+              AND h.match_id = ANY(%s)
+              AND NOT EXISTS (
+                  SELECT 1 FROM bookmaker_odds_staging s
+                  WHERE s.match_id = h.match_id
+                    AND s.handicap = h.handicap
+                    AND s.bookmaker = b.bookmaker
+              )
+        """, (list(match_ids),))
+        changed += cursor.rowcount
+    
+    cursor.execute("""
+        INSERT INTO bookmaker_odds (handicap_id, bookmaker, over_odds, under_odds)
+        SELECT DISTINCT ON (h.id, s.bookmaker) h.id, s.bookmaker, s.over_odds, s.under_odds
+        FROM bookmaker_odds_staging s
+        JOIN handicap_odds h ON h.match_id = s.match_id AND h.handicap = s.handicap
+        ORDER BY h.id, s.bookmaker
+        ON CONFLICT (handicap_id, bookmaker) DO UPDATE SET
+            over_odds = EXCLUDED.over_odds,
+            under_odds = EXCLUDED.under_odds
+        WHERE (bookmaker_odds.over_odds, bookmaker_odds.under_odds)
+              IS DISTINCT FROM (EXCLUDED.over_odds, EXCLUDED.under_odds)
+    """)
+    changed += cursor.rowcount
+    return changed
+
 def main():
     """메인 함수"""
     
+    # 옵션 분리: --full (매니페스트 무시하고 전체 재적재)
+    full_mode = '--full' in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    
     # 인자 확인
-    if len(sys.argv) < 2:
-        print("사용법: python insert_odds.py <json_file_path> [odds_method] [batch_size]")
+    if len(args) < 1:
+        print("사용법: python insert_odds.py <json_file_path> [odds_method] [batch_size] [--full]")
         print("예시: python insert_odds.py src/data/soccer_greece_super-league-2-2025-2026.json average 200")
         print("")
         print("배당률 선택 방법:")
@@ -303,11 +617,12 @@ def main():
         print("  best_under  - 언더 배당률이 가장 높은 것")
         print("")
         print("배치 크기: 한 번에 처리할 경기 수 (기본값: 100)")
+        print("--full: 변경 여부와 관계없이 모든 경기를 다시 삽입")
         return
     
-    json_file_path = sys.argv[1]
-    odds_method = sys.argv[2] if len(sys.argv) > 2 else 'average'
-    batch_size = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+    json_file_path = args[0]
+    odds_method = args[1] if len(args) > 1 else 'average'
+    batch_size = int(args[2]) if len(args) > 2 else 100
     
     # 유효한 방법인지 확인
     valid_methods = ['average', 'median', 'best_over', 'best_under']
@@ -323,7 +638,15 @@ def main():
     print(f"🚀 배당률 삽입 시작: {json_file_path}")
     print(f"⚙️ 설정: odds_method={odds_method}, batch_size={batch_size}")
     
-    success = insert_odds_from_json(json_file_path, odds_method, batch_size)
+    # 변경된 경기만 쓰도록 매니페스트 사용
+    manifest = IngestManifest()
+    if full_mode:
+        manifest.forget('odds', extract_season_from_filename(json_file_path))
+    
+    try:
+        success = insert_odds_from_json(json_file_path, odds_method, batch_size, manifest=manifest)
+    finally:
+        manifest.close()
     
     if success:
         print("🎉 배당률 삽입 성공!")
@@ -3,105 +3,125 @@
 Flashscore JSON 데이터에서 팀 정보를 추출하여 teams 테이블에 삽입하는 스크립트
 """
 
-import json
-import psycopg2
+from psycopg2.extras import execute_values
 import os
 import sys
 
-# 데이터베이스 설정
-DB_CONFIG = {
-    "host": "aws-1-ap-northeast-2.pooler.supabase.com",
-    "database": "postgres",
-    "user": "postgres.dvwwcmhzlllaukscjuya",
-    "password": "!Qdhdbrclf56",
-    "port": "6543"
-}
+from database import connect_to_db, release_connection
+from ingest_manifest import IngestManifest
+from json_stream import iter_matches
 
-def connect_to_db():
-    """데이터베이스 연결"""
-    try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        print("✅ 데이터베이스 연결 성공")
-        return conn
-    except Exception as e:
-        print(f"❌ 데이터베이스 연결 실패: {e}")
-        return None
+def extract_match_teams(match_data):
+    """한 경기 데이터에서 (team_id, team, sport_type, nation) 튜플 목록 추출"""
+    teams = []
+    for side in ('home', 'away'):
+        if side in match_data:
+            team = match_data[side]
+            if 'id' in team and 'name' in team:
+                teams.append((
+                    team['id'],
+                    team['name'],
+                    'soccer',  # 기본값
+                    'england'  # 기본값 (파일명에서 추출 가능)
+                ))
+    return teams
+
+def upsert_teams(cursor, teams, known_teams=None):
+    """
+    팀 목록을 한 번의 upsert 문으로 기록 (트랜잭션은 호출자가 관리)
+    
+    Args:
+        teams: (team_id, team, sport_type, nation) 목록
+        known_teams: {team_id: (team, sport_type, nation)} - 같은 값으로 이미 기록된 팀은 보내지 않음
+    
+    Returns:
+        list: 실제로 보낸 팀 행 (없으면 DB에 아무 문장도 보내지 않음)
+    """
+    known_teams = known_teams or {}
+    new_teams = {}
+    for team in teams:
+        if known_teams.get(team[0]) != tuple(team[1:]):
+            new_teams[team[0]] = tuple(team)
+    
+    if not new_teams:
+        return []
+    
+    # 여러 워커가 같은 팀을 갱신할 때 교착을 피하도록 ID 순서로 기록
+    rows = sorted(new_teams.values())
+    execute_values(
+        cursor,
+        """
+        INSERT INTO teams (team_id, team, sport_type, nation)
+        VALUES %s
+        ON CONFLICT (team_id) DO UPDATE SET
+            team = EXCLUDED.team,
+            sport_type = EXCLUDED.sport_type,
+            nation = EXCLUDED.nation
+        """,
+        rows,
+        page_size=len(rows)
+    )
+    return rows
 
-def extract_teams_from_json(json_file_path):
-    """JSON 파일에서 팀 정보 추출"""
+def extract_teams_from_json(json_file_path, conn=None, manifest=None):
+    """
+    JSON 파일에서 팀 정보 추출하여 한 번의 upsert로 삽입
+    
+    Args:
+        conn: 재사용할 DB 연결 (없으면 새로 연결 후 종료)
+        manifest: IngestManifest - 주어지면 이미 DB에 있는 팀은 보내지 않음
+    
+    Returns:
+        dict: 삽입 통계 (실패 시 False)
+    """
     
     # 데이터베이스 연결
-    conn = connect_to_db()
-    if not conn:
-        return False
+    own_conn = conn is None
+    if own_conn:
+        conn = connect_to_db()
+        if not conn:
+            return False
     
     try:
         cursor = conn.cursor()
         
-        # JSON 파일 읽기
+        # JSON 파일 스트리밍 읽기
         print(f"📁 JSON 파일 읽는 중: {json_file_path}")
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
         
-        # 팀 정보 추출
-        teams = set()  # 중복 제거를 위해 set 사용
+        # 팀 정보 추출 (같은 ID는 마지막 값 사용)
+        teams = {}
         
-        for match_id, match_data in data.items():
-            # 홈팀 정보
-            if 'home' in match_data:
-                home_team = match_data['home']
-                if 'id' in home_team and 'name' in home_team:
-                    teams.add((
-                        home_team['id'],
-                        home_team['name'],
-                        'soccer',  # 기본값
-                        'england'  # 기본값 (파일명에서 추출 가능)
-                    ))
-            
-            # 어웨이팀 정보
-            if 'away' in match_data:
-                away_team = match_data['away']
-                if 'id' in away_team and 'name' in away_team:
-                    teams.add((
-                        away_team['id'],
-                        away_team['name'],
-                        'soccer',  # 기본값
-                        'england'  # 기본값
-                    ))
+        for match_id, match_data in iter_matches(json_file_path):
+            for team in extract_match_teams(match_data):
+                teams[team[0]] = team
         
         print(f"📊 총 {len(teams)}개 팀 발견")
         
         # 팀 데이터 삽입
-        inserted_count = 0
-        skipped_count = 0
+        known_teams = manifest.load_teams(cursor) if manifest else {}
+        try:
+            cursor.execute("BEGIN;")
+            written = upsert_teams(cursor, teams.values(), known_teams)
+            cursor.execute("COMMIT;")
+        except Exception as e:
+            cursor.execute("ROLLBACK;")
+            print(f"❌ 팀 삽입 실패: {e}")
+            return False
         
-        for team_id, team_name, sport_type, nation in teams:
-            try:
-                cursor.execute("BEGIN;")
-                
-                insert_query = """
-                INSERT INTO teams (team_id, team, sport_type, nation)
-                VALUES (%s, %s, %s, %s)
-                ON CONFLICT (team_id) DO UPDATE SET
-                    team = EXCLUDED.team,
-                    sport_type = EXCLUDED.sport_type,
-                    nation = EXCLUDED.nation
-                """
-                
-                cursor.execute(insert_query, (team_id, team_name, sport_type, nation))
-                cursor.execute("COMMIT;")
-                inserted_count += 1
-                
-            except Exception as e:
-                cursor.execute("ROLLBACK;")
-                print(f"❌ 팀 {team_name} ({team_id}) 삽입 실패: {e}")
-                skipped_count += 1
+        if manifest:
+            manifest.mark_teams(written)
         
         print(f"\n📊 팀 삽입 완료!")
-        print(f"  ✅ 성공: {inserted_count}개")
-        print(f"  ❌ 실패: {skipped_count}개")
+        print(f"  ✅ 성공: {len(written)}개")
+        if manifest:
+            print(f"  💤 이미 존재: {len(teams) - len(written)}개")
         
-        return True
+        return {
+            'teams': len(teams),
+            'inserted': len(written),
+            'cached': len(teams) - len(written),
+            'errors': 0
+        }
         
     except Exception as e:
         print(f"❌ 팀 데이터 처리 중 오류: {e}")
@@ -109,15 +129,20 @@ def extract_teams_from_json(json_file_path):
         
     finally:
         cursor.close()
-        conn.close()
-        print("🔌 데이터베이스 연결 종료")
+        if own_conn:
+            release_connection(conn)
+            print("🔌 데이터베이스 연결 종료")
 
 def main():
     """메인 함수"""
     
+    # 옵션 분리: --full (팀 캐시 무시하고 전체 전송)
+    full_mode = '--full' in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    
     # JSON 파일 경로 확인
-    if len(sys.argv) > 1:
-        json_file = sys.argv[1]
+    if len(args) > 0:
+        json_file = args[0]
     else:
         # 기본 파일 경로들 시도
         possible_files = [
@@ -134,7 +159,7 @@ def main():
         
         if not json_file:
             print("❌ JSON 파일을 찾을 수 없습니다.")
-            print("사용법: python insert_teams.py <json_file_path>")
+            print("사용법: python insert_teams.py <json_file_path> [--full]")
             return
     
     if not os.path.exists(json_file):
@@ -144,8 +169,16 @@ def main():
     print(f"🚀 팀 데이터 삽입 시작")
     print(f"📁 파일: {json_file}")
     
+    # 이미 DB에 있는 팀은 건너뛰도록 팀 캐시 사용 (--full이면 캐시를 비우고 전체 전송)
+    manifest = IngestManifest()
+    if full_mode:
+        manifest.forget_teams()
+    
     # 팀 데이터 삽입 실행
-    success = extract_teams_from_json(json_file)
+    try:
+        success = extract_teams_from_json(json_file, manifest=manifest)
+    finally:
+        manifest.close()
     
     if success:
         print("🎉 모든 팀 데이터가 성공적으로 삽입되었습니다!")
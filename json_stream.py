@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+시즌 JSON 파일 스트리밍 읽기/쓰기 유틸리티
+
+soccer_<league>-<season>.json 파일은 최상위 객체가 {match_id: match_data} 형태이다.
+json.load로 전체를 읽으면 파일 크기의 몇 배에 달하는 메모리를 사용하므로,
+최상위 객체를 한 경기씩 디코딩하여 (match_id, match_data) 쌍으로 돌려준다.
+
+시즌 파일은 gzip으로 압축되어 있을 수도 있으며, 읽을 때 내용의 매직 바이트로 판별한다.
+수집기는 write_season_file로 임시 파일에 기록한 뒤 이름을 바꾸는 방식으로 저장한다.
+"""
+
+import glob
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+# 한 번에 읽어 들이는 최소 문자 수
+CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = ' \t\n\r'
+
+_GZIP_MAGIC = b'\x1f\x8b'
+
+# 시즌 파일 저장 시 남겨 두는 백업 수 (0이면 백업하지 않음)
+KEEP_BACKUPS = 3
+# gzip 압축 수준
+GZIP_LEVEL = 6
+
+
+class _StreamBuffer:
+    """파일에서 필요한 만큼만 읽어 오는 디코딩 버퍼"""
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, min_size=None):
+        """버퍼 뒤에 데이터 추가 (실패한 디코딩 재시도 시 읽는 양을 두 배로 늘림)"""
+        if self.eof:
+            return False
+        # 이미 소비한 앞부분은 버림
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        chunk = self.f.read(max(self.chunk_size, min_size or 0))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf += chunk
+        return True
+
+    def skip_whitespace(self):
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf) or not self.fill():
+                return
+
+    def peek(self):
+        self.skip_whitespace()
+        if self.pos >= len(self.buf):
+            raise ValueError("JSON 파일이 예기치 않게 끝났습니다")
+        return self.buf[self.pos]
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"JSON 형식 오류: '{char}' 필요, '{found}' 발견 (위치 {self.pos})")
+        self.pos += 1
+
+    def decode(self, decoder):
+        """현재 위치의 JSON 값 하나를 디코딩 (값이 버퍼 끝에 걸리면 더 읽고 재시도)"""
+        self.skip_whitespace()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buf, self.pos)
+                # 숫자처럼 버퍼 끝에서 잘렸을 수 있는 값은 더 읽어서 확인
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill(len(self.buf) - self.pos)
+
+
+def is_gzip_file(file_path):
+    """파일 내용이 gzip으로 압축되어 있는지 확인"""
+    with open(file_path, 'rb') as f:
+        return f.read(2) == _GZIP_MAGIC
+
+
+def open_season_file(file_path):
+    """시즌 파일을 텍스트 모드로 열기 (gzip이면 압축을 풀면서 읽음)"""
+    if is_gzip_file(file_path):
+        return gzip.open(file_path, 'rt', encoding='utf-8')
+    return open(file_path, 'r', encoding='utf-8')
+
+
+def iter_matches(file_path, chunk_size=CHUNK_SIZE):
+    """
+    시즌 JSON 파일에서 (match_id, match_data) 쌍을 순서대로 생성
+
+    전체 딕셔너리를 만들지 않으므로 파일 크기와 무관하게
+    한 경기 분량의 메모리만 사용한다.
+    """
+    decoder = json.JSONDecoder()
+    with open_season_file(file_path) as f:
+        stream = _StreamBuffer(f, chunk_size)
+        stream.expect('{')
+        if stream.peek() == '}':
+            return
+        while True:
+            match_id = stream.decode(decoder)
+            if not isinstance(match_id, str):
+                raise ValueError(f"JSON 형식 오류: 문자열 키 필요 ({match_id!r})")
+            stream.expect(':')
+            match_data = stream.decode(decoder)
+            yield match_id, match_data
+            if stream.peek() == ',':
+                stream.pos += 1
+                continue
+            stream.expect('}')
+            return
+
+
+def write_matches(f, matches, indent=2):
+    """
+    (match_id, match_data) 쌍을 최상위 JSON 객체로 스트리밍 기록
+
+    indent가 주어지면 json.dump(data, f, ensure_ascii=False, indent=indent)와
+    동일한 출력을 만든다.
+
+    Returns:
+        int: 기록한 경기 수
+    """
+    count = 0
+    if indent is None:
+        separator, key_separator, prefix, newline = ',', ':', '', ''
+    else:
+        separator, key_separator, prefix, newline = ',\n', ': ', ' ' * indent, '\n'
+
+    for match_id, match_data in matches:
+        f.write(('{' + newline) if count == 0 else separator)
+        value = json.dumps(
+            match_data,
+            ensure_ascii=False,
+            indent=indent,
+            separators=(',', ':') if indent is None else None
+        )
+        if indent is not None:
+            value = value.replace('\n', '\n' + prefix)
+        f.write(prefix + json.dumps(match_id, ensure_ascii=False) + key_separator + value)
+        count += 1
+
+    f.write('{}' if count == 0 else newline + '}')
+    return count
+
+
+def _fsync_directory(path):
+    """이름 변경이 디스크에 반영되도록 디렉터리 fsync (지원하지 않는 파일 시스템은 무시)"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def backup_season_file(file_path, keep_backups=KEEP_BACKUPS):
+    """
+    현재 시즌 파일을 <파일>.backup_<시각>으로 보존하고 오래된 백업 정리
+
+    새 파일은 이름 변경으로 교체되어 기존 내용이 바뀌지 않으므로 하드 링크만 만들고,
+    하드 링크를 지원하지 않는 파일 시스템(Google Drive 등)에서만 복사한다.
+
+    Returns:
+        str: 백업 파일 경로 (백업하지 않았으면 None)
+    """
+    if keep_backups <= 0 or not os.path.exists(file_path):
+        return None
+
+    backup_path = f"{file_path}.backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    if not os.path.exists(backup_path):
+        try:
+            os.link(file_path, backup_path)
+        except OSError:
+            shutil.copy2(file_path, backup_path)
+
+    # 이름의 시각 순으로 최근 keep_backups개만 유지
+    backups = sorted(glob.glob(glob.escape(file_path) + '.backup_*'))
+    for old_backup in backups[:-keep_backups]:
+        try:
+            os.remove(old_backup)
+        except OSError:
+            pass
+
+    return backup_path
+
+
+def write_season_file(file_path, matches, compress=None, keep_backups=KEEP_BACKUPS, indent=None):
+    """
+    (match_id, match_data) 쌍을 시즌 파일로 원자적으로 저장
+
+    같은 디렉터리의 임시 파일에 기록하고 fsync한 뒤 os.replace로 교체하므로
+    저장 도중 중단되어도 기존 파일은 그대로 남는다.
+    matches가 iter_matches(file_path)로 같은 파일을 읽는 중이어도 된다.
+
+    Args:
+        matches: (match_id, match_data) 쌍의 iterable
+        compress: gzip 압축 여부 (None이면 기존 파일 형식 유지, 새 파일은 압축하지 않음)
+        keep_backups: 교체 전 파일을 남겨 둘 백업 수 (0이면 백업하지 않음)
+        indent: None이면 공백 없는 압축 형식, 숫자면 들여쓰기
+
+    Returns:
+        int: 기록한 경기 수
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    exists = os.path.exists(file_path)
+    if compress is None:
+        compress = exists and is_gzip_file(file_path)
+
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(file_path)}.", suffix=".tmp", dir=directory
+    )
+    try:
+        with open(fd, 'wb') as raw:
+            stream = gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=GZIP_LEVEL, mtime=0) if compress else raw
+            f = io.TextIOWrapper(stream, encoding='utf-8')
+            count = write_matches(f, matches, indent=indent)
+            f.flush()
+            f.detach()
+            if compress:
+                # gzip 트레일러 기록 (raw는 닫지 않음)
+                stream.close()
+            raw.flush()
+            os.fsync(raw.fileno())
+
+        # mkstemp는 0600으로 만들므로 기존 파일의 권한을 따름
+        if exists:
+            shutil.copymode(file_path, tmp_path)
+            backup_season_file(file_path, keep_backups)
+        else:
+            os.chmod(tmp_path, 0o644)
+
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    _fsync_directory(directory)
+    return count
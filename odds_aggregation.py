@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+북메이커 배당률 대표값 일괄 계산 엔진
+
+insert_odds.select_best_odds와 같은 규칙(over/under 모두 1.0 초과만 유효, 소수 둘째 자리 반올림)을
+시즌 전체의 (경기, 핸디캡) 그룹에 대해 NumPy 그룹 연산으로 한 번에 계산한다.
+"""
+
+from itertools import repeat
+
+import numpy as np
+
+
+def _parse_odds(values):
+    """배당률 값 목록을 float 배열로 변환 (빈 값·변환 불가 값은 NaN)"""
+    try:
+        # 대부분은 숫자 문자열이므로 한 번에 변환 (None은 NaN이 됨)
+        return np.array(values, dtype=float)
+    except (ValueError, TypeError):
+        parsed = np.empty(len(values))
+        for i, value in enumerate(values):
+            try:
+                parsed[i] = float(value) if value else np.nan
+            except (ValueError, TypeError):
+                parsed[i] = np.nan
+        return parsed
+
+
+def pack_quotes(bookmaker_groups):
+    """
+    북메이커 배당률 그룹들을 평탄한 NumPy 배열로 묶기
+
+    Args:
+        bookmaker_groups: 그룹(경기·핸디캡)별 북메이커 배당률 리스트의 리스트
+
+    Returns:
+        tuple: (그룹 인덱스 배열, over 배열, under 배열) - 유효한 배당률만 포함, 그룹 순서대로 정렬됨
+    """
+    bookmaker_groups = [bookmakers_data or [] for bookmakers_data in bookmaker_groups]
+    group_ids = np.repeat(
+        np.arange(len(bookmaker_groups), dtype=np.int64),
+        [len(bookmakers_data) for bookmakers_data in bookmaker_groups]
+    )
+    bookmakers = [bookmaker for bookmakers_data in bookmaker_groups for bookmaker in bookmakers_data]
+    over = _parse_odds(list(map(dict.get, bookmakers, repeat('over'))))
+    under = _parse_odds(list(map(dict.get, bookmakers, repeat('under'))))
+
+    # 한쪽이라도 변환에 실패하거나 1.0 이하이면 그 북메이커 전체를 제외 (NaN 비교는 False)
+    valid = (over > 1.0) & (under > 1.0)
+    return group_ids[valid], over[valid], under[valid]
+
+
+def _round2(values):
+    """
+    파이썬 round(x, 2)와 같은 결과의 벡터 반올림
+
+    np.round는 x * 100을 반올림하므로 반올림 경계(.xx5) 근처에서 파이썬 round와 다를 수 있다.
+    경계에 가까운 값만 파이썬 round로 다시 계산한다.
+    """
+    rounded = np.round(values, 2)
+    # inf는 np.round가 그대로 돌려주므로 유한한 값만 경계 확인 (inf - inf 경고 방지)
+    finite = np.flatnonzero(np.isfinite(values))
+    scaled = values[finite] * 100
+    fraction = scaled - np.floor(scaled)
+    for i in finite[np.abs(fraction - 0.5) < 1e-6]:
+        rounded[i] = round(float(values[i]), 2)
+    return rounded
+
+
+def _group_sort_order(values, group_ids):
+    """그룹 안에서 값 오름차순이 되는 인덱스 (np.lexsort((values, group_ids))와 같고 더 빠름)"""
+    order = np.argsort(values, kind='stable')
+    return order[np.argsort(group_ids[order], kind='stable')]
+
+
+def _first_max_index(values, group_ids, counts, group_max):
+    """그룹별 최댓값이 처음 나오는 위치 (파이썬 max()와 같은 동점 처리)"""
+    candidates = np.flatnonzero(values == np.repeat(group_max, counts))
+    _, first = np.unique(group_ids[candidates], return_index=True)
+    return candidates[first]
+
+
+def aggregate_odds(bookmaker_groups, method='average'):
+    """
+    그룹별 대표 배당률을 한 번에 계산
+
+    각 그룹의 결과는 select_best_odds(bookmakers_data, method)와 같다.
+
+    Args:
+        bookmaker_groups: 그룹(경기·핸디캡)별 북메이커 배당률 리스트의 리스트
+        method: 'average', 'median', 'best_over', 'best_under' (그 외는 평균)
+
+    Returns:
+        list: 그룹 순서대로 (over_odds, under_odds), 유효한 배당률이 없으면 (None, None)
+    """
+    bookmaker_groups = list(bookmaker_groups)
+    results = [(None, None)] * len(bookmaker_groups)
+
+    group_ids, over, under = pack_quotes(bookmaker_groups)
+    if len(group_ids) == 0:
+        return results
+
+    # 유효 배당률이 있는 그룹과 각 그룹의 시작 위치 (group_ids는 정렬되어 있음)
+    counts = np.bincount(group_ids, minlength=len(bookmaker_groups))
+    present = np.flatnonzero(counts)
+    counts = counts[present]
+    starts = np.cumsum(counts) - counts
+
+    if method == 'median':
+        # 그룹 안에서 값 기준 정렬 후 가운데 원소 선택
+        sorted_over = over[_group_sort_order(over, group_ids)]
+        sorted_under = under[_group_sort_order(under, group_ids)]
+        upper = starts + counts // 2
+        lower = starts + (counts - 1) // 2
+        even = counts % 2 == 0
+        selected_over = np.where(even, (sorted_over[lower] + sorted_over[upper]) / 2, sorted_over[upper])
+        selected_under = np.where(even, (sorted_under[lower] + sorted_under[upper]) / 2, sorted_under[upper])
+
+    elif method in ('best_over', 'best_under'):
+        # 기준 배당률이 가장 높은 북메이커의 over/under 쌍 선택
+        values = over if method == 'best_over' else under
+        group_max = np.maximum.reduceat(values, starts)
+        index = _first_max_index(values, group_ids, counts, group_max)
+        selected_over = over[index]
+        selected_under = under[index]
+
+    else:
+        # 평균 (bincount는 원소 순서대로 더하므로 파이썬 sum()과 합이 같음)
+        selected_over = np.bincount(group_ids, weights=over)[present] / counts
+        selected_under = np.bincount(group_ids, weights=under)[present] / counts
+
+    for group_id, group_over, group_under in zip(
+        present.tolist(), _round2(selected_over).tolist(), _round2(selected_under).tolist()
+    ):
+        results[group_id] = (group_over, group_under)
+    return results
+
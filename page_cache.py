@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+수집한 페이지 HTML 로컬 캐시
+
+본문은 내용의 SHA-256으로 이름 붙인 파일(zlib 압축)로 저장하고,
+URL → 본문 매핑과 저장·접근 시각은 sqlite 인덱스에 기록한다.
+종료된 경기의 페이지는 다시 바뀌지 않으므로 만료되지 않고,
+예정·진행 중인 경기의 페이지는 TTL이 지나면 다시 받는다.
+전체 크기가 한도를 넘으면 가장 오래 사용하지 않은 항목부터 지운다.
+
+환경 변수:
+    FLASHSCORE_CACHE_DIR     캐시 디렉터리 (빈 값이면 캐시 사용 안 함, 기본 .page_cache)
+    FLASHSCORE_CACHE_TTL     종료되지 않은 경기 페이지의 유효 시간 (초, 기본 3600)
+    FLASHSCORE_CACHE_MAX_MB  캐시 최대 크기 (MB, 기본 2048)
+"""
+
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from urllib.parse import parse_qsl, urldefrag, urlencode, urlsplit, urlunsplit
+
+CACHE_DIR = os.environ.get("FLASHSCORE_CACHE_DIR", ".page_cache")
+CACHE_TTL = float(os.environ.get("FLASHSCORE_CACHE_TTL", 3600))
+CACHE_MAX_BYTES = int(float(os.environ.get("FLASHSCORE_CACHE_MAX_MB", 2048)) * 1024 * 1024)
+
+# 본문 압축 수준 (속도 우선)
+COMPRESS_LEVEL = 1
+
+INDEX_FILE = "index.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    finished INTEGER NOT NULL DEFAULT 0,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pages_accessed_at ON pages (accessed_at);
+CREATE INDEX IF NOT EXISTS idx_pages_digest ON pages (digest);
+"""
+
+
+def normalize_url(url):
+    """캐시 키로 쓸 URL (fragment 제거, scheme·호스트 소문자, 쿼리 파라미터 정렬)"""
+    parts = urlsplit(urldefrag(url)[0])
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', query, ''))
+
+
+class PageCache:
+    """
+    URL별 페이지 HTML 캐시 (여러 스레드에서 공유 가능)
+
+    같은 내용의 페이지는 본문 파일 하나를 함께 쓴다.
+    stats: {'hits', 'misses', 'stores', 'evictions'}
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, ttl=CACHE_TTL, max_bytes=CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.join(cache_dir, "objects"), exist_ok=True)
+        self._conn = sqlite3.connect(
+            os.path.join(cache_dir, INDEX_FILE), timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._total_size = self._stored_size()
+
+    def _object_path(self, digest):
+        return os.path.join(self.cache_dir, "objects", digest[:2], digest)
+
+    def _stored_size(self):
+        """본문 파일 크기 합계 (같은 본문은 한 번만 계산)"""
+        row = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT digest, size FROM pages)"
+        ).fetchone()
+        return row[0]
+
+    def _is_fresh(self, row, now):
+        """항목이 있고 만료되지 않았는지 (row: finished, fetched_at)"""
+        return row is not None and (row[0] or now - row[1] <= self.ttl)
+
+    def has(self, url):
+        """유효한 항목이 있는지 확인 (적중 통계에 포함하지 않음)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT finished, fetched_at FROM pages WHERE url = ?", (normalize_url(url),)
+            ).fetchone()
+            return self._is_fresh(row, time.time())
+
+    def get(self, url):
+        """
+        캐시된 페이지 HTML 조회
+
+        Returns:
+            str: HTML (없거나 만료되었으면 None)
+        """
+        key = normalize_url(url)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest, finished, fetched_at FROM pages WHERE url = ?", (key,)
+            ).fetchone()
+            if not self._is_fresh(row and row[1:], now):
+                self.stats['misses'] += 1
+                return None
+
+            try:
+                with open(self._object_path(row[0]), 'rb') as f:
+                    html = zlib.decompress(f.read()).decode('utf-8')
+            except (OSError, zlib.error):
+                # 본문 파일이 지워졌거나 손상되었으면 항목도 버림
+                self._conn.execute("DELETE FROM pages WHERE url = ?", (key,))
+                self.stats['misses'] += 1
+                return None
+
+            self._conn.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (now, key))
+            self.stats['hits'] += 1
+            return html
+
+    def put(self, url, html, finished=False):
+        """
+        페이지 HTML 저장
+
+        Args:
+            finished: 종료된 경기의 페이지면 True (만료되지 않음, 한 번 True가 된 항목은 유지)
+        """
+        key = normalize_url(url)
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        object_path = self._object_path(digest)
+        now = time.time()
+
+        with self._lock:
+            if os.path.exists(object_path):
+                size = os.path.getsize(object_path)
+                # 이전 실행에서 항목 없이 남은 본문 파일이면 크기를 새로 계산에 넣음
+                if not self._conn.execute("SELECT 1 FROM pages WHERE digest = ? LIMIT 1", (digest,)).fetchone():
+                    self._total_size += size
+            else:
+                compressed = zlib.compress(data, COMPRESS_LEVEL)
+                size = len(compressed)
+                os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                tmp_path = f"{object_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(compressed)
+                os.replace(tmp_path, object_path)
+                self._total_size += size
+
+            old = self._conn.execute("SELECT digest FROM pages WHERE url = ?", (key,)).fetchone()
+            self._conn.execute(
+                """
+                INSERT INTO pages (url, digest, size, finished, fetched_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET
+                    digest = excluded.digest,
+                    size = excluded.size,
+                    finished = MAX(pages.finished, excluded.finished),
+                    fetched_at = excluded.fetched_at,
+                    accessed_at = excluded.accessed_at
+                """,
+                (key, digest, size, int(bool(finished)), now, now)
+            )
+            if old and old[0] != digest:
+                self._remove_object_if_unused(old[0])
+
+            self.stats['stores'] += 1
+            if self._total_size > self.max_bytes:
+                self._evict()
+
+    def _remove_object_if_unused(self, digest):
+        """어느 URL도 가리키지 않는 본문 파일 삭제"""
+        if self._conn.execute("SELECT 1 FROM pages WHERE digest = ? LIMIT 1", (digest,)).fetchone():
+            return
+        object_path = self._object_path(digest)
+        try:
+            self._total_size -= os.path.getsize(object_path)
+            os.remove(object_path)
+        except OSError:
+            pass
+
+    def _evict(self):
+        """가장 오래 사용하지 않은 항목부터 지워서 max_bytes 이하로 줄임"""
+        rows = self._conn.execute("SELECT url, digest FROM pages ORDER BY accessed_at").fetchall()
+        for url, digest in rows:
+            if self._total_size <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+            self._remove_object_if_unused(digest)
+            self.stats['evictions'] += 1
+
+    def iter_pages(self):
+        """저장된 (URL, HTML) 쌍을 URL 순으로 생성 (만료 여부와 무관, 적중 통계에 포함하지 않음)"""
+        with self._lock:
+            rows = self._conn.execute("SELECT url, digest FROM pages ORDER BY url").fetchall()
+        for url, digest in rows:
+            try:
+                with open(self._object_path(digest), 'rb') as f:
+                    yield url, zlib.decompress(f.read()).decode('utf-8')
+            except (OSError, zlib.error):
+                continue
+
+    def clear(self):
+        """모든 항목과 본문 파일 삭제"""
+        with self._lock:
+            digests = [row[0] for row in self._conn.execute("SELECT DISTINCT digest FROM pages")]
+            self._conn.execute("DELETE FROM pages")
+            for digest in digests:
+                try:
+                    os.remove(self._object_path(digest))
+                except OSError:
+                    pass
+            self._total_size = 0
+
+    def summary(self):
+        """저장된 항목 수와 크기"""
+        with self._lock:
+            count, finished = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(finished), 0) FROM pages"
+            ).fetchone()
+            return {'pages': count, 'finished': finished, 'bytes': self._total_size}
+
+    def format_stats(self):
+        """조회 결과 요약 문자열"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        hit_rate = self.stats['hits'] / lookups * 100 if lookups else 0.0
+        return (f"적중 {self.stats['hits']}개, 미적중 {self.stats['misses']}개 ({hit_rate:.1f}%), "
+                f"저장 {self.stats['stores']}개, 제거 {self.stats['evictions']}개")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def open_page_cache():
+    """
+    환경 변수 설정으로 캐시 열기
+
+    Returns:
+        PageCache: 캐시 (FLASHSCORE_CACHE_DIR가 비어 있거나 열 수 없으면 None)
+    """
+    if not CACHE_DIR:
+        return None
+    try:
+        return PageCache(CACHE_DIR)
+    except (OSError, sqlite3.Error) as e:
+        print(f"⚠️ 페이지 캐시를 열 수 없어 캐시 없이 진행합니다: {e}")
+        return None
+
+
+def main():
+    """메인 함수"""
+
+    if len(sys.argv) > 1 and sys.argv[1] in ('-h', '--help'):
+        print("사용법: python page_cache.py [--clear]")
+        print("")
+        print(f"캐시 디렉터리: FLASHSCORE_CACHE_DIR (현재 {CACHE_DIR or '사용 안 함'})")
+        print("--clear: 캐시된 페이지를 모두 삭제")
+        return
+
+    cache = open_page_cache()
+    if cache is None:
+        print("❌ 페이지 캐시가 꺼져 있습니다 (FLASHSCORE_CACHE_DIR)")
+        return
+
+    try:
+        if '--clear' in sys.argv[1:]:
+            cache.clear()
+            print(f"🗑️ 캐시 삭제 완료: {CACHE_DIR}")
+
+        summary = cache.summary()
+        print(f"📦 페이지 캐시: {CACHE_DIR}")
+        print(f"  페이지 {summary['pages']}개 (종료 경기 {summary['finished']}개)")
+        print(f"  크기 {summary['bytes'] / 1024 / 1024:.1f}MB / {cache.max_bytes / 1024 / 1024:.0f}MB")
+        print(f"  TTL {cache.ttl:g}초")
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
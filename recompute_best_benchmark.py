@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+matches 테이블의 best_benchmark, best_over_odds, best_under_odds를 handicap_odds에서 다시 계산하는 스크립트
+
+JSON 파일을 다시 읽지 않고 시즌마다 한 번의 set 기반 UPDATE로 DB 안에서 재계산한다.
+handicap_odds 라인이 없는 경기는 트리거와 같이 best 컬럼을 NULL로 비운다.
+--install로 best_benchmark_functions.sql의 함수와 트리거를 설치하면
+이후 handicap_odds가 바뀔 때마다 해당 경기의 값이 자동으로 갱신된다.
+"""
+
+import os
+import sys
+import time
+
+from database import connect_to_db, release_connection
+
+# 재계산 함수/트리거 정의 파일
+FUNCTIONS_SQL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "best_benchmark_functions.sql")
+
+
+def install_functions(cursor):
+    """재계산 함수와 handicap_odds 트리거 설치"""
+    with open(FUNCTIONS_SQL_PATH, 'r', encoding='utf-8') as f:
+        functions_sql = f.read()
+
+    try:
+        cursor.execute("BEGIN;")
+        cursor.execute(functions_sql)
+        cursor.execute("COMMIT;")
+        print("✅ 재계산 함수 및 트리거 설치 완료")
+        return True
+    except Exception as e:
+        cursor.execute("ROLLBACK;")
+        print(f"❌ 재계산 함수 설치 실패: {e}")
+        return False
+
+
+def recompute_best_benchmark(seasons=None, install=False):
+    """
+    시즌별 best 컬럼 재계산
+
+    Args:
+        seasons: 재계산할 season 목록 (없으면 DB의 모든 시즌)
+        install: 먼저 함수와 트리거를 설치할지 여부
+
+    Returns:
+        dict: {season: 갱신된 경기 수} (실패 시 False)
+    """
+    conn = connect_to_db()
+    if not conn:
+        return False
+
+    try:
+        cursor = conn.cursor()
+
+        if install and not install_functions(cursor):
+            return False
+
+        if not seasons:
+            cursor.execute("SELECT DISTINCT season FROM matches WHERE season IS NOT NULL ORDER BY season")
+            seasons = [row[0] for row in cursor.fetchall()]
+            cursor.execute("COMMIT;")
+
+        print(f"📊 재계산할 시즌: {len(seasons)}개")
+
+        results = {}
+        for season in seasons:
+            start_time = time.perf_counter()
+            try:
+                cursor.execute("BEGIN;")
+                cursor.execute("SELECT recompute_best_benchmark(%s)", (season,))
+                updated_count = cursor.fetchone()[0]
+                cursor.execute("COMMIT;")
+            except Exception as e:
+                cursor.execute("ROLLBACK;")
+                print(f"❌ {season} 재계산 실패: {e}")
+                continue
+
+            results[season] = updated_count
+            elapsed = time.perf_counter() - start_time
+            print(f"  ✅ {season}: {updated_count}개 경기 갱신 ({elapsed:.2f}초)")
+
+        print(f"\n🎉 재계산 완료: 총 {sum(results.values())}개 경기 갱신")
+        return results
+
+    except Exception as e:
+        print(f"❌ 재계산 중 오류: {e}")
+        return False
+
+    finally:
+        cursor.close()
+        release_connection(conn)
+        print("🔌 데이터베이스 연결 종료")
+
+
+def main():
+    """메인 함수"""
+
+    if len(sys.argv) > 1 and sys.argv[1] in ('-h', '--help'):
+        print("사용법: python recompute_best_benchmark.py [season ...] [--install]")
+        print("예시: python recompute_best_benchmark.py 2024-2025 --install")
+        print("")
+        print("--install: 재계산 함수와 handicap_odds 자동 갱신 트리거 설치 (최초 1회)")
+        return
+
+    install = '--install' in sys.argv[1:]
+    seasons = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+
+    print("🚀 best_benchmark 재계산 시작")
+
+    results = recompute_best_benchmark(seasons, install)
+    if results is False:
+        print("💥 best_benchmark 재계산 실패!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+저장된 페이지 스냅샷에서 odds/status를 다시 추출하는 스크립트
+
+선택자가 바뀌었을 때 브라우저로 다시 수집하지 않고, 저장해 둔 HTML을
+수집기와 같은 파서(html_parsers)로 프로세스 풀에서 병렬로 다시 파싱한다.
+
+스냅샷 디렉터리에는 <match_id>.odds.html (over-under odds 페이지)와
+<match_id>.status.html (경기 요약 페이지) 파일을 둔다.
+--from-cache를 주면 페이지 캐시(page_cache.py)에 저장된 페이지를 먼저 이 형식으로 내보낸다.
+"""
+
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from html_parsers import parse_over_under_page, parse_status_html
+from json_stream import iter_matches, write_season_file
+
+DEFAULT_WORKERS = os.cpu_count() or 1
+# 워커 프로세스에 한 번에 넘기는 스냅샷 수
+CHUNK_SIZE = 64
+
+SNAPSHOT_KINDS = ('odds', 'status')
+_SNAPSHOT_PATTERN = re.compile(r'^(.+)\.(odds|status)\.html$')
+
+
+def snapshot_path(snapshot_dir, match_id, kind):
+    """경기 스냅샷 파일 경로"""
+    return os.path.join(snapshot_dir, f"{match_id}.{kind}.html")
+
+
+def save_snapshot(snapshot_dir, match_id, kind, html):
+    """페이지 HTML을 스냅샷으로 저장"""
+    os.makedirs(snapshot_dir, exist_ok=True)
+    file_path = snapshot_path(snapshot_dir, match_id, kind)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(html)
+    return file_path
+
+
+def find_snapshots(snapshot_dir):
+    """
+    스냅샷 디렉터리의 파일 목록
+
+    Returns:
+        list: (match_id, kind, 파일 경로) 리스트 (이름 순)
+    """
+    snapshots = []
+    with os.scandir(snapshot_dir) as entries:
+        for entry in entries:
+            matched = _SNAPSHOT_PATTERN.match(entry.name)
+            if matched and entry.is_file():
+                snapshots.append((matched.group(1), matched.group(2), entry.path))
+    snapshots.sort()
+    return snapshots
+
+
+def export_cache_snapshots(cache, snapshot_dir):
+    """
+    페이지 캐시의 경기 페이지를 스냅샷 파일로 내보내기
+
+    match_id는 URL의 mid 파라미터이고, /odds/ 경로가 있으면 odds 스냅샷이다.
+
+    Returns:
+        int: 내보낸 파일 수
+    """
+    count = 0
+    for url, html in cache.iter_pages():
+        parts = urlsplit(url)
+        match_ids = parse_qs(parts.query).get('mid')
+        if not match_ids:
+            continue
+        kind = 'odds' if '/odds/' in parts.path else 'status'
+        save_snapshot(snapshot_dir, match_ids[0], kind, html)
+        count += 1
+    return count
+
+
+def parse_snapshot(snapshot):
+    """
+    스냅샷 하나 파싱 (워커 프로세스에서 실행)
+
+    odds는 parse_over_under_page로 두 가지 odds 표 형식을 모두 시도한다.
+
+    Returns:
+        tuple: (match_id, kind, 결과) - odds는 "over-under" 리스트, status는 문자열 (없으면 None)
+    """
+    match_id, kind, file_path = snapshot
+    with open(file_path, 'r', encoding='utf-8') as f:
+        html = f.read()
+
+    if kind == 'status':
+        return match_id, kind, parse_status_html(html)
+
+    over_under = parse_over_under_page(html)
+    return match_id, kind, over_under or None
+
+
+def reparse_snapshots(snapshots, workers=DEFAULT_WORKERS, chunk_size=CHUNK_SIZE):
+    """
+    스냅샷들을 병렬로 파싱
+
+    Yields:
+        tuple: parse_snapshot 결과 (snapshots 순서대로)
+    """
+    if workers <= 1:
+        yield from map(parse_snapshot, snapshots)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(parse_snapshot, snapshots, chunksize=chunk_size)
+
+
+def collect_results(parsed):
+    """
+    파싱 결과를 경기별로 정리
+
+    Returns:
+        tuple: ({match_id: {"odds": {"over-under": [...]}, "status": ...}}, 종류별 성공/실패 수)
+    """
+    results = {}
+    counts = {kind: {'success': 0, 'failed': 0} for kind in SNAPSHOT_KINDS}
+
+    for match_id, kind, value in parsed:
+        if value is None:
+            counts[kind]['failed'] += 1
+            continue
+        counts[kind]['success'] += 1
+        match_result = results.setdefault(match_id, {})
+        if kind == 'odds':
+            match_result['odds'] = {"over-under": value}
+        else:
+            match_result['status'] = value
+
+    return results, counts
+
+
+def merge_odds_into_season_file(json_file_path, results):
+    """
+    다시 추출한 odds로 시즌 파일의 odds를 교체
+
+    status는 파서가 정규화한 값("종료" 등)이라 수집 원본과 형식이 달라서 바꾸지 않는다.
+
+    Returns:
+        int: odds를 교체한 경기 수
+    """
+    updated_count = 0
+
+    def merged_matches():
+        nonlocal updated_count
+        for match_id, match_data in iter_matches(json_file_path):
+            odds = results.get(match_id, {}).get('odds')
+            if odds:
+                match_data['odds'] = odds
+                updated_count += 1
+            yield match_id, match_data
+
+    write_season_file(json_file_path, merged_matches())
+    return updated_count
+
+
+def main():
+    """메인 함수"""
+
+    if len(sys.argv) > 1 and sys.argv[1] in ('-h', '--help'):
+        print("사용법: python reparse_snapshots.py <스냅샷 디렉터리> [결과 JSON] [워커 수] [--from-cache] [--merge]")
+        print("예시: python reparse_snapshots.py snapshots reparsed.json 8")
+        print("")
+        print("--from-cache: 페이지 캐시의 경기 페이지를 스냅샷 디렉터리로 먼저 내보냄")
+        print("--merge: 결과 JSON을 기존 시즌 파일로 보고 다시 추출한 odds만 교체")
+        return
+
+    # 옵션 분리
+    from_cache = '--from-cache' in sys.argv[1:]
+    merge = '--merge' in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+
+    if not args:
+        print("❌ 스냅샷 디렉터리를 지정하세요 (-h 참고)")
+        return
+
+    snapshot_dir = args[0]
+    output_path = args[1] if len(args) > 1 else None
+    workers = int(args[2]) if len(args) > 2 else DEFAULT_WORKERS
+
+    if from_cache:
+        from page_cache import open_page_cache
+        cache = open_page_cache()
+        if cache is None:
+            print("❌ 페이지 캐시가 꺼져 있습니다 (FLASHSCORE_CACHE_DIR)")
+            return
+        try:
+            print(f"📦 페이지 캐시에서 {export_cache_snapshots(cache, snapshot_dir)}개 스냅샷 내보냄")
+        finally:
+            cache.close()
+
+    if not os.path.isdir(snapshot_dir):
+        print(f"❌ 스냅샷 디렉터리를 찾을 수 없습니다: {snapshot_dir}")
+        return
+
+    snapshots = find_snapshots(snapshot_dir)
+    if not snapshots:
+        print(f"❌ 스냅샷 파일이 없습니다: {snapshot_dir}")
+        return
+
+    print(f"🚀 스냅샷 다시 파싱: {len(snapshots)}개 파일, 워커 {workers}개")
+
+    start_time = time.perf_counter()
+    results, counts = collect_results(reparse_snapshots(snapshots, workers))
+    elapsed = time.perf_counter() - start_time
+
+    rate = len(snapshots) / elapsed if elapsed > 0 else 0.0
+    print(f"⏱️ {elapsed:.1f}초 ({rate:.0f}페이지/초)")
+    for kind in SNAPSHOT_KINDS:
+        print(f"  {kind} - 성공: {counts[kind]['success']}개, 실패: {counts[kind]['failed']}개")
+
+    if not output_path:
+        return
+
+    if merge:
+        updated_count = merge_odds_into_season_file(output_path, results)
+        print(f"🎉 {output_path}: {updated_count}개 경기의 odds 교체 완료")
+    else:
+        count = write_season_file(output_path, sorted(results.items()), keep_backups=0)
+        print(f"💾 {count}개 경기 결과 저장: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
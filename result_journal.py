@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+수집 결과 추가 기록(append-only) 저널
+
+수집기가 경기 하나를 끝낼 때마다 결과를 JSONL 한 줄로 바로 추가하고,
+fsync는 몇 건씩 묶어서 호출한다. 실행이 중간에 끊겨도 마지막 fsync까지의 결과는 남으므로
+다시 실행하면 저널에 있는 경기는 건너뛰고, 끝에서 저널 내용을 시즌 파일에 병합한다.
+"""
+
+import json
+import os
+import threading
+import time
+
+# 이만큼 기록하거나 이 시간(초)이 지나면 fsync
+JOURNAL_GROUP_SIZE = 20
+JOURNAL_GROUP_INTERVAL = 2.0
+
+
+def journal_path_for(file_path):
+    """시즌 파일의 저널 경로"""
+    return f"{file_path}.journal.jsonl"
+
+
+class ResultJournal:
+    """
+    경기별 수집 결과 JSONL 저널
+
+    각 줄은 {"match_id": ..., "success": ..., ...} 형태이며 같은 경기가 여러 번 있으면 마지막 줄이 유효하다.
+    """
+
+    def __init__(self, path, group_size=JOURNAL_GROUP_SIZE, group_interval=JOURNAL_GROUP_INTERVAL):
+        self.path = path
+        self.group_size = group_size
+        self.group_interval = group_interval
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._lock = threading.Lock()
+
+    def load(self):
+        """
+        저널에 기록된 결과 읽기
+
+        기록 도중 끊겨 잘린 마지막 줄처럼 해석할 수 없는 줄은 건너뛴다.
+
+        Returns:
+            dict: {match_id: 결과}
+        """
+        records = {}
+        if not os.path.exists(self.path):
+            return records
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict) and 'match_id' in record:
+                    records[record['match_id']] = record
+        return records
+
+    def _open(self):
+        self._file = open(self.path, 'a', encoding='utf-8')
+        # 직전 실행이 줄 중간에서 끊겼으면 새 기록이 잘린 줄에 붙지 않도록 줄을 바꿈
+        if self._file.tell() > 0:
+            with open(self.path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    self._file.write('\n')
+
+    def append(self, record):
+        """결과 한 건 추가 (group_size건 또는 group_interval초마다 fsync)"""
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+        with self._lock:
+            if self._file is None:
+                self._open()
+            self._file.write(line)
+            self._unsynced += 1
+            if (self._unsynced >= self.group_size
+                    or time.monotonic() - self._last_sync >= self.group_interval):
+                self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def sync(self):
+        """아직 fsync하지 않은 기록을 디스크에 반영"""
+        with self._lock:
+            if self._file is not None and self._unsynced:
+                self._sync()
+
+    def close(self):
+        """남은 기록을 fsync하고 파일 닫기"""
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
+
+    def remove(self):
+        """시즌 파일에 병합한 뒤 저널 삭제"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Selenium 조건 대기 도구
+
+고정 time.sleep 대신 원하는 요소가 나타나는 즉시 다음 단계로 넘어가도록
+여러 선택자를 선택자별 타임아웃으로 함께 폴링한다.
+폴링하는 동안 implicit wait를 꺼서 없는 선택자가 매번 implicit wait 시간만큼 막지 않게 한다.
+"""
+
+import time
+from contextlib import contextmanager
+
+# 선택자 폴링 간격 (초)
+POLL_INTERVAL = 0.1
+
+
+@contextmanager
+def implicit_wait_disabled(driver):
+    """블록 안에서만 implicit wait를 0으로 두고 끝나면 원래 값으로 복원"""
+    try:
+        previous = driver.timeouts.implicit_wait
+    except Exception:
+        previous = 0
+
+    if previous:
+        driver.implicitly_wait(0)
+    try:
+        yield driver
+    finally:
+        if previous:
+            driver.implicitly_wait(previous)
+
+
+def wait_for_any(driver, locators, poll_interval=POLL_INTERVAL):
+    """
+    여러 선택자 중 하나라도 요소가 나타나면 바로 반환
+
+    매 폴링마다 앞쪽 선택자부터 확인하므로 여러 개가 동시에 있으면 앞쪽이 우선이다.
+    각 선택자는 대기 시작부터 자신의 타임아웃까지만 확인한다.
+
+    Args:
+        locators: (By, 선택자, 타임아웃 초) 튜플 리스트
+        poll_interval: 폴링 간격 (초)
+
+    Returns:
+        tuple: (찾은 locator 인덱스, 요소 리스트) - 모두 시간 초과면 (None, [])
+    """
+    start_time = time.monotonic()
+
+    with implicit_wait_disabled(driver):
+        while True:
+            elapsed = time.monotonic() - start_time
+            waiting = False
+
+            for index, (by, selector, timeout) in enumerate(locators):
+                if elapsed > timeout:
+                    continue
+                waiting = True
+                elements = driver.find_elements(by, selector)
+                if elements:
+                    return index, elements
+
+            if not waiting:
+                return None, []
+            time.sleep(poll_interval)
+
+
+class RequestThrottle:
+    """
+    페이지 요청 사이의 최소 간격 유지
+
+    고정 sleep과 달리 이전 요청 이후 이미 지난 시간만큼은 기다리지 않는다.
+    """
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._last_request = None
+
+    def wait(self):
+        """이전 요청 이후 min_interval이 지날 때까지 대기"""
+        now = time.monotonic()
+        if self._last_request is not None:
+            remaining = self.min_interval - (now - self._last_request)
+            if remaining > 0:
+                time.sleep(remaining)
+                now = time.monotonic()
+        self._last_request = now
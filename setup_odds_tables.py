@@ -3,26 +3,7 @@
 Odds 테이블들을 생성하는 스크립트
 """
 
-import psycopg2
-
-# 데이터베이스 설정
-DB_CONFIG = {
-    "host": "aws-1-ap-northeast-2.pooler.supabase.com",
-    "database": "postgres",
-    "user": "postgres.dvwwcmhzlllaukscjuya",
-    "password": "!Qdhdbrclf56",
-    "port": "6543"
-}
-
-def connect_to_db():
-    """데이터베이스 연결"""
-    try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        print("✅ 데이터베이스 연결 성공")
-        return conn
-    except Exception as e:
-        print(f"❌ 데이터베이스 연결 실패: {e}")
-        return None
+from database import connect_to_db, release_connection
 
 def create_odds_tables():
     """Odds 관련 테이블들 생성"""
@@ -219,7 +200,7 @@ def create_odds_tables():
         
     finally:
         cursor.close()
-        conn.close()
+        release_connection(conn)
         print("🔌 데이터베이스 연결 종료")
 
 def main():
@@ -12,6 +12,9 @@ const DB_CONFIG = {
 
 let pool = null;
 
+// 이 프로세스에서 이미 teams 테이블에 기록한 팀 ID
+const knownTeamIds = new Set();
+
 export const initializeDatabase = () => {
   if (!pool) {
     pool = new Pool(DB_CONFIG);
@@ -69,22 +72,34 @@ export const insertMatchesBatch = async (matchesData, seasonYear = null, baseUrl
 
   const results = { success: 0, errors: [] };
   
+  // 팀 정보 먼저 삽입 (배치 전체의 새 팀을 한 번에, 중복 시 무시)
+  const newTeams = new Map();
+  for (const matchInfo of Object.values(matchesData)) {
+    for (const team of [matchInfo.home, matchInfo.away]) {
+      if (team?.id && team?.name && !knownTeamIds.has(team.id)) {
+        newTeams.set(team.id, team.name);
+      }
+    }
+  }
+  
+  if (newTeams.size > 0) {
+    try {
+      const teamIds = [...newTeams.keys()];
+      await pool.query(
+        `INSERT INTO teams (team_id, team, sport_type, nation)
+         SELECT team_id, team, 'soccer', 'italy'
+         FROM unnest($1::text[], $2::text[]) AS t(team_id, team)
+         ON CONFLICT (team_id) DO NOTHING`,
+        [teamIds, [...newTeams.values()]]
+      );
+      teamIds.forEach(teamId => knownTeamIds.add(teamId));
+    } catch (error) {
+      console.error(`❌ 팀 일괄 삽입 실패: ${error.message}`);
+    }
+  }
+  
   for (const [matchId, matchInfo] of Object.entries(matchesData)) {
     try {
-      // 팀 정보 먼저 삽입 (중복 시 무시)
-      if (matchInfo.home?.id && matchInfo.home?.name) {
-        await pool.query(
-          'INSERT INTO teams (team_id, team, sport_type, nation) VALUES ($1, $2, $3, $4) ON CONFLICT (team_id) DO NOTHING',
-          [matchInfo.home.id, matchInfo.home.name, 'soccer', 'italy']
-        );
-      }
-      
-      if (matchInfo.away?.id && matchInfo.away?.name) {
-        await pool.query(
-          'INSERT INTO teams (team_id, team, sport_type, nation) VALUES ($1, $2, $3, $4) ON CONFLICT (team_id) DO NOTHING',
-          [matchInfo.away.id, matchInfo.away.name, 'soccer', 'italy']
-        );
-      }
 
       // 경기 시간 파싱
       let matchTime = null;
@@ -111,6 +126,7 @@ export const insertMatchesBatch = async (matchesData, seasonYear = null, baseUrl
         
         // 1. 오버-언더 차이의 절댓값이 가장 작은 기준점 찾기
         // 2. 같은 절댓값이면 오버배당률이 더 높은 것 선택
+        // (Python 쪽 best_odds.py의 find_best_odds와 같은 규칙 - 변경 시 함께 수정)
         let bestHandicap = null;
         let minDifference = Infinity;
         let maxOverOdds = 0;
@@ -0,0 +1,72 @@
+"""best_odds 기준점 선택 규칙 테스트 (find_best_odds / find_best_odds_batch)"""
+
+import random
+
+from best_odds import find_best_odds, find_best_odds_batch
+
+
+def line(handicap, over, under):
+    return {"handicap": handicap, "average": {"over": over, "under": under}}
+
+
+def test_empty_input():
+    assert find_best_odds(None) is None
+    assert find_best_odds([]) is None
+
+
+def test_smallest_difference_wins():
+    lines = [line("1.5", "1.30", "3.40"), line("2.5", "1.95", "1.85"), line("3.5", "3.10", "1.35")]
+
+    assert find_best_odds(lines)["handicap"] == "2.5"
+
+
+def test_tie_prefers_higher_over_then_first():
+    lines = [line("2.0", "1.85", "1.95"), line("2.5", "1.95", "1.85"), line("3.0", "1.95", "1.85")]
+
+    assert find_best_odds(lines)["handicap"] == "2.5"
+
+
+def test_unparseable_lines_are_skipped():
+    lines = [line("1.5", "-", "3.40"), {"handicap": "2.0"}, line("2.5", "2.10", "1.70"), None]
+
+    assert find_best_odds(lines)["handicap"] == "2.5"
+
+
+def test_no_valid_line():
+    assert find_best_odds([line("2.5", "", ""), {"average": None}]) is None
+
+
+def test_batch_keeps_tie_breaking_rule():
+    lines = [line("2.0", "1.85", "1.95"), line("2.5", "1.95", "1.85"), line("3.0", "1.95", "1.85")]
+
+    assert find_best_odds_batch([lines])[0]["handicap"] == "2.5"
+
+
+def test_batch_handles_missing_and_empty_matches():
+    valid = [line("2.5", "1.90", "1.90")]
+
+    assert find_best_odds_batch([]) == []
+    assert find_best_odds_batch([None, [], valid, [line("2.5", "", "")]]) == [None, None, valid[0], None]
+
+
+def test_batch_matches_scalar():
+    rng = random.Random(7)
+    # 동점이 자주 나오도록 좁은 값 집합에서 뽑고, 변환 실패·NaN·무한대도 섞음
+    values = ["1.80", "1.85", "1.90", "1.95", "2.00", "-", "", None, "nan", "inf", "-inf", 1.9, "abc"]
+
+    matches = []
+    for _ in range(500):
+        over_under = []
+        for index in range(rng.randint(0, 8)):
+            if rng.random() < 0.05:
+                over_under.append(rng.choice([None, {}, {"average": None}, {"handicap": "1.5"}]))
+            else:
+                over_under.append(line(str(index), rng.choice(values), rng.choice(values)))
+        matches.append(over_under)
+
+    expected = [find_best_odds(over_under) for over_under in matches]
+    actual = find_best_odds_batch(matches)
+
+    # 같은 dict 객체를 골라야 함 (값이 같은 다른 라인이 아니라)
+    assert [id(best) if best is not None else None for best in actual] == \
+        [id(best) if best is not None else None for best in expected]
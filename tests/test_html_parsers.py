@@ -0,0 +1,115 @@
+"""html_parsers 파서 테스트"""
+
+import pytest
+
+from html_parsers import (
+    is_finished_status, parse_odds_tables_html, parse_over_under_html, parse_over_under_page, parse_status_html
+)
+
+OVER_UNDER_PAGE = """
+<div class="ui-table">
+  <div class="ui-table__row">
+    <img title="bet365"><span data-testid="wcl-oddsValue">2.5</span>
+    <a class="oddsCell__odd"><span>1.90</span></a><a class="oddsCell__odd"><span>1.90</span></a>
+  </div>
+  <div class="ui-table__row">
+    <img alt="Unibet"><span data-testid="wcl-oddsValue">2.5</span>
+    <a class="oddsCell__odd">2.00</a><a class="oddsCell__odd">1.80</a>
+  </div>
+  <div class="ui-table__row">
+    <img title="bet365"><span data-testid="wcl-oddsValue">3.5</span>
+    <a class="oddsCell__odd">3.10</a><a class="oddsCell__odd">1.35</a>
+  </div>
+  <div class="ui-table__row">
+    <span data-testid="wcl-oddsValue">Over</span><a class="oddsCell__odd">1.5</a><a class="oddsCell__odd">2.5</a>
+  </div>
+  <div class="ui-table__row">
+    <span data-testid="wcl-oddsValue">4.5</span><a class="oddsCell__odd">-</a><a class="oddsCell__odd">1.2</a>
+  </div>
+</div>
+"""
+
+
+def test_parse_over_under_html_groups_by_handicap():
+    over_under = parse_over_under_html(OVER_UNDER_PAGE)
+
+    assert [entry["handicap"] for entry in over_under] == ["2.5", "3.5"]
+    assert over_under[0]["average"] == {"over": "1.95", "under": "1.85"}
+    assert over_under[0]["bookmakers"] == [
+        {"bookmaker": "bet365", "over": "1.9", "under": "1.9"},
+        {"bookmaker": "Unibet", "over": "2.0", "under": "1.8"},
+    ]
+    assert over_under[1]["average"] == {"over": "3.10", "under": "1.35"}
+
+
+def test_parse_over_under_html_without_rows():
+    assert parse_over_under_html("<html><body><div id='app'></div></body></html>") == []
+
+
+def test_parse_over_under_page_accepts_both_table_formats():
+    assert parse_over_under_page(OVER_UNDER_PAGE) == parse_over_under_html(OVER_UNDER_PAGE)
+    table = '<table class="odds-table"><tr><td>2.5</td><td>1.91</td><td>1.89</td></tr></table>'
+    assert parse_over_under_page(table) == parse_odds_tables_html(table)
+    assert parse_over_under_page("<html></html>") == []
+
+
+def test_parse_odds_tables_html_uses_numeric_rows():
+    html = """
+    <table class="odds-table">
+      <tr><th>Total</th><th>Over</th><th>Under</th></tr>
+      <tr><td>2.5</td><td>1.91</td><td>1.89</td></tr>
+      <tr><td>Total</td><td>1.5</td><td>2.5</td></tr>
+    </table>
+    """
+
+    assert parse_odds_tables_html(html)[0] == {
+        "handicap": "2.5", "average": {"over": "1.91", "under": "1.89"}, "bookmakers": []
+    }
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Finished", "종료"),
+    ("경기 종료", "종료"),
+    ("Live", "진행중"),
+    ("Scheduled", "예정"),
+])
+def test_parse_status_html_recognised(text, expected):
+    html = f'<div class="detailScore__status">{text}</div>'
+
+    assert parse_status_html(html) == expected
+    assert parse_status_html(html, strict=True) == expected
+
+
+def test_parse_status_html_skips_placeholders():
+    html = '<div class="event__time">-</div><div class="detailScore__status">Finished</div>'
+
+    assert parse_status_html(html) == "종료"
+
+
+def test_parse_status_html_strict_rejects_unknown_text():
+    html = '<div class="app-loading-status">Loading data</div>'
+
+    assert parse_status_html(html) == "Loading data"
+    assert parse_status_html(html, strict=True) is None
+
+
+def test_parse_status_html_without_status():
+    assert parse_status_html("<html><body></body></html>") is None
+
+
+@pytest.mark.parametrize("status, finished", [
+    ("종료", True), ("경기 종료", True), ("FT", True), (" ft ", True), ("Finished", True),
+    ("After  Penalties", True), ("AET", True),
+    ("진행중", False), ("예정", False), (None, False), ("", False),
+    # 부분 문자열로는 종료로 보지 않음
+    ("Draft", False), ("Left", False), ("1st half - 12'", False), ("Postponed", False),
+])
+def test_is_finished_status(status, finished):
+    assert is_finished_status(status) is finished
+
+
+def test_parse_status_html_does_not_treat_ft_substring_as_finished():
+    html = '<div class="detailScore__status">Draft</div>'
+
+    assert parse_status_html(html) == "Draft"
+    assert parse_status_html(html, strict=True) is None
@@ -0,0 +1,132 @@
+"""ingest_manifest.IngestManifest 테스트 (DB 확인은 조회 결과만 흉내 내는 커서로 대신함)"""
+
+import sqlite3
+
+import pytest
+
+from ingest_manifest import IngestManifest, payload_hash
+
+
+class FakeCursor:
+    """_existing_ids가 쓰는 execute/fetchall/connection.commit만 지원하는 커서"""
+
+    def __init__(self, tables):
+        self.tables = tables
+        self.connection = self
+        self.queries = []
+        self._rows = []
+
+    def execute(self, query, params):
+        table = query.split(" FROM ")[1].split()[0]
+        self.queries.append(table)
+        self._rows = [(value,) for value in params[0] if value in self.tables.get(table, set())]
+
+    def fetchall(self):
+        return self._rows
+
+    def commit(self):
+        pass
+
+
+@pytest.fixture
+def manifest_path(tmp_path):
+    return str(tmp_path / "manifest.sqlite")
+
+
+def test_payload_hash_ignores_key_order():
+    assert payload_hash({"a": 1, "b": [1, 2]}) == payload_hash({"b": [1, 2], "a": 1})
+    assert payload_hash({"a": 1}) != payload_hash({"a": 2})
+
+
+def test_mark_and_load_by_stage_and_season(manifest_path):
+    manifest = IngestManifest(manifest_path, db_key="db-a")
+    manifest.mark("matches", "2025-2026", [("M1", "h1"), ("M2", "h2")])
+    manifest.mark("odds", "2025-2026", [("M1", "o1")])
+    manifest.mark("matches", "2025-2026", [("M1", "h1-new")])
+
+    assert manifest.load("matches", "2025-2026") == {"M1": "h1-new", "M2": "h2"}
+    assert manifest.load("odds", "2025-2026") == {"M1": "o1"}
+    assert manifest.load("matches", "2024-2025") == {}
+
+    manifest.forget("matches")
+    assert manifest.load("matches", "2025-2026") == {}
+    assert manifest.load("odds", "2025-2026") == {"M1": "o1"}
+    manifest.close()
+
+
+def test_entries_are_scoped_by_db(manifest_path):
+    first = IngestManifest(manifest_path, db_key="db-a")
+    first.mark("matches", "2025-2026", [("M1", "h1")])
+    first.close()
+
+    other = IngestManifest(manifest_path, db_key="db-b")
+    assert other.load("matches", "2025-2026") == {}
+    other.close()
+
+    same = IngestManifest(manifest_path, db_key="db-a")
+    assert same.load("matches", "2025-2026") == {"M1": "h1"}
+    same.close()
+
+
+def test_load_drops_matches_missing_from_db(manifest_path):
+    manifest = IngestManifest(manifest_path, db_key="db-a")
+    manifest.mark("odds", "2025-2026", [("M1", "o1"), ("M2", "o2")])
+    cursor = FakeCursor({"odds_metadata": {"M1"}})
+
+    assert manifest.load("odds", "2025-2026", cursor) == {"M1": "o1"}
+    assert cursor.queries == ["odds_metadata"]
+    # 지운 항목은 DB 확인 없이도 다시 나오지 않음
+    assert manifest.load("odds", "2025-2026") == {"M1": "o1"}
+    manifest.close()
+
+
+def test_load_teams_drops_teams_missing_from_db(manifest_path):
+    manifest = IngestManifest(manifest_path, db_key="db-a")
+    manifest.mark_teams([("T1", "A", "soccer", None), ("T2", "B", "soccer", None)])
+
+    assert manifest.load_teams(FakeCursor({"teams": {"T2"}})) == {"T2": ("B", "soccer", None)}
+    assert manifest.load_teams() == {"T2": ("B", "soccer", None)}
+
+    manifest.forget_teams()
+    assert manifest.load_teams() == {}
+    manifest.close()
+
+
+def test_known_teams_are_scoped_by_db(manifest_path):
+    first = IngestManifest(manifest_path, db_key="db-a")
+    first.mark_teams([("T1", "A", "soccer", None)])
+    first.close()
+
+    other = IngestManifest(manifest_path, db_key="db-b")
+    assert other.load_teams() == {}
+    # 다른 DB의 캐시를 비워도 원래 DB의 캐시는 남음
+    other.forget_teams()
+    other.close()
+
+    same = IngestManifest(manifest_path, db_key="db-a")
+    assert same.load_teams() == {"T1": ("A", "soccer", None)}
+    same.close()
+
+
+def test_old_format_tables_are_replaced(manifest_path):
+    conn = sqlite3.connect(manifest_path)
+    conn.execute("CREATE TABLE match_hashes (stage TEXT, match_id TEXT, season TEXT, payload_hash TEXT, ingested_at TEXT)")
+    conn.execute("INSERT INTO match_hashes VALUES ('matches', 'M1', '2025-2026', 'h1', 'now')")
+    conn.commit()
+    conn.close()
+
+    manifest = IngestManifest(manifest_path, db_key="db-a")
+    assert manifest.load("matches", "2025-2026") == {}
+    manifest.mark("matches", "2025-2026", [("M1", "h2")])
+    assert manifest.load("matches", "2025-2026") == {"M1": "h2"}
+    manifest.close()
+
+
+def test_path_from_environment(tmp_path, monkeypatch):
+    path = tmp_path / "env.sqlite"
+    monkeypatch.setenv("INGEST_MANIFEST_PATH", str(path))
+
+    manifest = IngestManifest(db_key="db-a")
+    assert manifest.path == str(path)
+    manifest.close()
+    assert path.exists()
@@ -0,0 +1,159 @@
+"""insert_matches 일괄(COPY) 모드 테스트 (DB 대신 스테이징 테이블만 흉내 내는 연결 사용)"""
+
+import csv
+import io
+import json
+
+import pytest
+
+from insert_matches import MATCH_COLUMNS, RejectFile, copy_rows, insert_matches_bulk
+
+
+class FakeCursor:
+    """insert_matches_bulk가 보내는 SQL만 해석하는 커서"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self._rows = []
+
+    def execute(self, query, params=None):
+        conn = self.connection
+        statement = " ".join(query.split())
+        conn.statements.append(statement)
+        self._rows = []
+
+        if statement.startswith("CREATE TEMP TABLE matches_staging"):
+            conn.staging = []
+        elif statement.startswith("DELETE FROM matches_staging"):
+            home, away = MATCH_COLUMNS.index('home_team_id'), MATCH_COLUMNS.index('away_team_id')
+            missing = [row for row in conn.staging if row[home] not in conn.teams or row[away] not in conn.teams]
+            conn.staging = [row for row in conn.staging if row not in missing]
+            self._rows = missing
+        elif statement.startswith("WITH upserted AS"):
+            if conn.fail_upsert:
+                raise RuntimeError("upsert 실패")
+            inserted = sum(1 for row in conn.staging if row[0] not in conn.matches)
+            conn.matches.update(row[0] for row in conn.staging)
+            self._rows = [(inserted, len(conn.staging) - inserted)]
+
+    def copy_expert(self, sql, file):
+        data = file.read()
+        self.connection.copies.append((sql, data))
+        for row in csv.reader(io.StringIO(data)):
+            self.connection.staging.append(tuple(None if value == '\\N' else value for value in row))
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, teams=(), matches=(), fail_upsert=False):
+        self.teams = set(teams)
+        self.matches = set(matches)
+        self.fail_upsert = fail_upsert
+        self.staging = []
+        self.statements = []
+        self.copies = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+
+def match(home, away, **extra):
+    data = {
+        "date": "13.07.2025 19:00",
+        "status": "FINISHED",
+        "home": {"name": home, "id": home},
+        "away": {"name": away, "id": away},
+        "result": {"home": "2", "away": "1"},
+        "match_link": "https://www.flashscore.com/match/x/?mid=1#/match-summary/match-summary",
+    }
+    data.update(extra)
+    return data
+
+
+@pytest.fixture
+def season_file(tmp_path):
+    matches = {
+        "M1": match("T1", "T2"),
+        "M2": match("T2", "T3", odds={"over-under": [{"handicap": "2.5", "average": {"over": "1.9", "under": "1.9"}}]}),
+        "M3": match("T1", "T9"),
+        "M4": {"date": "13.07.2025 19:00", "home": {"id": "T1"}},
+        "M5": match("T3", "T1", date="not a date"),
+    }
+    path = tmp_path / "soccer_test_league-2025-2026.json"
+    path.write_text(json.dumps(matches), encoding='utf-8')
+    return str(path)
+
+
+def read_rejects(path):
+    with open(path, encoding='utf-8') as f:
+        return {record['match_id']: record for record in map(json.loads, f)}
+
+
+def test_insert_matches_bulk_counts_and_rejects(season_file, tmp_path):
+    conn = FakeConnection(teams={"T1", "T2", "T3"}, matches={"M2"})
+    reject_path = str(tmp_path / "rejects.jsonl")
+
+    stats = insert_matches_bulk(season_file, reject_path, copy_chunk_size=1, conn=conn)
+
+    assert stats == {'matches': 5, 'inserted': 1, 'updated': 1, 'unchanged': 0, 'skipped': 2, 'errors': 1}
+    # 청크 크기 1이면 검증을 통과한 3개 경기가 COPY 3번으로 전송됨
+    assert len(conn.copies) == 3
+    assert conn.statements[0] == "BEGIN;" and conn.statements[-1] == "COMMIT;"
+
+    rejects = read_rejects(reject_path)
+    assert set(rejects) == {"M3", "M4", "M5"}
+    assert rejects["M3"]["reason"] == "teams 테이블에 없는 팀 ID"
+    assert rejects["M3"]["data"]["away_team_id"] == "T9"
+    # 스테이징에서 NULL이었던 컬럼은 JSON null로 기록됨 (빈 문자열이나 "\\N"이 아님)
+    assert rejects["M3"]["data"]["best_benchmark"] is None
+    assert rejects["M4"]["reason"] == "필수 데이터 누락"
+    assert rejects["M5"]["reason"].startswith("날짜 파싱 실패")
+
+
+def test_insert_matches_bulk_rolls_back_on_db_error(season_file, tmp_path):
+    conn = FakeConnection(teams={"T1", "T2", "T3", "T9"}, fail_upsert=True)
+
+    assert insert_matches_bulk(season_file, str(tmp_path / "rejects.jsonl"), conn=conn) is False
+    assert conn.statements[-1] == "ROLLBACK;"
+    assert "COMMIT;" not in conn.statements
+
+
+def test_copy_rows_encodes_none_as_null():
+    conn = FakeConnection()
+    conn.staging = []
+
+    copy_rows(conn.cursor(), 'matches_staging', ['id', 'status', 'best_benchmark'],
+              [("M1", None, "2.5"), ("M2", "", None), ("M3", 'say "hi", ok', 0)])
+
+    sql, data = conn.copies[0]
+    assert sql == "COPY matches_staging (id, status, best_benchmark) FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+    assert data.splitlines() == ['M1,\\N,2.5', 'M2,,\\N', 'M3,"say ""hi"", ok",0']
+    # NULL과 빈 문자열이 구분되어 전달됨
+    assert conn.staging == [("M1", None, "2.5"), ("M2", "", None), ("M3", 'say "hi", ok', "0")]
+
+
+def test_reject_file_is_created_on_first_write(tmp_path):
+    path = tmp_path / "rejects.jsonl"
+    rejects = RejectFile(str(path))
+    rejects.close()
+    assert not path.exists()
+
+    rejects = RejectFile(str(path))
+    rejects.write("M1", "팀 ID 누락", {"home": {"name": "홈"}, "date": object()})
+    rejects.write("M2", "필수 데이터 누락", {"status": None, "status_text": ""})
+    rejects.close()
+
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert rejects.count == 2
+    assert json.loads(lines[0])["data"]["home"] == {"name": "홈"}
+    assert [json.loads(line)["match_id"] for line in lines] == ["M1", "M2"]
+    assert json.loads(lines[1])["data"] == {"status": None, "status_text": ""}
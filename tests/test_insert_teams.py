@@ -0,0 +1,82 @@
+"""insert_teams 팀 적재 테스트 (DB 대신 문장만 기록하는 연결 사용)"""
+
+import json
+
+import pytest
+
+import insert_teams
+from ingest_manifest import IngestManifest
+
+
+class FakeCursor:
+    """트랜잭션 문장을 기록하고, 팀 캐시 확인 조회에는 teams에 있는 팀만 돌려주는 커서"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self._rows = []
+
+    def execute(self, query, params=None):
+        if query.startswith("SELECT"):
+            self._rows = [(team_id,) for team_id in params[0] if team_id in self.connection.teams]
+        else:
+            self.connection.statements.append(query)
+
+    def fetchall(self):
+        return self._rows
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, teams=()):
+        self.teams = set(teams)
+        self.statements = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+
+@pytest.fixture
+def season_file(tmp_path):
+    matches = {
+        "M1": {"home": {"id": "T1", "name": "A"}, "away": {"id": "T2", "name": "B"}},
+        "M2": {"home": {"id": "T2", "name": "B"}, "away": {"id": "T3", "name": "C"}},
+    }
+    path = tmp_path / "soccer_test_league-2025-2026.json"
+    path.write_text(json.dumps(matches), encoding='utf-8')
+    return str(path)
+
+
+def test_upsert_failure_returns_false(season_file, tmp_path, monkeypatch):
+    def failing_execute_values(cursor, sql, rows, page_size=None):
+        raise RuntimeError("upsert 실패")
+
+    monkeypatch.setattr(insert_teams, 'execute_values', failing_execute_values)
+    conn = FakeConnection()
+    manifest = IngestManifest(str(tmp_path / "manifest.sqlite"), db_key="db-a")
+
+    assert insert_teams.extract_teams_from_json(season_file, conn=conn, manifest=manifest) is False
+    assert conn.statements == ["BEGIN;", "ROLLBACK;"]
+    # 실패한 팀은 캐시에 기록되지 않음
+    assert manifest.load_teams() == {}
+    manifest.close()
+
+
+def test_written_teams_are_cached(season_file, tmp_path, monkeypatch):
+    sent = []
+    monkeypatch.setattr(insert_teams, 'execute_values', lambda cursor, sql, rows, page_size=None: sent.append(rows))
+    manifest = IngestManifest(str(tmp_path / "manifest.sqlite"), db_key="db-a")
+
+    result = insert_teams.extract_teams_from_json(season_file, conn=FakeConnection(), manifest=manifest)
+    assert result == {'teams': 3, 'inserted': 3, 'cached': 0, 'errors': 0}
+
+    # 같은 값의 팀은 다시 보내지 않음
+    conn = FakeConnection(teams={"T1", "T2", "T3"})
+    result = insert_teams.extract_teams_from_json(season_file, conn=conn, manifest=manifest)
+    assert result == {'teams': 3, 'inserted': 0, 'cached': 3, 'errors': 0}
+    assert len(sent) == 1
+    manifest.close()
@@ -0,0 +1,89 @@
+"""json_stream 스트리밍 읽기/쓰기 테스트"""
+
+import gzip
+import json
+import os
+
+import pytest
+
+from json_stream import is_gzip_file, iter_matches, write_matches, write_season_file
+
+MATCHES = {
+    "M1": {"home": {"name": "홈 팀"}, "odds": {"over-under": [{"handicap": "2.5"}]}},
+    "M2": {"home": {"name": "Away \"quoted\""}, "events": []},
+    "M3": {},
+}
+
+
+def test_iter_matches_reads_pairs_in_order(tmp_path):
+    path = tmp_path / "season.json"
+    path.write_text(json.dumps(MATCHES, ensure_ascii=False, indent=2), encoding='utf-8')
+
+    # 청크 경계가 값 중간에 걸리도록 아주 작은 청크로 읽음
+    assert list(iter_matches(str(path), chunk_size=7)) == list(MATCHES.items())
+
+
+def test_iter_matches_empty_object(tmp_path):
+    path = tmp_path / "empty.json"
+    path.write_text(" { } ", encoding='utf-8')
+
+    assert list(iter_matches(str(path))) == []
+
+
+def test_iter_matches_rejects_non_object(tmp_path):
+    path = tmp_path / "list.json"
+    path.write_text("[1, 2]", encoding='utf-8')
+
+    with pytest.raises(ValueError):
+        list(iter_matches(str(path)))
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_write_matches_matches_json_dump(tmp_path, indent):
+    path = tmp_path / "out.json"
+    with open(path, 'w', encoding='utf-8') as f:
+        count = write_matches(f, MATCHES.items(), indent=indent)
+
+    assert count == len(MATCHES)
+    assert json.loads(path.read_text(encoding='utf-8')) == MATCHES
+    if indent is not None:
+        assert path.read_text(encoding='utf-8') == json.dumps(MATCHES, ensure_ascii=False, indent=indent)
+
+
+def test_write_matches_empty(tmp_path):
+    path = tmp_path / "out.json"
+    with open(path, 'w', encoding='utf-8') as f:
+        assert write_matches(f, []) == 0
+
+    assert path.read_text(encoding='utf-8') == '{}'
+
+
+def test_write_season_file_keeps_gzip_and_backups(tmp_path):
+    path = tmp_path / "soccer_test-2025-2026.json"
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        json.dump({"OLD": {}}, f)
+
+    # 같은 파일을 읽으면서 다시 쓸 수 있어야 함
+    matches = ((match_id, {**data, "updated": True}) for match_id, data in iter_matches(str(path)))
+    assert write_season_file(str(path), matches, keep_backups=1) == 1
+
+    assert is_gzip_file(str(path))
+    assert list(iter_matches(str(path))) == [("OLD", {"updated": True})]
+    backups = [name for name in os.listdir(tmp_path) if '.backup_' in name]
+    assert len(backups) == 1
+    assert list(iter_matches(str(tmp_path / backups[0]))) == [("OLD", {})]
+
+
+def test_write_season_file_failure_keeps_original(tmp_path):
+    path = tmp_path / "season.json"
+    path.write_text(json.dumps(MATCHES), encoding='utf-8')
+
+    def broken():
+        yield "M1", {}
+        raise RuntimeError("중단")
+
+    with pytest.raises(RuntimeError):
+        write_season_file(str(path), broken(), keep_backups=0)
+
+    assert json.loads(path.read_text(encoding='utf-8')) == MATCHES
+    assert sorted(os.listdir(tmp_path)) == ["season.json"]
@@ -0,0 +1,75 @@
+"""odds_aggregation 일괄 계산이 insert_odds.select_best_odds와 같은 결과를 내는지 테스트"""
+
+import random
+import warnings
+
+import numpy as np
+import pytest
+
+from insert_odds import select_best_odds
+from odds_aggregation import _round2, aggregate_odds, pack_quotes
+
+METHODS = ['average', 'median', 'best_over', 'best_under']
+
+
+def random_groups(seed, count=300):
+    """유효하지 않은 값(빈 값, 문자열, 1.0 이하)이 섞인 무작위 북메이커 그룹"""
+    rng = random.Random(seed)
+    invalid = [None, '', '-', 'abc', '1.0', '0.95']
+    groups = []
+    for _ in range(count):
+        bookmakers = []
+        for _ in range(rng.randint(0, 8)):
+            over = f"{rng.uniform(1.01, 4.0):.2f}"
+            under = f"{rng.uniform(1.01, 4.0):.2f}"
+            if rng.random() < 0.1:
+                over = rng.choice(invalid)
+            if rng.random() < 0.1:
+                under = rng.choice(invalid)
+            bookmakers.append({"bookmaker": "B", "over": over, "under": under})
+        # 동점 처리 확인용 중복 배당률
+        if bookmakers and rng.random() < 0.3:
+            bookmakers.append(dict(bookmakers[0]))
+        groups.append(bookmakers if bookmakers or rng.random() < 0.5 else None)
+    return groups
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_aggregate_odds_matches_select_best_odds(method, seed):
+    groups = random_groups(seed)
+
+    assert aggregate_odds(groups, method) == [select_best_odds(group, method) for group in groups]
+
+
+def test_aggregate_odds_without_valid_odds():
+    groups = [[], None, [{"over": "1.0", "under": "2.0"}], [{"over": None, "under": "1.9"}]]
+
+    assert aggregate_odds(groups) == [(None, None)] * 4
+
+
+def test_pack_quotes_drops_invalid_bookmakers():
+    groups = [[{"over": "1.90", "under": "1.95"}, {"over": "x", "under": "2.0"}], [], [{"over": "2.1", "under": "1.7"}]]
+
+    group_ids, over, under = pack_quotes(groups)
+
+    assert group_ids.tolist() == [0, 2]
+    assert over.tolist() == [1.9, 2.1]
+    assert under.tolist() == [1.95, 1.7]
+
+
+def test_round2_matches_python_round():
+    values = np.array([1.005, 2.675, 1.115, 0.125, 3.14159, 2.5])
+
+    assert _round2(values).tolist() == [round(value, 2) for value in values.tolist()]
+
+
+def test_round2_ignores_non_finite_values():
+    values = np.array([np.inf, -np.inf, np.nan, 1.005])
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        rounded = _round2(values)
+
+    assert rounded[0] == np.inf and rounded[1] == -np.inf and np.isnan(rounded[2])
+    assert rounded[3] == round(1.005, 2)
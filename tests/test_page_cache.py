@@ -0,0 +1,155 @@
+"""page_cache.PageCache 테스트"""
+
+import os
+
+import pytest
+
+import collect_missing_data
+import page_cache
+from http_fetcher import build_over_under_url, request_url
+from page_cache import PageCache, normalize_url
+
+URL = "https://www.flashscore.com/match/abc/?mid=1&b=2#/match-summary"
+OTHER_URL = "https://www.flashscore.com/match/def/?mid=2"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = PageCache(str(tmp_path / "cache"), ttl=60)
+    yield cache
+    cache.close()
+
+
+def object_files(cache):
+    return [name for _, _, names in os.walk(os.path.join(cache.cache_dir, "objects")) for name in names]
+
+
+def test_normalize_url():
+    assert normalize_url("HTTPS://WWW.Example.com?b=2&a=1#frag") == "https://www.example.com/?a=1&b=2"
+
+
+def test_put_and_get(cache):
+    assert cache.get(URL) is None
+    cache.put(URL, "<html>경기</html>")
+
+    # fragment와 쿼리 순서가 달라도 같은 항목
+    assert cache.get("https://www.flashscore.com/match/abc/?b=2&mid=1") == "<html>경기</html>"
+    assert cache.has(URL)
+    assert cache.stats == {'hits': 1, 'misses': 1, 'stores': 1, 'evictions': 0}
+
+
+def test_unfinished_pages_expire(cache, monkeypatch):
+    cache.put(URL, "scheduled")
+    cache.put(OTHER_URL, "finished", finished=True)
+
+    now = page_cache.time.time()
+    monkeypatch.setattr(page_cache.time, "time", lambda: now + 120)
+
+    assert cache.get(URL) is None
+    assert not cache.has(URL)
+    assert cache.get(OTHER_URL) == "finished"
+
+
+def test_finished_flag_is_sticky(cache, monkeypatch):
+    cache.put(URL, "v1", finished=True)
+    cache.put(URL, "v2", finished=False)
+
+    now = page_cache.time.time()
+    monkeypatch.setattr(page_cache.time, "time", lambda: now + 120)
+
+    assert cache.get(URL) == "v2"
+
+
+def test_same_content_shares_one_object(cache):
+    cache.put(URL, "same")
+    cache.put(OTHER_URL, "same")
+    assert len(object_files(cache)) == 1
+
+    # 교체된 본문은 더 이상 쓰는 URL이 없으면 삭제
+    cache.put(URL, "other")
+    cache.put(OTHER_URL, "other")
+    assert len(object_files(cache)) == 1
+    assert cache.summary()['pages'] == 2
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = PageCache(str(tmp_path / "cache"), ttl=60, max_bytes=300)
+    try:
+        pages = {f"https://example.com/{i}": os.urandom(100).hex() for i in range(3)}
+        for url, html in pages.items():
+            cache.put(url, html)
+
+        assert cache.stats['evictions'] >= 1
+        assert cache.get("https://example.com/0") is None
+        assert cache.get("https://example.com/2") == pages["https://example.com/2"]
+        assert cache.summary()['bytes'] <= 300
+    finally:
+        cache.close()
+
+
+def test_missing_object_file_is_a_miss(cache):
+    cache.put(URL, "gone")
+    for root, _, names in os.walk(os.path.join(cache.cache_dir, "objects")):
+        for name in names:
+            os.remove(os.path.join(root, name))
+
+    assert cache.get(URL) is None
+    assert cache.summary()['pages'] == 0
+
+
+def test_index_survives_reopen(tmp_path):
+    cache = PageCache(str(tmp_path / "cache"))
+    cache.put(URL, "persisted", finished=True)
+    cache.close()
+
+    reopened = PageCache(str(tmp_path / "cache"))
+    try:
+        assert reopened.get(URL) == "persisted"
+        assert [url for url, _ in reopened.iter_pages()] == [normalize_url(URL)]
+    finally:
+        reopened.close()
+
+
+class FakeDriver:
+    """extract_odds_from_page가 쓰는 get/find_element/page_source만 흉내 내는 드라이버"""
+
+    def __init__(self, page_source):
+        self.page_source = page_source
+        self.visited = []
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def find_element(self, by, value):
+        raise LookupError(value)
+
+
+ODDS_TABLE_PAGE = """
+<table class="odds-table">
+  <tr><td>2.5</td><td>1.91</td><td>1.89</td></tr>
+</table>
+"""
+
+
+def test_selenium_odds_path_reads_and_writes_cache(cache, monkeypatch):
+    monkeypatch.setattr(collect_missing_data, 'wait_for_any', lambda driver, locators: (None, None))
+    match_link = "https://www.flashscore.com/match/abc/?mid=1#/match-summary/match-summary"
+
+    driver = FakeDriver(ODDS_TABLE_PAGE)
+    odds = collect_missing_data.extract_odds_from_page(driver, match_link, cache, finished=True)
+    assert odds["over-under"][0]["handicap"] == "2.5"
+    assert len(driver.visited) == 1
+    assert cache.has(request_url(build_over_under_url(match_link)))
+
+    # 두 번째는 브라우저를 쓰지 않고 캐시에서 읽음
+    driver = FakeDriver("")
+    assert collect_missing_data.extract_odds_from_page(driver, match_link, cache) == odds
+    assert driver.visited == []
+
+
+def test_selenium_odds_path_does_not_cache_pages_without_odds(cache, monkeypatch):
+    monkeypatch.setattr(collect_missing_data, 'wait_for_any', lambda driver, locators: (None, None))
+    match_link = "https://www.flashscore.com/match/abc/?mid=1#/match-summary/match-summary"
+
+    assert collect_missing_data.extract_odds_from_page(FakeDriver("<html></html>"), match_link, cache) is None
+    assert not cache.has(request_url(build_over_under_url(match_link)))
@@ -0,0 +1,56 @@
+"""result_journal.ResultJournal 테스트"""
+
+from result_journal import ResultJournal, journal_path_for
+
+
+def test_journal_path_for():
+    assert journal_path_for("data/soccer.json") == "data/soccer.json.journal.jsonl"
+
+
+def test_append_and_load_keeps_last_record(tmp_path):
+    journal = ResultJournal(str(tmp_path / "j.jsonl"), group_size=2)
+    journal.append({"match_id": "M1", "success": False})
+    journal.append({"match_id": "M2", "success": True, "odds": {"over-under": []}})
+    journal.append({"match_id": "M1", "success": True})
+    journal.close()
+
+    records = ResultJournal(journal.path).load()
+
+    assert records == {
+        "M1": {"match_id": "M1", "success": True},
+        "M2": {"match_id": "M2", "success": True, "odds": {"over-under": []}},
+    }
+
+
+def test_load_missing_file(tmp_path):
+    assert ResultJournal(str(tmp_path / "none.jsonl")).load() == {}
+
+
+def test_truncated_line_is_skipped_and_not_joined(tmp_path):
+    path = tmp_path / "j.jsonl"
+    # 직전 실행이 줄 중간에서 끊긴 상태
+    path.write_text('{"match_id": "M1", "success": true}\n{"match_id": "M2", "succ', encoding='utf-8')
+
+    journal = ResultJournal(str(path))
+    assert set(journal.load()) == {"M1"}
+
+    journal.append({"match_id": "M3", "success": True})
+    journal.close()
+
+    assert set(ResultJournal(str(path)).load()) == {"M1", "M3"}
+
+
+def test_ignores_records_without_match_id(tmp_path):
+    path = tmp_path / "j.jsonl"
+    path.write_text('[1, 2]\n{"success": true}\n{"match_id": "M1"}\n', encoding='utf-8')
+
+    assert ResultJournal(str(path)).load() == {"M1": {"match_id": "M1"}}
+
+
+def test_remove(tmp_path):
+    journal = ResultJournal(str(tmp_path / "j.jsonl"))
+    journal.append({"match_id": "M1"})
+    journal.remove()
+
+    assert not (tmp_path / "j.jsonl").exists()
+    journal.remove()